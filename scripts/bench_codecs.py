@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+내부 서비스 간 페이로드 코덱 벤치마크 (JSON vs MessagePack)
+
+order→menu get_pizza_id, gateway→login 토큰 검증, 전체 메뉴 목록 페이로드에 대해
+코덱별 인코딩/디코딩 시간(µs)과 크기(bytes)를 비교합니다. DB나 Django 설정은 필요 없습니다.
+
+사용 예:
+    python scripts/bench_codecs.py --iterations 20000
+    python scripts/bench_codecs.py --payloads verify_request verify_response
+"""
+
+import argparse
+import json
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_TOKEN = (
+    "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9."
+    "eyJtZW1iZXJfaWQiOiJ0ZXN0X3VzZXIiLCJpYXQiOjE3MDAwMDAwMDAsImV4cCI6MTcwMDAwMzYwMH0."
+    "c2lnbmF0dXJlLXBsYWNlaG9sZGVyLWZvci1iZW5jaG1hcmtz"
+)
+
+PAYLOADS = {
+    "pizza_request": {"pizza_nm": "페페로니", "size": "L"},
+    "pizza_response": {"pizza_id": "PIZZA_001_L", "price": 25000.0},
+    "verify_request": {"token": _TOKEN},
+    "verify_response": {"valid": True, "member_id": "test_user"},
+    "menu_list": [
+        {"pizza_id": f"PIZZA_{i:03d}_{size}", "pizza_type__pizza_nm": f"피자{i}", "size": size, "price": price}
+        for i in range(32)
+        for size, price in (("S", 15000.0), ("M", 20000.0), ("L", 25000.0))
+    ],
+}
+
+
+def codecs():
+    """(이름, encode, decode) 목록"""
+    available = [(
+        "json",
+        lambda data: json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        lambda raw: json.loads(raw),
+    )]
+    if orjson is not None:
+        available.append(("orjson", orjson.dumps, orjson.loads))
+    if msgpack is not None:
+        available.append((
+            "msgpack",
+            lambda data: msgpack.packb(data, use_bin_type=True),
+            lambda raw: msgpack.unpackb(raw, raw=False),
+        ))
+    return available
+
+
+def time_call(func, arg, iterations):
+    """호출당 평균 시간(µs)"""
+    for _ in range(min(100, iterations)):
+        func(arg)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(arg)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--payloads", nargs="*", choices=sorted(PAYLOADS), help="벤치마크할 페이로드 (기본: 전체)")
+    args = parser.parse_args()
+
+    if msgpack is None:
+        print("msgpack 미설치: JSON 코덱만 측정합니다 (pip install msgpack)")
+
+    print(f"{'payload':<18}{'codec':<10}{'bytes':>8}{'encode µs':>12}{'decode µs':>12}{'size vs json':>14}")
+    for name in args.payloads or PAYLOADS:
+        data = PAYLOADS[name]
+        json_size = None
+        for codec, encode, decode in codecs():
+            raw = encode(data)
+            if decode(raw) != data:
+                raise SystemExit(f"{codec}: {name} 왕복 결과가 원본과 다릅니다")
+            json_size = json_size or len(raw)
+            encode_us = time_call(encode, data, args.iterations)
+            decode_us = time_call(decode, raw, args.iterations)
+            print(
+                f"{name:<18}{codec:<10}{len(raw):>8}{encode_us:>12.2f}{decode_us:>12.2f}"
+                f"{len(raw) / json_size:>13.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
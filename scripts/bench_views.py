@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+핫 조회 엔드포인트 뷰 디스패치 벤치마크
+
+같은 get() 핸들러를 LightView(현재 구현)와 DRF APIView로 각각 감싸 요청당 처리 시간을 비교합니다.
+콜드 스타트 지표로 프로세스 시작부터 첫 응답까지의 시간과 경로별 첫 호출 시간도 함께 출력합니다.
+메뉴/지점 목록은 실제 DB를 조회하므로 서비스 설정의 PostgreSQL에 접근 가능해야 합니다.
+
+사용 예:
+    python scripts/bench_views.py menu --iterations 2000
+    python scripts/bench_views.py order --paths /healthz
+"""
+
+import time
+
+PROCESS_START = time.perf_counter()
+
+import argparse  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+from pathlib import Path  # noqa: E402
+
+HOT_PATHS = {
+    "login": ["/healthz"],
+    "menu": ["/healthz", "/api/menu/", "/api/menu/types/"],
+    "order": ["/healthz", "/api/order/branch/"],
+}
+
+
+def setup_service(service):
+    """서비스 디렉토리를 sys.path에 올리고 Django를 초기화"""
+    service_path = (Path(__file__).resolve().parent.parent / "services" / service).resolve()
+    if str(service_path) not in sys.path:
+        sys.path.insert(0, str(service_path))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", f"{service}_service.settings")
+
+    import django
+    django.setup()
+
+
+def drf_twin(view_class):
+    """같은 get() 핸들러를 가진 DRF APIView 클래스 생성"""
+    from rest_framework.permissions import AllowAny
+    from rest_framework.views import APIView
+
+    return type(f"DRF{view_class.__name__}", (APIView,), {
+        "permission_classes": [AllowAny],
+        "get": view_class.get,
+    })
+
+
+def call_view(view, request):
+    response = view(request)
+    if hasattr(response, "render"):
+        response.render()
+    return response
+
+
+def time_view(view, path, iterations):
+    """(첫 호출 µs, 워밍업 후 요청당 평균 µs)"""
+    from django.test import RequestFactory
+
+    factory = RequestFactory()
+    start = time.perf_counter()
+    call_view(view, factory.get(path))
+    first_us = (time.perf_counter() - start) * 1e6
+    for _ in range(min(50, iterations)):
+        view(factory.get(path))
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_view(view, factory.get(path))
+    return first_us, (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("service", choices=sorted(HOT_PATHS))
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--paths", nargs="*", help="벤치마크할 경로 (기본: 서비스별 핫 엔드포인트)")
+    args = parser.parse_args()
+
+    setup_service(args.service)
+    from django.test import RequestFactory
+    from django.urls import resolve
+
+    paths = args.paths or HOT_PATHS[args.service]
+    # 콜드 스타트 지표: 프로세스 시작부터 첫 경로의 첫 응답까지 (import + Django 설정 + 첫 요청)
+    call_view(resolve(paths[0]).func, RequestFactory().get(paths[0]))
+    print(f"time to first response ({paths[0]}): {(time.perf_counter() - PROCESS_START) * 1000:.1f} ms\n")
+
+    print(f"{'path':<24}{'first µs':>12}{'LightView µs':>14}{'DRF µs':>12}{'diff µs':>12}{'speedup':>10}")
+    for path in paths:
+        view_class = resolve(path).func.view_class
+        first_us, light_us = time_view(view_class.as_view(), path, args.iterations)
+        _, drf_us = time_view(drf_twin(view_class).as_view(), path, args.iterations)
+        print(
+            f"{path:<24}{first_us:>12.1f}{light_us:>14.1f}{drf_us:>12.1f}"
+            f"{drf_us - light_us:>12.1f}{drf_us / light_us:>9.2f}x"
+        )
+
+if __name__ == "__main__":
+    main()
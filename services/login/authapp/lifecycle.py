@@ -0,0 +1,128 @@
+"""
+서비스 수명주기: 워밍업과 준비 상태(readiness).
+
+wsgi/asgi 모듈이 애플리케이션을 만든 직후 start_warmup()을 호출하면 백그라운드 스레드에서
+DB 연결, JWT 서명/검증, 핫 뷰를 한 번씩 실행한다. /readyz는 워밍업이 모두 성공해야 200이 되고,
+begin_drain() 이후(종료 중)에는 다시 503이 된다. /, /healthz, /livez는 프로세스 생존만 나타낸다.
+"""
+import io
+import logging
+import threading
+import time
+
+import jwt
+from django.conf import settings
+from django.db import connections
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import resolve
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MEMBER_ID = "__warmup__"
+
+_warmed = threading.Event()
+_draining = threading.Event()
+_thread = None
+warmup_timings = {}
+
+
+def state():
+    if _draining.is_set():
+        return "draining"
+    return "ready" if _warmed.is_set() else "warming"
+
+
+def is_ready():
+    return state() == "ready"
+
+
+def begin_drain():
+    """readiness를 내려 새 트래픽이 들어오지 않게 한다."""
+    _draining.set()
+
+
+def _warmup_token():
+    from .views import _issue_token
+
+    return _issue_token(WARMUP_MEMBER_ID)
+
+
+def _request(method, path, body=b"", **headers):
+    """워밍업용 요청 객체 (django.test를 import하지 않기 위해 environ을 직접 구성)"""
+    return WSGIRequest({
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "SCRIPT_NAME": "",
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(body),
+        **headers,
+    })
+
+
+def _open_connections():
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+def _prime_jwt():
+    jwt.decode(_warmup_token(), settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+
+
+def _exercise_views():
+    from .fastjson import dumps
+
+    path = "/api/login/int/auth/verify"
+    request = _request("POST", path, dumps({"token": _warmup_token()}))
+    response = resolve(path).func(request)
+    if response.status_code >= 500:
+        raise RuntimeError(f"{path} -> {response.status_code}")
+
+
+WARMUP_STEPS = [
+    ("db", _open_connections),
+    ("jwt", _prime_jwt),
+    ("views", _exercise_views),
+]
+
+
+def warm_up():
+    """워밍업 단계를 순서대로 실행하고 모두 성공하면 ready로 전환한다. 성공 여부를 반환한다."""
+    ok = True
+    for name, step in WARMUP_STEPS:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("warm-up step %s failed", name)
+            ok = False
+        warmup_timings[name] = round((time.perf_counter() - started) * 1000, 1)
+    if ok:
+        _warmed.set()
+    return ok
+
+
+def _warm_up_until_ready():
+    try:
+        while not _draining.is_set() and not warm_up():
+            time.sleep(settings.WARMUP_RETRY_SECONDS)
+    finally:
+        # 워밍업 스레드의 DB 연결은 요청 스레드가 쓰지 않으므로 정리한다.
+        connections.close_all()
+
+
+def start_warmup():
+    """백그라운드 워밍업 시작 (프로세스당 한 번)"""
+    global _thread
+    if _thread is not None:
+        return
+    if not settings.WARMUP_ON_START:
+        _warmed.set()
+        return
+    _thread = threading.Thread(target=_warm_up_until_ready, name="warmup", daemon=True)
+    _thread.start()
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from authapp.members import import_members
+
+
+class Command(BaseCommand):
+    help = (
+        "회원 CSV(헤더: member_id,password,member_nm)를 가져옵니다. 비밀번호는 프로세스 풀에서 해싱하고 "
+        "COPY로 적재하며, 이미 있는 member_id는 건너뜁니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="회원 CSV 경로 (UTF-8)")
+        parser.add_argument("--workers", type=int, default=4, help="해싱 프로세스 수")
+        parser.add_argument("--chunk-size", type=int, default=200, help="워커 작업 단위(행 수)")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("COPY 적재는 PostgreSQL에서만 지원합니다.")
+
+        started = time.perf_counter()
+
+        def progress(read):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"해싱/COPY {read:,}건 ({read / elapsed:,.0f} rows/s)")
+
+        try:
+            with open(options["path"], encoding="utf-8", newline="") as stream:
+                stats = import_members(stream, options["workers"], options["chunk_size"], progress)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for line_no in stats["invalid"][:20]:
+            self.stderr.write(f"{line_no}행: 필드 누락, 건너뜀")
+        self.stdout.write(self.style.SUCCESS(
+            f"완료: 읽음 {stats['read']:,}, 추가 {stats['inserted']:,}, 중복 {stats['duplicates']:,}, "
+            f"잘못된 행 {len(stats['invalid']):,} ({time.perf_counter() - started:.1f}s)"
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from authapp.refresh import purge_expired
+
+
+class Command(BaseCommand):
+    help = "만료된 refresh token을 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"만료된 refresh token {deleted}건 삭제"))
@@ -0,0 +1,148 @@
+"""
+회원 생성 경로.
+
+가입은 이미 있는 member_id를 먼저 걸러 비싼 비밀번호 해싱을 건너뛰고, INSERT ... ON CONFLICT DO NOTHING의
+삽입된 행 수로 최종 중복을 판단한다(확인과 INSERT 사이의 경쟁은 PK 충돌이 막는다). 대량 이관은 비밀번호 해싱을
+프로세스 풀로 나누고 결과를 임시 테이블에 COPY한 뒤 같은 방식으로 병합한다.
+"""
+import csv
+import io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, router, transaction
+
+from .models import Member
+
+COLUMNS = ["member_id", "member_pwd", "member_nm"]
+
+IMPORT_HEADER = ["member_id", "password", "member_nm"]
+
+_EXISTS_SQL = "SELECT 1 FROM member WHERE member_id = %s"
+_INSERT_SQL = (
+    "INSERT INTO member (member_id, member_pwd, member_nm) VALUES (%s, %s, %s) "
+    "ON CONFLICT (member_id) DO NOTHING"
+)
+
+
+def register(member_id, password, member_nm):
+    """회원을 만들고 True, 이미 있는 member_id면 False"""
+    with connections[router.db_for_write(Member)].cursor() as cursor:
+        cursor.execute(_EXISTS_SQL, [member_id])
+        if cursor.fetchone():
+            return False
+        cursor.execute(_INSERT_SQL, [member_id, make_password(password), member_nm])
+        return cursor.rowcount == 1
+
+
+def hash_rows(rows):
+    """[(member_id, 평문 비밀번호, 이름)] -> [(member_id, 해시, 이름)] (프로세스 풀 작업 단위)"""
+    return [(member_id, make_password(password), member_nm) for member_id, password, member_nm in rows]
+
+
+def csv_buffer(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    return buffer
+
+
+def create_stage(cursor):
+    cursor.execute("DROP TABLE IF EXISTS stage_member")
+    cursor.execute("CREATE TEMP TABLE stage_member (LIKE member) ON COMMIT DROP")
+
+
+def copy_to_stage(cursor, rows):
+    cursor.copy_expert(
+        f"COPY stage_member ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)", csv_buffer(rows)
+    )
+
+
+def merge_stage(cursor):
+    """스테이징 행을 member에 병합하고 새로 들어간 행 수를 반환한다 (기존/파일 내 중복 member_id는 건너뜀)."""
+    cursor.execute(
+        f"INSERT INTO member ({', '.join(COLUMNS)}) SELECT {', '.join(COLUMNS)} FROM stage_member "
+        "ON CONFLICT (member_id) DO NOTHING"
+    )
+    return cursor.rowcount
+
+
+def _too_long(member_id, member_nm):
+    # COPY 중 길이 초과(DataError)는 트랜잭션 전체를 깨뜨리므로 행 단위로 먼저 거른다.
+    return (
+        len(member_id) > Member._meta.get_field("member_id").max_length
+        or len(member_nm) > Member._meta.get_field("member_nm").max_length
+    )
+
+
+def read_rows(stream):
+    """
+    가져오기 CSV(헤더: member_id,password,member_nm) -> (유효 행 iterator, 잘못된 행 번호 목록)
+
+    빈 값, 열 수가 다른 행, 컬럼 길이를 넘는 값은 잘못된 행으로 센다.
+    """
+    reader = csv.reader(stream)
+    header = [h.strip() for h in next(reader, [])]
+    if header != IMPORT_HEADER:
+        raise ValueError(f"헤더는 {','.join(IMPORT_HEADER)} 이어야 합니다 (입력: {','.join(header)})")
+    invalid = []
+
+    def rows():
+        for line_no, row in enumerate(reader, start=2):
+            if len(row) != 3 or not all(field.strip() for field in row):
+                invalid.append(line_no)
+                continue
+            member_id, password, member_nm = row[0].strip(), row[1], row[2].strip()
+            if _too_long(member_id, member_nm):
+                invalid.append(line_no)
+                continue
+            yield member_id, password, member_nm
+
+    return rows(), invalid
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _bounded_map(pool, fn, iterable, limit):
+    """pool.map처럼 입력 순서대로 결과를 내되, 진행 중인 작업을 limit개로 제한한다 (입력 전체를 미리 제출하지 않음)."""
+    pending = deque()
+    for item in iterable:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= limit:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def import_members(stream, workers=4, chunk_size=200, progress=None):
+    """
+    CSV 회원을 한 트랜잭션으로 가져온다 (PostgreSQL 전용).
+
+    해싱은 워커 프로세스가 chunk_size 행씩 나눠 하고, 끝난 청크부터 순서대로 스테이징 테이블에 COPY한다.
+    파일 크기와 관계없이 메모리에는 워커 수의 두 배만큼의 청크만 올라와 있다.
+    반환값: {"read", "inserted", "duplicates", "invalid"(잘못된 행 번호 목록)}
+    """
+    rows, invalid = read_rows(stream)
+    read = 0
+    # 워커는 해싱만 하고 DB에 접근하지 않는다. COPY/병합은 이 프로세스의 연결 하나로 한다.
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        with transaction.atomic(), connection.cursor() as cursor:
+            create_stage(cursor)
+            for hashed in _bounded_map(pool, hash_rows, _chunked(rows, chunk_size), workers * 2):
+                copy_to_stage(cursor, hashed)
+                read += len(hashed)
+                if progress:
+                    progress(read)
+            inserted = merge_stage(cursor)
+    return {"read": read, "inserted": inserted, "duplicates": read - inserted, "invalid": invalid}
@@ -13,3 +13,21 @@ class Member(models.Model):
         return self.member_id
 
 
+
+
+class RefreshToken(models.Model):
+    """회전식 refresh token. 원문은 발급 응답에만 있고 DB에는 sha256만 저장한다."""
+
+    token_hash = models.CharField(max_length=64, unique=True)
+    family = models.CharField(max_length=32, db_index=True)
+    member_id = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+    used_at = models.DateTimeField(null=True)
+    revoked_at = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table = "refresh_token"
+
+    def __str__(self):
+        return f"{self.member_id}:{self.family}"
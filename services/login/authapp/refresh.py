@@ -0,0 +1,90 @@
+"""
+회전식 refresh token.
+
+로그인 시 access token(JWT_ACCESS_TTL_SECONDS)과 함께 refresh token을 발급한다. 클라이언트는 access token이
+만료되면 비밀번호 대신 refresh token으로 /api/login/refresh/를 호출하고, 서버는 token_hash 유니크 인덱스
+조회 한 번으로 검증한 뒤 같은 family의 새 refresh token으로 교체한다(check_password 없음).
+
+이미 교체된 토큰이 다시 제출되면 탈취된 것으로 보고 그 family 전체를 폐기한다.
+"""
+import datetime
+import hashlib
+import secrets
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import RefreshToken
+
+
+class RefreshError(Exception):
+    """reason: invalid / expired / reused / revoked"""
+
+    def __init__(self, reason):
+        self.reason = reason
+        super().__init__(reason)
+
+
+def token_hash(raw) -> str:
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def issue(member_id, family=None, now=None):
+    """새 refresh token 원문을 반환한다. family가 없으면 새 로그인 세션으로 본다."""
+    now = now or timezone.now()
+    raw = secrets.token_urlsafe(32)
+    RefreshToken.objects.create(
+        token_hash=token_hash(raw),
+        family=family or uuid.uuid4().hex,
+        member_id=member_id,
+        expires_at=now + datetime.timedelta(seconds=settings.JWT_REFRESH_TTL_SECONDS),
+    )
+    return raw
+
+
+def rotate(raw):
+    """refresh token을 소모하고 (member_id, 새 refresh token)을 반환한다. 실패하면 RefreshError"""
+    now = timezone.now()
+    with transaction.atomic():
+        record = RefreshToken.objects.select_for_update().filter(token_hash=token_hash(raw or "")).first()
+        if record is None:
+            raise RefreshError("invalid")
+        if record.revoked_at is not None:
+            raise RefreshError("revoked")
+        if record.used_at is None and record.expires_at <= now:
+            raise RefreshError("expired")
+        if record.used_at is None:
+            record.used_at = now
+            record.save(update_fields=["used_at"])
+            return record.member_id, issue(record.member_id, record.family, now)
+        # 이미 교체된 토큰의 재사용: 이 트랜잭션에서 family를 폐기하고 커밋한 뒤 실패를 알린다.
+        revoke_family(record.family, now)
+    raise RefreshError("reused")
+
+
+def revoke_family(family, now=None):
+    """family의 모든 refresh token 폐기 (로그아웃, 재사용 감지)"""
+    return RefreshToken.objects.filter(family=family, revoked_at__isnull=True).update(
+        revoked_at=now or timezone.now()
+    )
+
+
+def revoke(raw):
+    """refresh token이 속한 family를 폐기한다. 모르는 토큰이면 0"""
+    family = RefreshToken.objects.filter(token_hash=token_hash(raw or "")).values_list("family", flat=True).first()
+    return revoke_family(family) if family else 0
+
+
+def purge_expired(batch_size=1000):
+    """만료된 토큰을 batch_size 단위로 삭제하고 삭제 건수를 반환"""
+    deleted = 0
+    while True:
+        ids = list(
+            RefreshToken.objects.filter(expires_at__lte=timezone.now())
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += RefreshToken.objects.filter(id__in=ids).delete()[0]
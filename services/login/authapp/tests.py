@@ -1,8 +1,13 @@
 import json
+import jwt
+from unittest import skipUnless
+from django.conf import settings
+from django.db import connection
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
+from unittest.mock import MagicMock, patch
 from .models import Member
 
 
@@ -161,3 +166,233 @@ class AuthenticationMiddlewareTest(APITestCase):
         response = self.client.post(reverse('login'), login_data, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RegistrationTest(APITestCase):
+    """중복 선확인 + 조건부 INSERT 회원가입 테스트"""
+
+    url = "/api/login/register/"
+
+    def test_register_is_single_insert(self):
+        """가입은 확인 + INSERT, 중복은 해싱 없이 거절하고 기존 회원을 바꾸지 않음"""
+        from django.contrib.auth.hashers import check_password
+
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, {"id": "new_user", "pw": "pw-1", "name": "새사용자"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json(), {"member_id": "new_user"})
+
+        with self.assertNumQueries(1), patch("authapp.members.make_password") as make_password:
+            response = self.client.post(self.url, {"id": "new_user", "pw": "pw-2", "name": "다른사용자"}, format='json')
+        make_password.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        member = Member.objects.get(member_id="new_user")
+        self.assertEqual(member.member_nm, "새사용자")
+        self.assertTrue(check_password("pw-1", member.member_pwd))
+
+
+class RefreshTokenTest(APITestCase):
+    """회전식 refresh token 테스트"""
+
+    def setUp(self):
+        from django.contrib.auth.hashers import make_password
+
+        Member.objects.create(member_id="test_user", member_pwd=make_password("pw-1"), member_nm="테스트사용자")
+        response = self.client.post(reverse('login'), {"id": "test_user", "pw": "pw-1"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.tokens = response.json()
+
+    def refresh(self, refresh_token):
+        return self.client.post(reverse('refresh'), {"refresh_token": refresh_token}, format='json')
+
+    def test_login_returns_short_lived_access_and_refresh_token(self):
+        from .models import RefreshToken
+        from .refresh import token_hash
+
+        self.assertEqual(self.tokens["expires_in"], settings.JWT_ACCESS_TTL_SECONDS)
+        # 원문은 저장하지 않는다
+        self.assertTrue(RefreshToken.objects.filter(token_hash=token_hash(self.tokens["refresh_token"])).exists())
+        self.assertFalse(RefreshToken.objects.filter(token_hash=self.tokens["refresh_token"]).exists())
+
+    def test_refresh_rotates_without_password_check(self):
+        with patch("authapp.views.check_password") as check:
+            response = self.refresh(self.tokens["refresh_token"])
+        check.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rotated = response.json()
+        self.assertNotEqual(rotated["refresh_token"], self.tokens["refresh_token"])
+        payload = jwt.decode(rotated["token"], settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+        self.assertEqual(payload["member_id"], "test_user")
+        self.assertEqual(self.refresh(rotated["refresh_token"]).status_code, status.HTTP_200_OK)
+
+    def test_reuse_revokes_whole_family(self):
+        """교체된 토큰을 다시 쓰면 그 family의 최신 토큰도 무효"""
+        rotated = self.refresh(self.tokens["refresh_token"]).json()
+
+        response = self.refresh(self.tokens["refresh_token"])
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()["reason"], "reused")
+        self.assertEqual(self.refresh(rotated["refresh_token"]).json()["reason"], "revoked")
+
+    def test_expired_and_unknown_tokens_rejected(self):
+        from django.utils import timezone
+        from .models import RefreshToken
+
+        RefreshToken.objects.update(expires_at=timezone.now())
+        self.assertEqual(self.refresh(self.tokens["refresh_token"]).json()["reason"], "expired")
+        self.assertEqual(self.refresh("not-a-token").json()["reason"], "invalid")
+
+    def test_logout_revokes_refresh_token(self):
+        response = self.client.post(reverse('logout'), {"refresh_token": self.tokens["refresh_token"]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.refresh(self.tokens["refresh_token"]).json()["reason"], "revoked")
+
+
+@skipUnless(connection.vendor == "postgresql", "COPY 적재는 PostgreSQL 전용")
+class MemberImportTest(TestCase):
+    """프로세스 풀 해싱 + COPY 회원 가져오기 테스트"""
+
+    def test_import_skips_duplicates_and_invalid_rows(self):
+        import io
+        from django.contrib.auth.hashers import check_password
+        from .members import import_members
+
+        Member.objects.create(member_id="existing", member_pwd="x", member_nm="기존회원")
+        stream = io.StringIO(
+            "member_id,password,member_nm\n"
+            "m1,pw-1,회원1\n"
+            "m2,pw-2,회원2\n"
+            "existing,pw-3,덮어쓰기\n"
+            "m1,pw-4,파일내중복\n"
+            "m3,,비밀번호없음\n"
+            f"{'x' * 101},pw-5,아이디초과\n"
+        )
+
+        stats = import_members(stream, workers=2, chunk_size=2)
+
+        self.assertEqual(stats, {"read": 4, "inserted": 2, "duplicates": 2, "invalid": [6, 7]})
+        self.assertTrue(check_password("pw-2", Member.objects.get(member_id="m2").member_pwd))
+        self.assertEqual(Member.objects.get(member_id="existing").member_nm, "기존회원")
+        self.assertFalse(Member.objects.filter(member_id="m3").exists())
+
+    def test_submission_is_bounded(self):
+        """청크를 한꺼번에 제출하지 않고 진행 중인 작업 수를 limit으로 제한"""
+        from concurrent.futures import ThreadPoolExecutor
+        from .members import _bounded_map
+
+        consumed = []
+
+        def chunks():
+            for n in range(10):
+                consumed.append(n)
+                yield n
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = _bounded_map(pool, lambda n: n * 2, chunks(), 3)
+            self.assertEqual(next(results), 0)
+            self.assertEqual(consumed, [0, 1, 2])
+            self.assertEqual(list(results), [n * 2 for n in range(1, 10)])
+
+    def test_rejects_unexpected_header(self):
+        import io
+        from .members import import_members
+
+        with self.assertRaises(ValueError):
+            import_members(io.StringIO("id,pw,name\nm1,pw,회원\n"))
+
+
+class MessagePackNegotiationTest(APITestCase):
+    """토큰 검증 내부 엔드포인트 MessagePack 협상 테스트"""
+
+    url = "/api/login/int/auth/verify"
+
+    def test_verify_with_msgpack(self):
+        """Content-Type/Accept가 msgpack이면 MessagePack으로 주고받음"""
+        from .negotiation import MSGPACK, packb, unpackb
+        from .views import _issue_token
+
+        token = _issue_token("test_user")
+        response = self.client.post(self.url, packb({"token": token}), content_type=MSGPACK, HTTP_ACCEPT=MSGPACK)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], MSGPACK)
+        self.assertEqual(unpackb(response.content), {"valid": True, "member_id": "test_user"})
+
+    def test_verify_json_by_default(self):
+        response = self.client.post(self.url, {"token": "not-a-token"}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.json(), {"valid": False, "reason": "invalid"})
+
+    def test_msgpack_refused_with_zero_quality(self):
+        """Accept: application/msgpack;q=0은 MessagePack을 거부하는 뜻이므로 JSON"""
+        from .negotiation import MSGPACK
+
+        for accept in (f"{MSGPACK};q=0", f"application/json, {MSGPACK};q=0.1"):
+            with self.subTest(accept=accept):
+                response = self.client.post(self.url, {"token": "not-a-token"}, format='json', HTTP_ACCEPT=accept)
+                self.assertEqual(response["Content-Type"], "application/json")
+
+
+class ReadinessTest(APITestCase):
+    """워밍업 / readiness 테스트"""
+
+    def setUp(self):
+        from . import lifecycle
+
+        self.lifecycle = lifecycle
+        lifecycle._warmed.clear()
+        lifecycle._draining.clear()
+        self.addCleanup(lifecycle._warmed.clear)
+        self.addCleanup(lifecycle._draining.clear)
+
+    def test_ready_only_after_warmup_and_not_while_draining(self):
+        """워밍업 전 503, 워밍업 후 200, drain 중 다시 503"""
+        self.assertEqual(self.client.get("/readyz").status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(self.client.get("/livez").status_code, status.HTTP_200_OK)
+
+        self.assertTrue(self.lifecycle.warm_up())
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.json()["warmup_ms"]), {name for name, _ in self.lifecycle.WARMUP_STEPS})
+
+        self.lifecycle.begin_drain()
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json()["status"], "draining")
+
+    def test_failed_step_keeps_pod_unready(self):
+        failing = [("db", MagicMock(side_effect=RuntimeError("down")))]
+        with patch.object(self.lifecycle, "WARMUP_STEPS", failing), self.assertLogs(self.lifecycle.logger, "ERROR"):
+            self.assertFalse(self.lifecycle.warm_up())
+        self.assertEqual(self.client.get("/readyz").status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class FastJsonTest(TestCase):
+    """fastjson 인코딩/폴백 테스트"""
+
+    def test_response_encodes_decimal_and_unicode(self):
+        """Decimal과 한글이 포함된 응답 인코딩 테스트"""
+        from decimal import Decimal
+        from .fastjson import FastJsonResponse, loads
+
+        response = FastJsonResponse({"price": Decimal("25000.50"), "name": "페페로니"})
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(loads(response.content), {"price": "25000.50", "name": "페페로니"})
+
+    def test_stdlib_fallback(self):
+        """orjson이 없을 때 표준 json 폴백 테스트"""
+        from . import fastjson
+
+        with patch.object(fastjson, "orjson", None):
+            body = fastjson.dumps([{"a": 1}])
+            self.assertEqual(fastjson.loads(body), [{"a": 1}])
+
+    def test_non_dict_requires_safe_false(self):
+        """safe=False 없이 리스트 직렬화 시 TypeError 테스트"""
+        from .fastjson import FastJsonResponse
+
+        with self.assertRaises(TypeError):
+            FastJsonResponse([1, 2])
@@ -1,13 +1,20 @@
 import datetime
 import jwt
 from django.conf import settings
-from django.http import JsonResponse
+from django.http import HttpResponse
+from .fastjson import FastJsonResponse
+from .lightviews import LightView
+from . import lifecycle
+from .shutdown import render_metrics
+from .negotiation import INTERNAL_PARSERS, INTERNAL_RENDERERS, negotiated_response
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.contrib.auth.hashers import make_password, check_password
+from django.contrib.auth.hashers import check_password
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
+from .members import register
 from .models import Member
+from .refresh import RefreshError, issue as issue_refresh, revoke as revoke_refresh, rotate as rotate_refresh
 
 
 def _issue_token(member_id: str) -> str:
@@ -23,11 +30,35 @@ def _issue_token(member_id: str) -> str:
     return token
 
 
-class HealthView(APIView):
-    permission_classes = [AllowAny]
+def _token_pair(member_id, refresh_token):
+    return {
+        "token": _issue_token(member_id),
+        "refresh_token": refresh_token,
+        "expires_in": settings.JWT_ACCESS_TTL_SECONDS,
+    }
+
+
+class HealthView(LightView):
+    def get(self, request):
+        return FastJsonResponse({"status": "ok"})
+
+
+class MetricsView(LightView):
+    """수명주기 지표 (Prometheus 텍스트 형식)"""
 
     def get(self, request):
-        return JsonResponse({"status": "ok"})
+        return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4")
+
+
+class ReadyView(LightView):
+    """readiness: 워밍업이 끝나고 종료(drain) 중이 아닐 때만 200"""
+
+    def get(self, request):
+        current = lifecycle.state()
+        return FastJsonResponse(
+            {"status": current, "warmup_ms": lifecycle.warmup_timings},
+            status=200 if current == "ready" else 503,
+        )
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -40,15 +71,11 @@ class RegisterView(APIView):
         password = data.get("pw")
         member_nm = data.get("name")
         if not member_id or not password or not member_nm:
-            return JsonResponse({"detail": "missing fields"}, status=400)
-        if Member.objects.filter(member_id=member_id).exists():
-            return JsonResponse({"detail": "duplicate member_id"}, status=400)
-        Member.objects.create(
-            member_id=member_id,
-            member_pwd=make_password(password),
-            member_nm=member_nm,
-        )
-        return JsonResponse({"member_id": member_id}, status=201)
+            return FastJsonResponse({"detail": "missing fields"}, status=400)
+        # 이미 있는 id는 해싱 전에 거르고, 동시 가입은 조건부 INSERT의 PK 충돌(삽입 0행)로 판단한다.
+        if not register(member_id, password, member_nm):
+            return FastJsonResponse({"detail": "duplicate member_id"}, status=400)
+        return FastJsonResponse({"member_id": member_id}, status=201)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -62,36 +89,60 @@ class LoginView(APIView):
         try:
             m = Member.objects.get(member_id=member_id)
         except Member.DoesNotExist:
-            return JsonResponse({"detail": "invalid credentials"}, status=401)
+            return FastJsonResponse({"detail": "invalid credentials"}, status=401)
         if not check_password(password, m.member_pwd):
-            return JsonResponse({"detail": "invalid credentials"}, status=401)
-        token = _issue_token(member_id)
-        return JsonResponse({"token": token})
+            return FastJsonResponse({"detail": "invalid credentials"}, status=401)
+        return FastJsonResponse(_token_pair(member_id, issue_refresh(member_id)))
+
 
+@method_decorator(csrf_exempt, name="dispatch")
+class RefreshView(APIView):
+    """refresh token으로 access token 재발급 (비밀번호 해싱 없이 인덱스 조회 한 번)"""
 
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        data = request.data or {}
+        try:
+            member_id, refresh_token = rotate_refresh(data.get("refresh_token"))
+        except RefreshError as exc:
+            return FastJsonResponse({"detail": "invalid refresh token", "reason": exc.reason}, status=401)
+        return FastJsonResponse(_token_pair(member_id, refresh_token))
+
+
+@method_decorator(csrf_exempt, name="dispatch")
 class LogoutView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
         # Stateless JWT: no server-side action.
-        return JsonResponse({"status": "logged out"})
+        return FastJsonResponse({"status": "logged out"})
+
+    def post(self, request):
+        # refresh token이 있으면 그 로그인 세션(family)을 폐기한다. access token은 만료까지 유효.
+        data = request.data or {}
+        if data.get("refresh_token"):
+            revoke_refresh(data["refresh_token"])
+        return FastJsonResponse({"status": "logged out"})
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class VerifyTokenView(APIView):
+    """게이트웨이 내부 호출: JSON 또는 MessagePack (Accept/Content-Type 협상)"""
+
     permission_classes = [AllowAny]
+    parser_classes = INTERNAL_PARSERS
+    renderer_classes = INTERNAL_RENDERERS
 
     def post(self, request):
         data = request.data or {}
         token = data.get("token")
         if not token:
-            return JsonResponse({"valid": False}, status=400)
+            return negotiated_response(request, {"valid": False}, status=400)
         try:
             payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-            return JsonResponse({"valid": True, "member_id": payload.get("member_id")})
+            return negotiated_response(request, {"valid": True, "member_id": payload.get("member_id")})
         except jwt.ExpiredSignatureError:
-            return JsonResponse({"valid": False, "reason": "expired"}, status=401)
+            return negotiated_response(request, {"valid": False, "reason": "expired"}, status=401)
         except jwt.InvalidTokenError:
-            return JsonResponse({"valid": False, "reason": "invalid"}, status=401)
-
-
+            return negotiated_response(request, {"valid": False, "reason": "invalid"}, status=401)
@@ -19,11 +19,19 @@ INSTALLED_APPS = [
     "authapp",
 ]
 
+# 관리자 화면은 DEBUG(로컬 개발)에서만 기본으로 켠다. 운영 API 파드는 admin 없이 떠서 기동 시간을 줄인다
+# (profile_startup 참고). 운영에서 필요하면 DJANGO_ADMIN_ENABLED=1
+ADMIN_ENABLED = os.getenv("DJANGO_ADMIN_ENABLED", "1" if DEBUG else "0") == "1"
+if not ADMIN_ENABLED:
+    INSTALLED_APPS.remove("django.contrib.admin")
+
 MIDDLEWARE = [
+    "authapp.shutdown.InFlightMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "login_service.db_router.ReadReplicaMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -62,6 +70,18 @@ DATABASES = {
     }
 }
 
+# 읽기 복제본: 설정되면 안전한 메서드(GET 등) 요청의 읽기를 replica로 보낸다 (login_service/db_router.py)
+if os.getenv("POSTGRES_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("POSTGRES_REPLICA_HOST"),
+        "PORT": os.getenv("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["login_service.db_router.PrimaryReplicaRouter"]
+# 회원의 쓰기 요청 이후 이 시간 동안 그 회원의 읽기는 primary에서 (read-your-writes)
+READ_REPLICA_STICKY_SECONDS = int(os.getenv("READ_REPLICA_STICKY_SECONDS", "5"))
+
 LANGUAGE_CODE = "ko-kr"
 TIME_ZONE = os.getenv("TZ", "Asia/Seoul")
 USE_I18N = True
@@ -72,8 +92,28 @@ DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "authapp.fastjson.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "authapp.fastjson.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_SECRET = os.getenv("JWT_SECRET", "pz-ay7!@#")
-JWT_ACCESS_TTL_SECONDS = int(os.getenv("JWT_ACCESS_TTL_SECONDS", "3600"))
+# access token은 짧게, 만료되면 refresh token으로 재발급 (authapp/refresh.py)
+JWT_ACCESS_TTL_SECONDS = int(os.getenv("JWT_ACCESS_TTL_SECONDS", "900"))
+JWT_REFRESH_TTL_SECONDS = int(os.getenv("JWT_REFRESH_TTL_SECONDS", str(14 * 24 * 3600)))
 
+# 기동 시 워밍업 (끄면 즉시 ready) / 실패 시 재시도 간격
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "1") == "1"
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "2"))
 
+# 종료 시 readiness를 내린 뒤 요청을 계속 받는 시간 / 처리 중 요청을 기다리는 최대 시간 (SIGTERM 기준)
+SHUTDOWN_PROPAGATION_SECONDS = float(os.getenv("SHUTDOWN_PROPAGATION_SECONDS", "2"))
+SHUTDOWN_DRAIN_TIMEOUT_SECONDS = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT_SECONDS", "25"))
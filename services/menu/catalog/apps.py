@@ -9,4 +9,11 @@ class CatalogConfig(AppConfig):
 
     def ready(self):
         """앱이 준비될 때 호출되는 메서드"""
-        pass
+        from django.db.models.signals import post_delete, post_save
+        from .models import Pizza, PizzaType
+        from .menu_cache import on_menu_change
+
+        # 모델 저장/삭제(어드민 등)로 메뉴가 바뀌면 메뉴 버전을 올려 모든 파드의 캐시를 갱신
+        for model in (Pizza, PizzaType):
+            post_save.connect(on_menu_change, sender=model)
+            post_delete.connect(on_menu_change, sender=model)
@@ -0,0 +1,161 @@
+"""
+메뉴 카탈로그 대량 적재 (PostgreSQL COPY).
+
+CSV를 COPY로 임시 스테이징 테이블에 올린 뒤, 참조 무결성을 집합 연산으로 한 번에 검증하고
+INSERT ... ON CONFLICT 한 번으로 pizza_types/pizza에 병합한다. 같은 트랜잭션에서 메뉴 버전을 올린다.
+"""
+import csv
+import io
+import json
+
+import psycopg2
+from django.db import connection, transaction
+
+from .menu_cache import bump_version
+
+TYPE_COLUMNS = ["pizza_type_id", "pizza_nm", "pizza_categ", "pizza_img_url"]
+PIZZA_COLUMNS = ["pizza_id", "pizza_type_id", "size", "price"]
+MAX_REPORTED_ERRORS = 20
+
+
+class MenuLoadError(Exception):
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(errors))
+
+
+def csv_from_records(records, columns):
+    """dict 목록(JSON 입력)을 COPY용 CSV 버퍼로 변환"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(records)
+    buffer.seek(0)
+    return buffer
+
+
+def read_json(path):
+    """{"pizza_types": [...], "pizzas": [...]} 형식 JSON을 (types_csv, pizzas_csv)로 변환"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return (
+        csv_from_records(data.get("pizza_types", []), TYPE_COLUMNS),
+        csv_from_records(data.get("pizzas", []), PIZZA_COLUMNS),
+    )
+
+
+def _copy(cursor, table, stream, allowed):
+    header = next(csv.reader([stream.readline()]), [])
+    header = [h.strip() for h in header]
+    missing = set(allowed) - set(header)
+    unknown = set(header) - set(allowed)
+    if missing or unknown:
+        raise MenuLoadError([f"{table}: 컬럼 불일치 (누락 {sorted(missing)}, 알 수 없음 {sorted(unknown)})"])
+    cursor.copy_expert(f"COPY {table} ({', '.join(header)}) FROM STDIN WITH (FORMAT csv)", stream)
+
+
+def _fetch_errors(cursor, sql, message):
+    cursor.execute(sql + f" LIMIT {MAX_REPORTED_ERRORS}")
+    return [message.format(*row) for row in cursor.fetchall()]
+
+
+def _validate(cursor, replace):
+    errors = []
+    errors += _fetch_errors(
+        cursor,
+        "SELECT pizza_type_id FROM stage_pizza_types GROUP BY pizza_type_id HAVING count(*) > 1",
+        "pizza_types: 중복 pizza_type_id {0}",
+    )
+    errors += _fetch_errors(
+        cursor,
+        "SELECT pizza_id FROM stage_pizza GROUP BY pizza_id HAVING count(*) > 1",
+        "pizza: 중복 pizza_id {0}",
+    )
+    errors += _fetch_errors(
+        cursor,
+        "SELECT pizza_type_id FROM stage_pizza_types "
+        "WHERE pizza_type_id IS NULL OR pizza_nm IS NULL OR pizza_categ IS NULL OR pizza_img_url IS NULL "
+        "OR length(pizza_type_id) > 50 OR length(pizza_nm) > 50 OR length(pizza_categ) > 50 "
+        "OR length(pizza_img_url) > 100",
+        "pizza_types: 필수 값 누락 또는 길이 초과 {0}",
+    )
+    errors += _fetch_errors(
+        cursor,
+        "SELECT pizza_id FROM stage_pizza "
+        "WHERE pizza_id IS NULL OR pizza_type_id IS NULL OR size IS NULL OR price IS NULL OR price < 0 "
+        "OR length(pizza_id) > 50 OR length(pizza_type_id) > 50 OR length(size) > 50",
+        "pizza: 필수 값 누락, 길이 초과 또는 음수 가격 {0}",
+    )
+    # 피자 타입 참조는 스테이징 타입 + (교체 모드가 아니면) 기존 타입 중에 있어야 한다.
+    # (NOT IN은 NULL 키나 NULL이 섞인 목록에서 아무것도 걸러내지 않으므로 NOT EXISTS로 검사한다)
+    existing = "" if replace else " UNION ALL SELECT pizza_type_id FROM pizza_types"
+    errors += _fetch_errors(
+        cursor,
+        "SELECT s.pizza_id, s.pizza_type_id FROM stage_pizza s "
+        "WHERE s.pizza_type_id IS NOT NULL AND NOT EXISTS ("
+        f"SELECT 1 FROM (SELECT pizza_type_id FROM stage_pizza_types{existing}) t "
+        "WHERE t.pizza_type_id = s.pizza_type_id)",
+        "pizza: {0}의 pizza_type_id {1}가 존재하지 않음",
+    )
+    if errors:
+        raise MenuLoadError(errors)
+
+
+def _merge(cursor, table, columns, key):
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c != key)
+    changed = " OR ".join(f"{table}.{c} IS DISTINCT FROM EXCLUDED.{c}" for c in columns if c != key)
+    cursor.execute(
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"SELECT {', '.join(columns)} FROM stage_{table} "
+        f"ON CONFLICT ({key}) DO UPDATE SET {updates} WHERE {changed} "
+        "RETURNING (xmax = 0)"
+    )
+    inserted = sum(1 for (is_insert,) in cursor.fetchall() if is_insert)
+    return inserted, cursor.rowcount - inserted
+
+
+def load_menu(types_stream, pizzas_stream, replace=False):
+    """
+    CSV 스트림(헤더 포함)을 적재하고 통계를 반환한다.
+
+    replace=True면 입력에 없는 피자/타입을 삭제해 입력을 메뉴 전체로 취급한다.
+    """
+    if connection.vendor != "postgresql":
+        raise MenuLoadError(["COPY 적재는 PostgreSQL에서만 지원합니다."])
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # 제약 없는 스테이징 테이블: 누락/길이 오류를 COPY 실패 대신 검증 단계에서 모아서 보고한다.
+        # (바깥 트랜잭션 안에서 재호출되면 ON COMMIT DROP이 아직 실행되지 않았으므로 먼저 정리)
+        cursor.execute("DROP TABLE IF EXISTS stage_pizza, stage_pizza_types")
+        cursor.execute(
+            "CREATE TEMP TABLE stage_pizza_types "
+            "(pizza_type_id text, pizza_nm text, pizza_categ text, pizza_img_url text) ON COMMIT DROP"
+        )
+        cursor.execute(
+            "CREATE TEMP TABLE stage_pizza "
+            "(pizza_id text, pizza_type_id text, size text, price double precision) ON COMMIT DROP"
+        )
+        try:
+            _copy(cursor, "stage_pizza_types", types_stream, TYPE_COLUMNS)
+            _copy(cursor, "stage_pizza", pizzas_stream, PIZZA_COLUMNS)
+        except psycopg2.DataError as exc:
+            raise MenuLoadError([f"COPY 실패: {exc}"])
+        _validate(cursor, replace)
+
+        stats = {}
+        stats["types_inserted"], stats["types_updated"] = _merge(
+            cursor, "pizza_types", TYPE_COLUMNS, "pizza_type_id"
+        )
+        stats["pizzas_inserted"], stats["pizzas_updated"] = _merge(cursor, "pizza", PIZZA_COLUMNS, "pizza_id")
+        stats["pizzas_deleted"] = stats["types_deleted"] = 0
+        if replace:
+            cursor.execute("DELETE FROM pizza WHERE pizza_id NOT IN (SELECT pizza_id FROM stage_pizza)")
+            stats["pizzas_deleted"] = cursor.rowcount
+            cursor.execute(
+                "DELETE FROM pizza_types WHERE pizza_type_id NOT IN (SELECT pizza_type_id FROM stage_pizza_types)"
+            )
+            stats["types_deleted"] = cursor.rowcount
+
+        if any(stats.values()):
+            bump_version()
+    return stats
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.loader import MenuLoadError, load_menu, read_json
+
+
+class Command(BaseCommand):
+    help = "pizza_types/pizza 카탈로그를 CSV 또는 JSON에서 COPY로 일괄 적재(upsert)합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--types", help="pizza_types CSV (헤더: pizza_type_id,pizza_nm,pizza_categ,pizza_img_url)")
+        parser.add_argument("--pizzas", help="pizza CSV (헤더: pizza_id,pizza_type_id,size,price)")
+        parser.add_argument("--json", help='{"pizza_types": [...], "pizzas": [...]} 형식 JSON')
+        parser.add_argument("--replace", action="store_true", help="입력에 없는 피자/타입 삭제 (메뉴 전체 교체)")
+
+    def handle(self, *args, **options):
+        if options["json"]:
+            types_stream, pizzas_stream = read_json(options["json"])
+        elif options["types"] and options["pizzas"]:
+            types_stream = open(options["types"], encoding="utf-8", newline="")
+            pizzas_stream = open(options["pizzas"], encoding="utf-8", newline="")
+        else:
+            raise CommandError("--json 또는 --types와 --pizzas를 지정하세요.")
+
+        try:
+            with types_stream, pizzas_stream:
+                stats = load_menu(types_stream, pizzas_stream, replace=options["replace"])
+        except MenuLoadError as exc:
+            for error in exc.errors:
+                self.stderr.write(error)
+            raise CommandError("메뉴 적재 실패: 변경 사항 없음")
+
+        self.stdout.write(self.style.SUCCESS(
+            "메뉴 적재 완료: "
+            f"타입 +{stats['types_inserted']} ~{stats['types_updated']} -{stats['types_deleted']}, "
+            f"피자 +{stats['pizzas_inserted']} ~{stats['pizzas_updated']} -{stats['pizzas_deleted']}"
+        ))
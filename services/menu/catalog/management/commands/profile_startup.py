@@ -0,0 +1,103 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# 새 인터프리터에서 기동 단계를 순서대로 실행하며 단계별 소요 시간(ms)을 JSON으로 출력한다.
+PROBE = r"""
+import io, json, sys, time
+marks = [("start", time.perf_counter())]
+from django.conf import settings
+settings.INSTALLED_APPS
+marks.append(("settings", time.perf_counter()))
+import django
+django.setup()
+marks.append(("app_registry", time.perf_counter()))
+from django.urls import get_resolver
+get_resolver().url_patterns
+marks.append(("urlconf", time.perf_counter()))
+import importlib
+module, attr = settings.WSGI_APPLICATION.rsplit(".", 1)
+application = getattr(importlib.import_module(module), attr)
+marks.append(("wsgi", time.perf_counter()))
+environ = {
+    "REQUEST_METHOD": "GET", "PATH_INFO": sys.argv[1], "SCRIPT_NAME": "", "QUERY_STRING": "",
+    "SERVER_NAME": "localhost", "SERVER_PORT": "80", "SERVER_PROTOCOL": "HTTP/1.1", "HTTP_HOST": "localhost",
+    "wsgi.url_scheme": "http", "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr,
+}
+statuses = []
+b"".join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+marks.append(("first_response", time.perf_counter()))
+phases = {name: (t - prev) * 1000 for (name, t), (_, prev) in zip(marks[1:], marks)}
+phases["total"] = (marks[-1][1] - marks[0][1]) * 1000
+print(json.dumps({"phases": phases, "status": statuses[0]}))
+"""
+
+# 항상 표시할 패키지 (나머지는 --top 기준)
+TRACKED = ["django", "rest_framework", "corsheaders", "jwt", "requests", "psycopg2", "orjson", "msgpack"]
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 -> (최상위 패키지별 self 시간 합(µs), 모듈별 누적 시간(µs))"""
+    by_package = defaultdict(int)
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        by_package[name.split(".")[0]] += int(self_us)
+        cumulative[name] = max(cumulative.get(name, 0), int(cumulative_us))
+    return by_package, cumulative
+
+
+class Command(BaseCommand):
+    help = "새 프로세스 기동 시간을 단계별(설정/앱 레지스트리/URLconf/WSGI/첫 응답)과 패키지별 import 시간으로 보고합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3, help="반복 실행 후 중앙값 보고")
+        parser.add_argument("--path", default="/livez", help="첫 응답을 측정할 경로")
+        parser.add_argument("--top", type=int, default=10, help="표시할 상위 패키지/모듈 수")
+
+    def _probe(self, path):
+        env = dict(os.environ, WARMUP_ON_START="0")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE, path],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"기동 측정 실패:\n{result.stderr[-2000:]}")
+        return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+    def handle(self, *args, **options):
+        runs = [self._probe(options["path"]) for _ in range(options["runs"])]
+        phases = {name: statistics.median(run["phases"][name] for run, _ in runs) for name in runs[0][0]["phases"]}
+        self.stdout.write(f"기동 단계 (ms, {options['runs']}회 중앙값, 첫 응답 {options['path']} -> {runs[0][0]['status']})")
+        for name, ms in phases.items():
+            self.stdout.write(f"  {name:<16}{ms:>10.1f}")
+
+        parsed = [parse_importtime(stderr) for _, stderr in runs]
+        packages = defaultdict(list)
+        for by_package, _ in parsed:
+            for package, us in by_package.items():
+                packages[package].append(us)
+        package_ms = {package: statistics.median(values) / 1000 for package, values in packages.items()}
+        top = sorted(package_ms, key=package_ms.get, reverse=True)[: options["top"]]
+        shown = top + [p for p in TRACKED if p not in top]
+
+        self.stdout.write("\n패키지별 import 시간 (ms, 모듈 self 시간 합)")
+        for package in shown:
+            if package in package_ms:
+                self.stdout.write(f"  {package:<24}{package_ms[package]:>10.1f}")
+            else:
+                self.stdout.write(f"  {package:<24}{'미로드':>10}")
+
+        _, cumulative = parsed[0]
+        self.stdout.write("\n누적 import 시간 상위 모듈 (ms, 첫 실행)")
+        for name in sorted(cumulative, key=cumulative.get, reverse=True)[: options["top"]]:
+            self.stdout.write(f"  {name:<48}{cumulative[name] / 1000:>10.1f}")
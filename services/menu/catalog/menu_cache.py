@@ -0,0 +1,119 @@
+"""
+프로세스 내 메뉴 스냅샷 캐시.
+
+menu_version 행을 MENU_VERSION_CHECK_SECONDS 간격으로 확인하고, 버전이 바뀌었을 때만
+pizza/pizza_types를 다시 읽는다. 메뉴 변경 경로(로더, 모델 저장)는 bump_version()을 호출한다.
+
+확인 주기가 지난 뒤 MENU_STALE_SECONDS 동안은 기존 스냅샷을 그대로 반환하면서 백그라운드에서
+한 번만 갱신한다(stale-while-revalidate). 스냅샷이 없거나 그보다 오래됐으면 동시 요청 중 하나만
+DB를 읽고 나머지는 그 결과를 기다린다(single-flight).
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import F
+
+from .models import MenuVersion, Pizza, PizzaType
+from .singleflight import SingleFlight
+
+
+class MenuSnapshot:
+    def __init__(self, version, pizzas, types):
+        self.version = version
+        self.types = [
+            {
+                "pizza_type_id": t.pizza_type_id,
+                "pizza_nm": t.pizza_nm,
+                "pizza_categ": t.pizza_categ,
+                "pizza_img_url": t.pizza_img_url,
+            }
+            for t in types
+        ]
+        self.pizzas = [
+            {
+                "pizza_id": p.pizza_id,
+                "pizza_type__pizza_nm": p.pizza_type.pizza_nm,
+                "size": p.size,
+                "price": p.price,
+            }
+            for p in pizzas
+        ]
+        self.by_name_size = {}
+        for item in self.pizzas:
+            self.by_name_size.setdefault((item["pizza_type__pizza_nm"], item["size"]), item)
+
+
+_lock = threading.Lock()
+_snapshot = None
+_checked_at = 0.0
+_flight = SingleFlight()
+_KEY = "menu"
+
+
+def current_version():
+    return MenuVersion.objects.filter(pk=1).values_list("version", flat=True).first() or 0
+
+
+def bump_version():
+    """메뉴 버전을 1 올린다. 메뉴를 변경한 트랜잭션 안에서 호출한다."""
+    if not MenuVersion.objects.filter(pk=1).update(version=F("version") + 1):
+        MenuVersion.objects.get_or_create(pk=1, defaults={"version": 1})
+    invalidate()
+
+
+def on_menu_change(sender, **kwargs):
+    """Pizza/PizzaType post_save, post_delete 시그널 수신기"""
+    bump_version()
+
+
+def invalidate():
+    """이 프로세스의 스냅샷을 버린다."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+    _flight.forget(_KEY)
+
+
+def load_snapshot(version=None):
+    if version is None:
+        version = current_version()
+    return MenuSnapshot(
+        version,
+        Pizza.objects.select_related("pizza_type").order_by("pizza_id"),
+        PizzaType.objects.order_by("pizza_type_id"),
+    )
+
+
+def _refresh():
+    global _snapshot, _checked_at
+    snapshot = _snapshot
+    version = current_version()
+    if snapshot is None or snapshot.version != version:
+        snapshot = load_snapshot(version)
+    with _lock:
+        _snapshot = snapshot
+        _checked_at = time.monotonic()
+    return snapshot
+
+
+def _cached():
+    """DB 없이 반환할 수 있는 스냅샷. stale 구간이면 백그라운드 갱신을 건다."""
+    snapshot = _snapshot
+    if snapshot is None:
+        return None
+    age = time.monotonic() - _checked_at
+    if age < settings.MENU_VERSION_CHECK_SECONDS:
+        return snapshot
+    if age < settings.MENU_VERSION_CHECK_SECONDS + settings.MENU_STALE_SECONDS:
+        _flight.refresh(_KEY, _refresh)
+        return snapshot
+    return None
+
+
+def get_snapshot():
+    return _cached() or _flight.do(_KEY, _refresh)
+
+
+async def aget_snapshot():
+    return _cached() or await _flight.ado(_KEY, _refresh)
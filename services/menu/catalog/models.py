@@ -23,3 +23,18 @@ class Pizza(models.Model):
         app_label = 'catalog'  
 
 
+
+
+class MenuVersion(models.Model):
+    """메뉴 데이터 버전 (단일 행). 메뉴가 바뀔 때마다 증가하며 각 파드의 메뉴 캐시 갱신 기준이 된다."""
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "menu_version"
+        app_label = 'catalog'
+
+    def __str__(self):
+        return str(self.version)
@@ -0,0 +1,78 @@
+"""
+내부 서비스 간 엔드포인트용 MessagePack 협상.
+
+요청 본문은 Content-Type: application/msgpack이면 MessagePack으로, 아니면 JSON으로 파싱하고,
+응답은 Accept의 미디어 범위와 q-값으로 고른다. application/msgpack이 JSON보다 선호될 때만 MessagePack,
+아니면(*/*, q=0 포함) JSON으로 보낸다.
+msgpack이 설치되어 있지 않으면 JSON만 사용한다. msgpack은 처음 MessagePack 요청을 처리할 때 import한다.
+"""
+import importlib.util
+
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+
+from .fastjson import FastJSONParser, FastJSONRenderer, FastJsonResponse
+
+# 선택 의존성: 설치 여부만 확인하고 import는 미룬다 (기동 경로에서 제외)
+MSGPACK_AVAILABLE = importlib.util.find_spec("msgpack") is not None
+
+MSGPACK = "application/msgpack"
+
+
+def packb(data) -> bytes:
+    import msgpack
+
+    return msgpack.packb(data, use_bin_type=True)
+
+
+def unpackb(data):
+    import msgpack
+
+    return msgpack.unpackb(data, raw=False)
+
+
+class MessagePackParser(BaseParser):
+    media_type = MSGPACK
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        import msgpack
+
+        try:
+            return unpackb(stream.read())
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = MSGPACK
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return packb(data)
+
+
+# 내부 엔드포인트의 parser_classes / renderer_classes (JSON이 기본)
+INTERNAL_PARSERS = [FastJSONParser] + ([MessagePackParser] if MSGPACK_AVAILABLE else [])
+INTERNAL_RENDERERS = [FastJSONRenderer] + ([MessagePackRenderer] if MSGPACK_AVAILABLE else [])
+
+
+def wants_msgpack(request):
+    # 같은 선호도면 앞에 둔 JSON이 이긴다 (Django의 Accept 파싱이 q=0 범위를 제외한다).
+    return MSGPACK_AVAILABLE and request.get_preferred_type(["application/json", MSGPACK]) == MSGPACK
+
+
+def negotiated_response(request, data, status=200):
+    """Accept에 따라 MessagePack 또는 JSON 응답"""
+    if wants_msgpack(request):
+        response = HttpResponse(packb(data), status=status, content_type=MSGPACK)
+    else:
+        response = FastJsonResponse(data, status=status)
+    patch_vary_headers(response, ["Accept"])
+    return response
@@ -0,0 +1,157 @@
+"""
+메뉴 검색/자동완성 인덱스.
+
+메뉴 스냅샷(menu_cache)마다 한 번 만들어 메모리에서만 조회한다. 피자 이름과 카테고리를 자모 단위로 분해해
+입력 중인 글자("페페ㄹ", "펲")도 접두어로 맞추고, 초성만 입력한 검색("ㅍㅍㄹ"), 이름 중간 일치,
+자모 bigram 유사도(오타 허용)를 점수로 순위를 매긴다.
+"""
+import threading
+import unicodedata
+from collections import defaultdict
+
+from .menu_cache import get_snapshot
+
+_SBASE, _SCOUNT, _NCOUNT, _TCOUNT = 0xAC00, 11172, 588, 28
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+# 겹모음/겹받침은 입력 순서대로 나눈다 (입력 중인 "달"이 "닭"의 접두어가 되도록).
+_SPLIT = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+# 일치 종류별 점수 (높을수록 앞)
+EXACT, PREFIX, WORD_PREFIX, CHOSEONG_PREFIX, SUBSTRING, CATEGORY, FUZZY = 100, 80, 60, 50, 40, 30, 10
+FUZZY_MIN_SIMILARITY = 0.5
+
+
+def normalize(text):
+    return unicodedata.normalize("NFC", text or "").strip().lower()
+
+
+def decompose(text):
+    """완성형 한글을 호환 자모열로 분해 (그 외 문자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch) - _SBASE
+        if 0 <= code < _SCOUNT:
+            out.append(CHOSEONG[code // _NCOUNT])
+            out.append(JUNGSEONG[code % _NCOUNT // _TCOUNT])
+            if code % _TCOUNT:
+                out.append(JONGSEONG[code % _TCOUNT])
+        else:
+            out.append(ch)
+    return "".join(_SPLIT.get(j, j) for j in out)
+
+
+def choseong(text):
+    """완성형 한글은 초성만, 그 외 문자는 그대로"""
+    out = []
+    for ch in text:
+        code = ord(ch) - _SBASE
+        out.append(CHOSEONG[code // _NCOUNT] if 0 <= code < _SCOUNT else ch)
+    return "".join(out)
+
+
+def is_choseong_query(text):
+    return bool(text) and all(ch in CHOSEONG for ch in text)
+
+
+def bigrams(text):
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _Doc:
+    def __init__(self, item):
+        self.item = item
+        name = normalize(item["pizza_nm"])
+        self.name = name.replace(" ", "")
+        self.name_jamo = decompose(self.name)
+        self.word_jamos = [decompose(word) for word in name.split()]
+        self.choseong = choseong(self.name)
+        self.categ_jamo = decompose(normalize(item["pizza_categ"]).replace(" ", ""))
+        self.grams = bigrams(self.name_jamo)
+
+
+class SearchIndex:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.docs = [_Doc(item) for item in snapshot.types]
+        # 자모 접두어 -> 문서 번호 (이름 전체/단어/초성), 이름 bigram -> 문서 번호,
+        # 카테고리 자모 부분 문자열 -> 문서 번호 (카테고리는 짧아 전부 넣는다)
+        self.prefixes = defaultdict(set)
+        self.gram_docs = defaultdict(set)
+        self.categ_docs = defaultdict(set)
+        for i, doc in enumerate(self.docs):
+            for key in [doc.name_jamo, *doc.word_jamos, doc.choseong]:
+                for end in range(1, len(key) + 1):
+                    self.prefixes[key[:end]].add(i)
+            for gram in doc.grams:
+                self.gram_docs[gram].add(i)
+            categ = doc.categ_jamo
+            for start in range(len(categ)):
+                for end in range(start + 1, len(categ) + 1):
+                    self.categ_docs[categ[start:end]].add(i)
+
+    def _score(self, doc, query, query_jamo, query_grams):
+        if doc.name == query:
+            return EXACT
+        if doc.name_jamo.startswith(query_jamo):
+            return PREFIX
+        if any(word.startswith(query_jamo) for word in doc.word_jamos):
+            return WORD_PREFIX
+        if is_choseong_query(query) and doc.choseong.startswith(query):
+            return CHOSEONG_PREFIX
+        if query_jamo in doc.name_jamo:
+            return SUBSTRING
+        if query_jamo in doc.categ_jamo:
+            return CATEGORY
+        if query_grams and doc.grams:
+            similarity = 2 * len(query_grams & doc.grams) / (len(query_grams) + len(doc.grams))
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                return FUZZY + similarity * 10
+        return 0
+
+    def search(self, query, limit=10):
+        """점수순 pizza_types 항목 목록 (동점이면 짧은 이름, 이름순)"""
+        query = normalize(query).replace(" ", "")
+        if not query:
+            return []
+        query_jamo = decompose(query)
+        query_grams = bigrams(query_jamo)
+        candidates = self.prefixes.get(query_jamo, set()) | self.prefixes.get(query, set())
+        candidates |= self.categ_docs.get(query_jamo, set())
+        for gram in query_grams:
+            candidates |= self.gram_docs.get(gram, set())
+
+        scored = []
+        for i in candidates:
+            doc = self.docs[i]
+            score = self._score(doc, query, query_jamo, query_grams)
+            if score:
+                scored.append((-score, len(doc.name), doc.name, doc.item))
+        scored.sort(key=lambda row: row[:3])
+        return [item for _, _, _, item in scored[:limit]]
+
+
+_lock = threading.Lock()
+_index = None
+
+
+def get_index():
+    """현재 메뉴 스냅샷의 인덱스 (스냅샷이 바뀔 때만 다시 만든다)"""
+    global _index
+    snapshot = get_snapshot()
+    index = _index
+    if index is None or index.snapshot is not snapshot:
+        with _lock:
+            index = _index
+            if index is None or index.snapshot is not snapshot:
+                index = _index = SearchIndex(snapshot)
+    return index
@@ -0,0 +1,271 @@
+"""
+정상 종료(graceful shutdown)와 처리 중 요청 drain.
+
+SIGTERM/SIGINT를 받으면 별도 스레드에서 다음을 수행한다.
+1. readiness를 내리고(lifecycle.begin_drain) SHUTDOWN_PROPAGATION_SECONDS 동안은 요청을 계속 받는다
+   (엔드포인트에서 빠지는 동안 도착하는 요청 보호).
+2. 이후 새 요청은 503으로 거절한다. 프로브/메트릭 경로는 계속 응답한다.
+3. 처리 중인 요청이 끝나기를 SHUTDOWN_DRAIN_TIMEOUT_SECONDS까지 기다린다.
+4. 메인 스레드에서 종료 훅(DB 연결 정리 등)을 실행한 뒤 원래 시그널 처리(서버 종료)를 이어서 호출한다.
+
+스트리밍 응답(동기 이터레이터, ASGI의 비동기 이터레이터 모두)은 본문 전송이 끝날 때까지 처리 중으로 센다.
+drain 소요 시간과 남은 요청 수는 /metrics와 종료 로그에 남는다.
+"""
+import logging
+import os
+import signal
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from . import lifecycle
+from .fastjson import FastJsonResponse
+
+logger = logging.getLogger(__name__)
+
+EXEMPT_PATHS = {"/", "/healthz", "/livez", "/readyz", "/metrics"}
+
+
+class InFlight:
+    """처리 중 요청 수"""
+
+    def __init__(self):
+        self._count = 0
+        self._idle = threading.Condition()
+
+    @property
+    def count(self):
+        return self._count
+
+    def enter(self):
+        with self._idle:
+            self._count += 1
+
+    def exit(self):
+        with self._idle:
+            self._count -= 1
+            if self._count == 0:
+                self._idle.notify_all()
+
+    def wait_idle(self, timeout):
+        with self._idle:
+            return self._idle.wait_for(lambda: self._count == 0, timeout)
+
+
+in_flight = InFlight()
+_accepting = threading.Event()
+_accepting.set()
+_drained = threading.Event()
+_drain_thread = None
+_shutdown_hooks = [connections.close_all]
+metrics = {
+    "drain_started_at": None,
+    "drain_seconds": None,
+    "in_flight_at_drain": None,
+    "abandoned": None,
+    "rejected": 0,
+}
+
+
+def on_shutdown(hook):
+    """drain이 끝난 뒤 메인 스레드에서 실행할 정리 함수 등록 (기본: DB 연결 정리)"""
+    _shutdown_hooks.append(hook)
+    return hook
+
+
+def run_shutdown_hooks():
+    for hook in _shutdown_hooks:
+        try:
+            hook()
+        except Exception:
+            logger.exception("shutdown hook %r failed", hook)
+
+
+def drain(propagation=None, timeout=None):
+    """종료 절차 1~3단계를 실행하고 drain 지표를 반환한다."""
+    propagation = settings.SHUTDOWN_PROPAGATION_SECONDS if propagation is None else propagation
+    timeout = settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS if timeout is None else timeout
+
+    lifecycle.begin_drain()
+    started = time.monotonic()
+    metrics["drain_started_at"] = started
+    metrics["in_flight_at_drain"] = in_flight.count
+    time.sleep(propagation)
+    _accepting.clear()
+
+    in_flight.wait_idle(max(0.0, timeout - (time.monotonic() - started)))
+    metrics["abandoned"] = in_flight.count
+    metrics["drain_seconds"] = round(time.monotonic() - started, 3)
+    logger.warning(
+        "drained in %.3fs (in-flight at start %s, abandoned %s, rejected %s)",
+        metrics["drain_seconds"], metrics["in_flight_at_drain"], metrics["abandoned"], metrics["rejected"],
+    )
+    return metrics
+
+
+def _drain_then_resignal(signum):
+    try:
+        drain()
+    finally:
+        _drained.set()
+        # 원래 처리기는 메인 스레드에서 실행되어야 하므로 시그널을 다시 보낸다.
+        os.kill(os.getpid(), signum)
+
+
+def _make_handler(previous):
+    def handler(signum, frame):
+        global _drain_thread
+        if _drained.is_set():
+            # DB 연결은 스레드별이므로 메인 스레드(동기 워커의 요청 스레드)에서 정리한다.
+            run_shutdown_hooks()
+            signal.signal(signum, previous)
+            if callable(previous):
+                previous(signum, frame)
+            elif previous == signal.SIG_DFL:
+                os.kill(os.getpid(), signum)
+            return
+        if _drain_thread is None:
+            _drain_thread = threading.Thread(target=_drain_then_resignal, args=(signum,), name="drain", daemon=True)
+            _drain_thread.start()
+
+    return handler
+
+
+def install_signal_handlers(signums=(signal.SIGTERM, signal.SIGINT)):
+    """기존 처리기(서버의 종료 처리)를 감싸 drain 후 호출되게 한다. 메인 스레드에서만 가능"""
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    for signum in signums:
+        signal.signal(signum, _make_handler(signal.getsignal(signum)))
+    return True
+
+
+def _tracked(iterable):
+    """스트리밍 응답은 본문 전송이 끝날 때까지 처리 중으로 센다."""
+    try:
+        yield from iterable
+    finally:
+        in_flight.exit()
+
+
+class _AsyncTracked:
+    """
+    비동기 스트리밍 응답(SSE 등) 본문. 끝까지 보냈을 때, 클라이언트가 끊어 취소됐을 때,
+    response.close()로 닫혔을 때 중 먼저 오는 시점에 한 번만 처리 중에서 뺀다.
+    """
+
+    def __init__(self, aiterable):
+        self._iterator = aiter(aiterable)
+        self._open = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await anext(self._iterator)
+        except BaseException:
+            self.close()
+            raise
+
+    async def aclose(self):
+        self.close()
+        if hasattr(self._iterator, "aclose"):
+            await self._iterator.aclose()
+
+    def close(self):
+        # StreamingHttpResponse가 response.close()에서 부르도록 close를 둔다
+        if self._open:
+            self._open = False
+            in_flight.exit()
+
+
+def _track(response):
+    if response.streaming:
+        tracked = _AsyncTracked if response.is_async else _tracked
+        response.streaming_content = tracked(response.streaming_content)
+    else:
+        in_flight.exit()
+    return response
+
+
+def _reject(request):
+    """drain 후반이면 503 응답, 아니면 None"""
+    if _accepting.is_set() or request.path in EXEMPT_PATHS:
+        return None
+    metrics["rejected"] += 1
+    response = FastJsonResponse({"detail": "shutting down"}, status=503)
+    response["Retry-After"] = "1"
+    return response
+
+
+class InFlightMiddleware:
+    """
+    처리 중 요청 수를 세고, drain 후반에는 새 요청을 거절한다. MIDDLEWARE 맨 앞에 둔다.
+
+    동기/비동기 모두 지원하므로 ASGI에서도 이벤트 루프에서 바로 실행되어 비동기 뷰의 응답을 감싼다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        rejected = _reject(request)
+        if rejected is not None:
+            return rejected
+        in_flight.enter()
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            in_flight.exit()
+            raise
+        return _track(response)
+
+    async def __acall__(self, request):
+        rejected = _reject(request)
+        if rejected is not None:
+            return rejected
+        in_flight.enter()
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            in_flight.exit()
+            raise
+        return _track(response)
+
+
+def render_metrics():
+    """Prometheus 텍스트 형식의 수명주기 지표"""
+    drain_seconds = metrics["drain_seconds"]
+    if drain_seconds is None and metrics["drain_started_at"] is not None:
+        drain_seconds = time.monotonic() - metrics["drain_started_at"]
+    lines = [
+        "# TYPE service_in_flight_requests gauge",
+        f"service_in_flight_requests {in_flight.count}",
+        "# TYPE service_ready gauge",
+        f"service_ready {int(lifecycle.is_ready())}",
+        "# TYPE service_draining gauge",
+        f"service_draining {int(lifecycle.state() == 'draining')}",
+        "# TYPE service_drain_duration_seconds gauge",
+        f"service_drain_duration_seconds {drain_seconds or 0:.3f}",
+        "# TYPE service_drain_abandoned_requests gauge",
+        f"service_drain_abandoned_requests {metrics['abandoned'] or 0}",
+        "# TYPE service_shutdown_rejected_requests_total counter",
+        f"service_shutdown_rejected_requests_total {metrics['rejected']}",
+        "# TYPE service_warmup_step_seconds gauge",
+    ]
+    lines += [
+        f'service_warmup_step_seconds{{step="{step}"}} {ms / 1000:.4f}'
+        for step, ms in lifecycle.warmup_timings.items()
+    ]
+    return "\n".join(lines) + "\n"
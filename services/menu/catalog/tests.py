@@ -1,7 +1,13 @@
+import asyncio
+import threading
+from unittest import skipUnless
+from django.conf import settings
+from django.db import connection
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
+from unittest.mock import MagicMock, patch
 from .models import PizzaType, Pizza
 
 
@@ -152,6 +158,11 @@ class MenuAPITest(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_menu_list_is_read_only(self):
+        """메뉴 목록은 조회 전용(LightView) 테스트"""
+        self.assertEqual(self.client.head(self.menu_url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.post(self.menu_url, {}).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
     def test_empty_menu_database(self):
         """빈 데이터베이스에서 메뉴 조회 테스트"""
         # 모든 데이터 삭제
@@ -172,6 +183,293 @@ class MenuAPITest(APITestCase):
         self.assertEqual(len(response.data), 0)
 
 
+class MenuCacheTest(APITestCase):
+    """메뉴 스냅샷 캐시와 메뉴 버전 테스트"""
+
+    def setUp(self):
+        """테스트 데이터 설정"""
+        self.pizza_type = PizzaType.objects.create(
+            pizza_type_id="PT001",
+            pizza_nm="페페로니",
+            pizza_categ="클래식",
+            pizza_img_url="http://example.com/pepperoni.jpg"
+        )
+        Pizza.objects.create(pizza_id="PIZZA_001_L", pizza_type=self.pizza_type, size="L", price=25000.00)
+
+    def test_model_change_bumps_version(self):
+        """모델 저장 시 메뉴 버전이 올라가는지 테스트"""
+        from .menu_cache import current_version
+
+        before = current_version()
+        Pizza.objects.create(pizza_id="PIZZA_001_M", pizza_type=self.pizza_type, size="M", price=20000.00)
+
+        self.assertEqual(current_version(), before + 1)
+
+    def test_list_reflects_changes_after_bump(self):
+        """메뉴 변경 후 목록이 갱신되는지 테스트"""
+        self.assertEqual(len(self.client.get(reverse('menu-list')).json()), 1)
+
+        Pizza.objects.create(pizza_id="PIZZA_001_M", pizza_type=self.pizza_type, size="M", price=20000.00)
+
+        self.assertEqual(len(self.client.get(reverse('menu-list')).json()), 2)
+
+    def test_get_pizza_id_from_snapshot(self):
+        """피자 ID/가격 조회가 DB 쿼리 없이 스냅샷에서 처리되는지 테스트"""
+        url = reverse('get_pizza_id')
+        self.client.post(url, {"pizza_nm": "페페로니", "size": "L"}, format='json')
+
+        with self.assertNumQueries(0):
+            response = self.client.post(url, {"pizza_nm": "페페로니", "size": "L"}, format='json')
+
+        self.assertEqual(response.json(), {"pizza_id": "PIZZA_001_L", "price": 25000.0})
+
+    def test_stale_snapshot_served_while_revalidating(self):
+        """확인 주기가 지난 스냅샷은 쿼리 없이 반환하고 갱신은 백그라운드로 한 번만"""
+        from . import menu_cache
+
+        snapshot = menu_cache.get_snapshot()
+        menu_cache._checked_at -= settings.MENU_VERSION_CHECK_SECONDS + 1
+        with patch.object(menu_cache._flight, "refresh") as refresh, self.assertNumQueries(0):
+            self.assertIs(menu_cache.get_snapshot(), snapshot)
+        refresh.assert_called_once_with(menu_cache._KEY, menu_cache._refresh)
+
+        # stale 구간도 지나면 요청 안에서 다시 확인한다
+        menu_cache._checked_at -= settings.MENU_STALE_SECONDS
+        with self.assertNumQueries(1):
+            self.assertIs(menu_cache.get_snapshot(), snapshot)
+
+
+class MenuSearchTest(APITestCase):
+    """메모리 메뉴 검색/자동완성 테스트"""
+
+    TYPES = [
+        ("PT001", "페페로니", "클래식"),
+        ("PT002", "슈퍼 슈프림", "프리미엄"),
+        ("PT003", "불고기", "한식"),
+        ("PT004", "닭갈비 피자", "한식"),
+        ("PT005", "하와이안", "클래식"),
+    ]
+
+    def setUp(self):
+        for type_id, name, categ in self.TYPES:
+            PizzaType.objects.create(pizza_type_id=type_id, pizza_nm=name, pizza_categ=categ, pizza_img_url="")
+        self.url = reverse('menu-search')
+
+    def names(self, q, **params):
+        response = self.client.get(self.url, {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["pizza_nm"] for item in response.json()]
+
+    def test_hangul_prefix_while_typing(self):
+        """입력 중인 글자(자모 단위), 초성, 겹받침 중간 상태도 접두어로 일치"""
+        self.assertEqual(self.names("페페ㄹ"), ["페페로니"])
+        self.assertEqual(self.names("펲"), ["페페로니"])
+        self.assertEqual(self.names("ㅍㅍㄹ"), ["페페로니"])
+        self.assertEqual(self.names("달"), ["닭갈비 피자"])
+        self.assertEqual(self.names("슈퍼슈"), ["슈퍼 슈프림"])
+
+    def test_ranking_and_fuzzy(self):
+        """이름 일치가 카테고리 일치보다 앞, 오타는 n-gram 유사도로"""
+        PizzaType.objects.create(pizza_type_id="PT006", pizza_nm="한식 바베큐", pizza_categ="프리미엄", pizza_img_url="")
+        self.assertEqual(self.names("한식"), ["한식 바베큐", "불고기", "닭갈비 피자"])
+        self.assertEqual(self.names("페퍼로니"), ["페페로니"])
+        self.assertEqual(self.names("한식", limit=1), ["한식 바베큐"])
+        self.assertEqual(self.names(""), [])
+
+    def test_index_built_once_per_menu_version(self):
+        """인덱스는 메뉴 스냅샷이 바뀔 때만 다시 만들고, 검색은 DB를 쓰지 않음"""
+        from . import search
+
+        first = search.get_index()
+        with self.assertNumQueries(0):
+            self.names("페")
+        self.assertIs(search.get_index(), first)
+
+        PizzaType.objects.create(pizza_type_id="PT007", pizza_nm="페스토 치킨", pizza_categ="프리미엄", pizza_img_url="")
+        self.assertEqual(self.names("페"), ["페페로니", "페스토 치킨"])
+        self.assertIsNot(search.get_index(), first)
+
+
+class SingleFlightTest(TestCase):
+    """single-flight 요청 합치기 테스트"""
+
+    def setUp(self):
+        from .singleflight import SingleFlight
+
+        self.flight = SingleFlight()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def slow(self):
+        self.calls += 1
+        self.release.wait(5)
+        return self.calls
+
+    def test_concurrent_callers_share_one_call(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.flight.do("k", self.slow))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        while not self.flight.in_flight("k"):
+            pass
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [1] * 8)
+        self.assertFalse(self.flight.in_flight("k"))
+
+    def test_async_callers_share_one_call(self):
+        async def main():
+            tasks = [asyncio.ensure_future(self.flight.ado("k", self.slow)) for _ in range(8)]
+            await asyncio.sleep(0.05)
+            self.release.set()
+            return await asyncio.gather(*tasks)
+
+        self.assertEqual(asyncio.run(main()), [1] * 8)
+        self.assertEqual(self.calls, 1)
+
+    def test_sync_and_async_callers_share_one_call(self):
+        """동기 do()가 실행 중인 키에 비동기 ado()가 들어와도 실행은 한 번"""
+        results = []
+        thread = threading.Thread(target=lambda: results.append(self.flight.do("k", self.slow)))
+        thread.start()
+        while not self.flight.in_flight("k"):
+            pass
+
+        async def main():
+            task = asyncio.ensure_future(self.flight.ado("k", self.slow))
+            await asyncio.sleep(0.05)
+            self.release.set()
+            return await task
+
+        self.assertEqual(asyncio.run(main()), 1)
+        thread.join()
+        self.assertEqual(results, [1])
+        self.assertEqual(self.calls, 1)
+
+    def test_error_is_shared_and_not_cached(self):
+        def boom():
+            raise RuntimeError("db down")
+
+        with self.assertRaises(RuntimeError):
+            self.flight.do("k", boom)
+        self.assertEqual(self.flight.do("k", lambda: "ok"), "ok")
+
+    def test_refresh_starts_only_when_idle(self):
+        with patch("catalog.singleflight.threading.Thread") as thread:
+            self.assertTrue(self.flight.refresh("k", self.slow))
+            self.assertFalse(self.flight.refresh("k", self.slow))
+        thread.return_value.start.assert_called_once()
+
+
+class MessagePackNegotiationTest(APITestCase):
+    """내부 엔드포인트 MessagePack 협상 테스트"""
+
+    def setUp(self):
+        pizza_type = PizzaType.objects.create(
+            pizza_type_id="PT001",
+            pizza_nm="페페로니",
+            pizza_categ="클래식",
+            pizza_img_url="http://example.com/pepperoni.jpg"
+        )
+        Pizza.objects.create(pizza_id="PIZZA_001_L", pizza_type=pizza_type, size="L", price=25000.00)
+        self.url = reverse('get_pizza_id')
+
+    def test_msgpack_request_and_response(self):
+        """Content-Type/Accept가 msgpack이면 MessagePack으로 주고받음"""
+        from .negotiation import MSGPACK, packb, unpackb
+
+        response = self.client.post(
+            self.url, packb({"pizza_nm": "페페로니", "size": "L"}), content_type=MSGPACK, HTTP_ACCEPT=MSGPACK
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], MSGPACK)
+        self.assertIn("Accept", response["Vary"])
+        self.assertEqual(unpackb(response.content), {"pizza_id": "PIZZA_001_L", "price": 25000.0})
+
+    def test_json_remains_default(self):
+        """Accept 없이 요청하면 기존과 같이 JSON"""
+        response = self.client.post(self.url, {"pizza_nm": "페페로니", "size": "S"}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_accept_quality_values(self):
+        """Accept는 q-값으로 판단: q=0이나 JSON이 더 선호되면 JSON"""
+        from .negotiation import MSGPACK
+
+        cases = [
+            (f"{MSGPACK};q=0", "application/json"),
+            (f"{MSGPACK};q=0, */*", "application/json"),
+            (f"application/json, {MSGPACK};q=0.5", "application/json"),
+            ("*/*", "application/json"),
+            (f"application/json;q=0.5, {MSGPACK}", MSGPACK),
+        ]
+        for accept, expected in cases:
+            with self.subTest(accept=accept):
+                response = self.client.post(
+                    self.url, {"pizza_nm": "페페로니", "size": "L"}, format='json', HTTP_ACCEPT=accept
+                )
+                self.assertEqual(response["Content-Type"], expected)
+
+    def test_malformed_msgpack(self):
+        from .negotiation import MSGPACK
+
+        response = self.client.post(self.url, b"\xc1", content_type=MSGPACK)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@skipUnless(connection.vendor == "postgresql", "COPY 적재는 PostgreSQL 전용")
+class MenuLoaderTest(TestCase):
+    """COPY 기반 메뉴 적재 테스트"""
+
+    TYPES_CSV = (
+        "pizza_type_id,pizza_nm,pizza_categ,pizza_img_url\n"
+        "PT001,페페로니,클래식,http://example.com/pepperoni.jpg\n"
+    )
+
+    def test_load_and_upsert(self):
+        """적재 후 재적재 시 변경분만 갱신되는지 테스트"""
+        import io
+        from .loader import load_menu
+        from .menu_cache import current_version
+
+        pizzas = "pizza_id,pizza_type_id,size,price\nPIZZA_001_L,PT001,L,25000\n"
+        stats = load_menu(io.StringIO(self.TYPES_CSV), io.StringIO(pizzas))
+        self.assertEqual((stats["types_inserted"], stats["pizzas_inserted"]), (1, 1))
+        version = current_version()
+
+        pizzas = "pizza_id,pizza_type_id,size,price\nPIZZA_001_L,PT001,L,26000\n"
+        stats = load_menu(io.StringIO(self.TYPES_CSV), io.StringIO(pizzas))
+        self.assertEqual((stats["types_updated"], stats["pizzas_updated"]), (0, 1))
+        self.assertEqual(Pizza.objects.get(pizza_id="PIZZA_001_L").price, 26000)
+        self.assertEqual(current_version(), version + 1)
+
+    def test_missing_pizza_type_rejected(self):
+        """존재하지 않는 피자 타입을 참조하면 전체 적재가 거부되는지 테스트"""
+        import io
+        from .loader import MenuLoadError, load_menu
+
+        pizzas = "pizza_id,pizza_type_id,size,price\nPIZZA_X,NOPE,L,1000\n"
+        with self.assertRaises(MenuLoadError):
+            load_menu(io.StringIO(self.TYPES_CSV), io.StringIO(pizzas))
+        self.assertFalse(PizzaType.objects.filter(pizza_type_id="PT001").exists())
+
+
+    def test_blank_pizza_type_reported(self):
+        """pizza_type_id가 비어 있으면 제약 위반 대신 검증 오류로 보고되는지 테스트"""
+        import io
+        from .loader import MenuLoadError, load_menu
+
+        pizzas = "pizza_id,pizza_type_id,size,price\nPIZZA_001_L,PT001,L,25000\nPIZZA_Y,,L,1000\n"
+        with self.assertRaises(MenuLoadError) as raised:
+            load_menu(io.StringIO(self.TYPES_CSV), io.StringIO(pizzas))
+        self.assertEqual(raised.exception.errors, ["pizza: 필수 값 누락, 길이 초과 또는 음수 가격 PIZZA_Y"])
+
 class PizzaDataIntegrityTest(TestCase):
     """피자 데이터 무결성 테스트"""
 
@@ -219,3 +517,66 @@ class PizzaDataIntegrityTest(TestCase):
                 size="M",
                 price=20000.00
             )
+
+
+class ReadinessTest(APITestCase):
+    """워밍업 / readiness 테스트"""
+
+    def setUp(self):
+        from . import lifecycle
+
+        self.lifecycle = lifecycle
+        lifecycle._warmed.clear()
+        lifecycle._draining.clear()
+        self.addCleanup(lifecycle._warmed.clear)
+        self.addCleanup(lifecycle._draining.clear)
+
+    def test_ready_only_after_warmup_and_not_while_draining(self):
+        """워밍업 전 503, 워밍업 후 200, drain 중 다시 503"""
+        self.assertEqual(self.client.get("/readyz").status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(self.client.get("/livez").status_code, status.HTTP_200_OK)
+
+        self.assertTrue(self.lifecycle.warm_up())
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.json()["warmup_ms"]), {name for name, _ in self.lifecycle.WARMUP_STEPS})
+
+        self.lifecycle.begin_drain()
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json()["status"], "draining")
+
+    def test_failed_step_keeps_pod_unready(self):
+        failing = [("db", MagicMock(side_effect=RuntimeError("down")))]
+        with patch.object(self.lifecycle, "WARMUP_STEPS", failing), self.assertLogs(self.lifecycle.logger, "ERROR"):
+            self.assertFalse(self.lifecycle.warm_up())
+        self.assertEqual(self.client.get("/readyz").status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class FastJsonTest(TestCase):
+    """fastjson 인코딩/폴백 테스트"""
+
+    def test_response_encodes_decimal_and_unicode(self):
+        """Decimal과 한글이 포함된 응답 인코딩 테스트"""
+        from decimal import Decimal
+        from .fastjson import FastJsonResponse, loads
+
+        response = FastJsonResponse({"price": Decimal("25000.50"), "name": "페페로니"})
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(loads(response.content), {"price": "25000.50", "name": "페페로니"})
+
+    def test_stdlib_fallback(self):
+        """orjson이 없을 때 표준 json 폴백 테스트"""
+        from . import fastjson
+
+        with patch.object(fastjson, "orjson", None):
+            body = fastjson.dumps([{"a": 1}])
+            self.assertEqual(fastjson.loads(body), [{"a": 1}])
+
+    def test_non_dict_requires_safe_false(self):
+        """safe=False 없이 리스트 직렬화 시 TypeError 테스트"""
+        from .fastjson import FastJsonResponse
+
+        with self.assertRaises(TypeError):
+            FastJsonResponse([1, 2])
@@ -1,12 +1,15 @@
 from django.urls import path
-from .views import HealthView, PizzaListView, PizzaTypesView, GetPizzaIdView
+from .views import HealthView, ReadyView, MetricsView, PizzaListView, PizzaTypesView, MenuSearchView, GetPizzaIdView
 
 urlpatterns = [
     path("", HealthView.as_view()),
     path("healthz", HealthView.as_view()),
     path("livez", HealthView.as_view()),
+    path("readyz", ReadyView.as_view(), name="readyz"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
     path("api/menu/", PizzaListView.as_view(), name="menu-list"),
     path("api/menu/types/", PizzaTypesView.as_view(), name="pizza-types-list"),
+    path("api/menu/search/", MenuSearchView.as_view(), name="menu-search"),
     path("api/menu/get_pizza_id/", GetPizzaIdView.as_view(), name="get_pizza_id"),
 ]
 
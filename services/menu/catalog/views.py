@@ -1,58 +1,71 @@
-from django.http import JsonResponse
+from django.http import HttpResponse
+from .fastjson import FastJsonResponse
+from .lightviews import LightView
+from . import lifecycle
+from .shutdown import render_metrics
+from .negotiation import INTERNAL_PARSERS, INTERNAL_RENDERERS, negotiated_response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
-from .models import PizzaType, Pizza
+from .menu_cache import get_snapshot
+from .search import get_index
 
 
-class HealthView(APIView):
-    permission_classes = [AllowAny]
+class HealthView(LightView):
+    def get(self, request):
+        return FastJsonResponse({"status": "ok"})
+
+
+class MetricsView(LightView):
+    """수명주기 지표 (Prometheus 텍스트 형식)"""
 
     def get(self, request):
-        return JsonResponse({"status": "ok"})
+        return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4")
 
-class PizzaListView(APIView):
-    permission_classes = [AllowAny]
+
+class ReadyView(LightView):
+    """readiness: 워밍업이 끝나고 종료(drain) 중이 아닐 때만 200"""
 
     def get(self, request):
-        pizzas = Pizza.objects.select_related('pizza_type').all() 
-        items = [
-            {
-                "pizza_id": p.pizza_id,
-                "pizza_type__pizza_nm": p.pizza_type.pizza_nm, 
-                "size": p.size,
-                "price": p.price,
-            }
-            for p in pizzas
-        ]
-        return JsonResponse(items, safe=False)
-
-class PizzaTypesView(APIView):
-    permission_classes = [AllowAny]
+        current = lifecycle.state()
+        return FastJsonResponse(
+            {"status": current, "warmup_ms": lifecycle.warmup_timings},
+            status=200 if current == "ready" else 503,
+        )
 
+class PizzaListView(LightView):
     def get(self, request):
-        items = [
-            {
-                "pizza_type_id": t.pizza_type_id,
-                "pizza_nm": t.pizza_nm,
-                "pizza_categ": t.pizza_categ,
-                "pizza_img_url": t.pizza_img_url,
-            }
-            for t in PizzaType.objects.all()
-        ]
-        return JsonResponse(items, safe=False)
+        return FastJsonResponse(get_snapshot().pizzas, safe=False)
+
+class PizzaTypesView(LightView):
+    def get(self, request):
+        return FastJsonResponse(get_snapshot().types, safe=False)
+
+
+class MenuSearchView(LightView):
+    """피자 이름/카테고리 검색·자동완성 (메모리 인덱스, 초성/입력 중인 글자 지원)"""
+
+    MAX_LIMIT = 50
+
+    def get(self, request):
+        try:
+            limit = int(request.GET.get("limit", 10))
+        except ValueError:
+            return FastJsonResponse({"detail": "invalid limit"}, status=400)
+        limit = max(1, min(limit, self.MAX_LIMIT))
+        return FastJsonResponse(get_index().search(request.GET.get("q", ""), limit), safe=False)
 
 
 class GetPizzaIdView(APIView):
+    """order-service 내부 호출: JSON 또는 MessagePack (Accept/Content-Type 협상)"""
+
     permission_classes = [AllowAny]
+    parser_classes = INTERNAL_PARSERS
+    renderer_classes = INTERNAL_RENDERERS
 
     def post(self, request):
         name = request.data.get("pizza_nm")
         size = request.data.get("size")
-        try:
-            pizza_type = PizzaType.objects.get(pizza_nm=name)
-            pizza = Pizza.objects.get(pizza_type=pizza_type, size=size)
-            return JsonResponse({"pizza_id": pizza.pizza_id})
-        except (PizzaType.DoesNotExist, Pizza.DoesNotExist):
-            return JsonResponse({"detail": "not found"}, status=404)
-
-
+        pizza = get_snapshot().by_name_size.get((name, size))
+        if pizza is None:
+            return negotiated_response(request, {"detail": "not found"}, status=404)
+        return negotiated_response(request, {"pizza_id": pizza["pizza_id"], "price": pizza["price"]})
@@ -5,4 +5,9 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "menu_service.settings")
 
 application = get_asgi_application()
 
+# 앱 레지스트리가 준비된 뒤 워밍업 시작 (/readyz는 완료 후 200), SIGTERM 시 drain 후 종료
+from catalog.lifecycle import start_warmup  # noqa: E402
+from catalog.shutdown import install_signal_handlers  # noqa: E402
 
+start_warmup()
+install_signal_handlers()
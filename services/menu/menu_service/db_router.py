@@ -0,0 +1,74 @@
+"""
+읽기 복제본(replica) 라우팅.
+
+POSTGRES_REPLICA_HOST가 설정되면 DATABASES["replica"]가 추가되고, ReadReplicaMiddleware가
+안전한 메서드(GET/HEAD/OPTIONS) 요청 동안에만 읽기를 replica로 보낸다. 그 외(쓰기 요청, 관리 명령,
+트랜잭션 안의 읽기)는 모두 primary(default)를 쓴다.
+
+menu-service에는 회원의 쓰기 요청이 없으므로 read-your-writes 고정은 두지 않는다. 메뉴 변경은 관리 명령/어드민이
+primary에 쓰고, 스냅샷은 replica의 menu_version을 기준으로 다시 읽으므로 복제 지연이 있어도 버전과 내용이 일관된다.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+REPLICA_ALIAS = "replica"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_read_alias = ContextVar("read_alias", default=None)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections["default"].in_atomic_block:
+            return "default"
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica는 default의 복제이므로 같은 데이터베이스로 취급한다.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+def replica_enabled():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def _routed(iterable, alias):
+    """스트리밍 응답 본문도 요청과 같은 DB에서 읽도록 청크마다 라우팅을 적용"""
+    iterator = iter(iterable)
+    while True:
+        token = _read_alias.set(alias)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _read_alias.reset(token)
+        yield chunk
+
+
+class ReadReplicaMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_enabled() or request.method not in SAFE_METHODS:
+            return self.get_response(request)
+
+        alias = REPLICA_ALIAS
+        token = _read_alias.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        if response.streaming and not response.is_async:
+            response.streaming_content = _routed(response.streaming_content, alias)
+        return response
@@ -19,14 +19,22 @@ INSTALLED_APPS = [
     "catalog.apps.CatalogConfig",  # AppConfig 클래스 직접 사용
 ]
 
+# 관리자 화면은 DEBUG(로컬 개발)에서만 기본으로 켠다. 운영 API 파드는 admin 없이 떠서 기동 시간을 줄인다
+# (profile_startup 참고). 운영에서 필요하면 DJANGO_ADMIN_ENABLED=1
+ADMIN_ENABLED = os.getenv("DJANGO_ADMIN_ENABLED", "1" if DEBUG else "0") == "1"
+if not ADMIN_ENABLED:
+    INSTALLED_APPS.remove("django.contrib.admin")
+
 # catalog 앱 명시적 로드
 from catalog.apps import CatalogConfig
 
 MIDDLEWARE = [
+    "catalog.shutdown.InFlightMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "menu_service.db_router.ReadReplicaMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -65,6 +73,16 @@ DATABASES = {
     }
 }
 
+# 읽기 복제본: 설정되면 안전한 메서드(GET 등) 요청의 읽기를 replica로 보낸다 (menu_service/db_router.py)
+if os.getenv("POSTGRES_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("POSTGRES_REPLICA_HOST"),
+        "PORT": os.getenv("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["menu_service.db_router.PrimaryReplicaRouter"]
+
 LANGUAGE_CODE = "ko-kr"
 TIME_ZONE = os.getenv("TZ", "Asia/Seoul")
 USE_I18N = True
@@ -75,4 +93,29 @@ DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "catalog.fastjson.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "catalog.fastjson.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+
+
+# 메뉴 캐시가 menu_version을 다시 확인하는 주기(초)
+MENU_VERSION_CHECK_SECONDS = float(os.getenv("MENU_VERSION_CHECK_SECONDS", "2"))
+# 확인 주기가 지난 뒤에도 이전 스냅샷을 반환하며 백그라운드에서 갱신하는 시간(초, 0이면 끔)
+MENU_STALE_SECONDS = float(os.getenv("MENU_STALE_SECONDS", "30"))
+
+# 기동 시 워밍업 (끄면 즉시 ready) / 실패 시 재시도 간격
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "1") == "1"
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "2"))
 
+# 종료 시 readiness를 내린 뒤 요청을 계속 받는 시간 / 처리 중 요청을 기다리는 최대 시간 (SIGTERM 기준)
+SHUTDOWN_PROPAGATION_SECONDS = float(os.getenv("SHUTDOWN_PROPAGATION_SECONDS", "2"))
+SHUTDOWN_DRAIN_TIMEOUT_SECONDS = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT_SECONDS", "25"))
@@ -3,6 +3,31 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "order_service.settings")
 
-application = get_asgi_application()
+# 컨테이너에서 이 application은 주문 상태 SSE(/api/order/status/stream/ 이하) 전용 uvicorn 프로세스로만 뜬다
+# (serve.sh). SSE는 ASGI에서만 연결마다 스레드를 점유하지 않고 바로바로 전송된다. 나머지 동기 API는 스레드로
+# 처리하는 WSGI(gunicorn, wsgi.py)에서 받으므로 여기서는 프로브 외에는 404로 돌려보낸다.
+django_application = get_asgi_application()
 
+# 앱 레지스트리가 준비된 뒤 워밍업 시작 (/readyz는 완료 후 200), 월 파티션 유지, SIGTERM 시 drain 후 종료
+from orders.lifecycle import start_warmup  # noqa: E402
+from orders.partitions import start_maintenance  # noqa: E402
+from orders.shutdown import EXEMPT_PATHS, install_signal_handlers  # noqa: E402
 
+STREAM_PREFIX = "/api/order/status/stream/"
+
+
+async def application(scope, receive, send):
+    if scope["type"] != "http" or scope["path"].startswith(STREAM_PREFIX) or scope["path"] in EXEMPT_PATHS:
+        return await django_application(scope, receive, send)
+    body = b'{"detail": "served by the WSGI API port"}'
+    await send({
+        "type": "http.response.start",
+        "status": 404,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+start_warmup()
+start_maintenance()
+install_signal_handlers()
@@ -0,0 +1,175 @@
+"""
+읽기 복제본(replica) 라우팅.
+
+POSTGRES_REPLICA_HOST가 설정되면 DATABASES["replica"]가 추가되고, ReadReplicaMiddleware가
+안전한 메서드(GET/HEAD/OPTIONS) 요청 동안에만 읽기를 replica로 보낸다. 그 외(쓰기 요청, 관리 명령,
+트랜잭션 안의 읽기)는 모두 primary(default)를 쓴다.
+
+read-your-writes: 회원의 요청이 실제로 primary에 쓰고(라우터의 db_for_write를 거친 경우) 성공하면
+READ_REPLICA_STICKY_SECONDS 동안 그 회원의 읽기를 primary로 고정한다. 쓰지 않는 POST(견적 등)는 고정하지 않는다.
+ORM을 거치지 않는 원시 SQL 쓰기만 하는 경로는 note_write()를 직접 호출한다. 고정 표시는 서명된 쿠키(회원 id + 발급 시각)로 클라이언트가 들고 다니므로 어느 워커/파드가
+다음 요청을 받아도 같게 판단하고, 서버 쪽 공유 저장소가 필요 없다.
+"""
+from contextvars import ContextVar
+
+import jwt
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+REPLICA_ALIAS = "replica"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_COOKIE = "db_sticky"
+STICKY_SALT = "db_router.sticky"
+
+_read_alias = ContextVar("read_alias", default=None)
+# 요청 동안의 쓰기 기록. 가변 객체라 sync_to_async 스레드에서 표시해도 미들웨어가 본다.
+_writes = ContextVar("writes", default=None)
+
+
+class _Writes:
+    def __init__(self):
+        self.happened = False
+
+
+def note_write():
+    """현재 요청이 primary에 썼음을 기록한다 (요청 밖에서는 아무것도 하지 않는다)."""
+    writes = _writes.get()
+    if writes is not None:
+        writes.happened = True
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections["default"].in_atomic_block:
+            return "default"
+        return alias
+
+    def db_for_write(self, model, **hints):
+        note_write()
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica는 default의 복제이므로 같은 데이터베이스로 취급한다.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+def replica_enabled():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def _member_id(request):
+    """라우팅 판단용 회원 식별 (인증은 각 뷰가 따로 한다)"""
+    auth = request.headers.get("Authorization", "")
+    if not auth.startswith("Bearer "):
+        return None
+    try:
+        payload = jwt.decode(auth[7:], settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+    except jwt.PyJWTError:
+        return None
+    return payload.get("member_id")
+
+
+def mark_sticky(response, member_id):
+    response.set_signed_cookie(
+        STICKY_COOKIE, member_id, salt=STICKY_SALT,
+        max_age=settings.READ_REPLICA_STICKY_SECONDS, httponly=True, samesite="Lax",
+    )
+
+
+def is_sticky(request, member_id):
+    # 만료는 서명의 발급 시각으로 판단하므로 클라이언트가 쿠키를 오래 들고 있어도 연장되지 않는다.
+    value = request.get_signed_cookie(
+        STICKY_COOKIE, default=None, salt=STICKY_SALT, max_age=settings.READ_REPLICA_STICKY_SECONDS
+    )
+    return value == member_id
+
+
+def _routed(iterable, alias):
+    """스트리밍 응답 본문도 요청과 같은 DB에서 읽도록 청크마다 라우팅을 적용"""
+    iterator = iter(iterable)
+    while True:
+        token = _read_alias.set(alias)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _read_alias.reset(token)
+        yield chunk
+
+
+async def _arouted(aiterable, alias):
+    """비동기 스트리밍 응답: 청크를 기다리는 동안(그 안의 sync_to_async 호출 포함) 라우팅을 적용"""
+    iterator = aiter(aiterable)
+    while True:
+        token = _read_alias.set(alias)
+        try:
+            chunk = await anext(iterator)
+        except StopAsyncIteration:
+            return
+        finally:
+            _read_alias.reset(token)
+        yield chunk
+
+
+class ReadReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _begin(self, request):
+        """요청 전: (회원 id, 읽기 alias, 쓰기 기록)을 정하고 컨텍스트 변수 토큰을 반환한다."""
+        member_id = _member_id(request)
+        if request.method not in SAFE_METHODS:
+            alias = None
+        else:
+            alias = "default" if member_id and is_sticky(request, member_id) else REPLICA_ALIAS
+        writes = _Writes()
+        return member_id, alias, writes, (_read_alias.set(alias), _writes.set(writes))
+
+    def _end(self, tokens):
+        read_token, writes_token = tokens
+        _writes.reset(writes_token)
+        _read_alias.reset(read_token)
+
+    def _finish(self, response, member_id, alias, writes):
+        if alias is None:
+            if member_id and writes.happened and response.status_code < 400:
+                mark_sticky(response, member_id)
+        elif response.streaming:
+            routed = _arouted if response.is_async else _routed
+            response.streaming_content = routed(response.streaming_content, alias)
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_enabled():
+            return self.get_response(request)
+
+        member_id, alias, writes, tokens = self._begin(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self._end(tokens)
+        return self._finish(response, member_id, alias, writes)
+
+    async def __acall__(self, request):
+        if not replica_enabled():
+            return await self.get_response(request)
+
+        member_id, alias, writes, tokens = self._begin(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._end(tokens)
+        return self._finish(response, member_id, alias, writes)
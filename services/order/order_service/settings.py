@@ -19,13 +19,21 @@ INSTALLED_APPS = [
     "orders.apps.OrdersConfig",  
 ]
 
+# 관리자 화면은 DEBUG(로컬 개발)에서만 기본으로 켠다. 운영 API 파드는 admin 없이 떠서 기동 시간을 줄인다
+# (profile_startup 참고). 운영에서 필요하면 DJANGO_ADMIN_ENABLED=1
+ADMIN_ENABLED = os.getenv("DJANGO_ADMIN_ENABLED", "1" if DEBUG else "0") == "1"
+if not ADMIN_ENABLED:
+    INSTALLED_APPS.remove("django.contrib.admin")
+
 from orders.apps import OrdersConfig
 
 MIDDLEWARE = [
+    "orders.shutdown.InFlightMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "order_service.db_router.ReadReplicaMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -64,6 +72,18 @@ DATABASES = {
     }
 }
 
+# 읽기 복제본: 설정되면 안전한 메서드(GET 등) 요청의 읽기를 replica로 보낸다 (order_service/db_router.py)
+if os.getenv("POSTGRES_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("POSTGRES_REPLICA_HOST"),
+        "PORT": os.getenv("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["order_service.db_router.PrimaryReplicaRouter"]
+# 회원의 쓰기 요청 이후 이 시간 동안 그 회원의 읽기는 primary에서 (read-your-writes)
+READ_REPLICA_STICKY_SECONDS = int(os.getenv("READ_REPLICA_STICKY_SECONDS", "5"))
+
 LANGUAGE_CODE = "ko-kr"
 TIME_ZONE = os.getenv("TZ", "Asia/Seoul")
 USE_I18N = True
@@ -74,8 +94,72 @@ DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "orders.fastjson.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "orders.fastjson.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
 # JWT 설정
 JWT_SECRET = os.getenv("JWT_SECRET", "pz-ay7!@#")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_ACCESS_TTL_SECONDS = int(os.getenv("JWT_ACCESS_TTL_SECONDS", "3600"))
 
+# 내부 API(주문 상태 변경, 리포트, 내보내기) 호출에 X-Internal-Token 헤더로 보내는 공유 토큰. 비어 있으면 내부 API를 모두 거절
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN", "")
+
+# 주문 생성 Idempotency-Key 보관 기간 / 처음 요청의 선점 시간(지나면 다른 요청이 이어받음) / 같은 키 동시 요청의 최대 대기
+IDEMPOTENCY_KEY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_KEY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_LEASE_SECONDS = float(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "30"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+
+# 주문 이벤트 outbox 릴레이
+OUTBOX_SINK = os.getenv("OUTBOX_SINK", "orders.outbox.FileSink")
+OUTBOX_SINK_OPTIONS = {"path": os.getenv("OUTBOX_FILE_PATH", str(BASE_DIR / "var" / "outbox.ndjson"))}
+
+# 프로세스 내 지점 레지스트리 갱신 주기 / 주기 이후 이전 스냅샷을 반환하며 백그라운드 갱신하는 시간 / 없는 branchId 조회 시 재적재 최소 간격
+BRANCH_REGISTRY_REFRESH_SECONDS = float(os.getenv("BRANCH_REGISTRY_REFRESH_SECONDS", "30"))
+BRANCH_REGISTRY_STALE_SECONDS = float(os.getenv("BRANCH_REGISTRY_STALE_SECONDS", "300"))
+BRANCH_REGISTRY_MISS_RELOAD_SECONDS = float(os.getenv("BRANCH_REGISTRY_MISS_RELOAD_SECONDS", "1"))
+
+# 견적용 메뉴 가격 캐시 갱신 주기 / 주기 이후 이전 캐시를 반환하며 백그라운드 갱신하는 시간 / 없는 메뉴 조회 시 재적재 최소 간격
+MENU_PRICE_CACHE_REFRESH_SECONDS = float(os.getenv("MENU_PRICE_CACHE_REFRESH_SECONDS", "60"))
+MENU_PRICE_CACHE_STALE_SECONDS = float(os.getenv("MENU_PRICE_CACHE_STALE_SECONDS", "600"))
+MENU_PRICE_CACHE_MISS_RELOAD_SECONDS = float(os.getenv("MENU_PRICE_CACHE_MISS_RELOAD_SECONDS", "5"))
+
+# orders / order_detail 월별 파티션을 미리 만들어 둘 개월 수 / 각 프로세스가 파티션을 확인해 만드는 주기 (0이면 끔)
+ORDER_PARTITION_MONTHS_AHEAD = int(os.getenv("ORDER_PARTITION_MONTHS_AHEAD", "3"))
+ORDER_PARTITION_ENSURE_SECONDS = float(os.getenv("ORDER_PARTITION_ENSURE_SECONDS", "21600"))
+
+# 콜드 보관: 보관 파일 디렉터리 (모든 파드가 보는 공유 볼륨) / 보관 대상 주문 나이(일) / 보관 목록 갱신 주기
+ORDER_ARCHIVE_DIR = os.getenv("ORDER_ARCHIVE_DIR", str(BASE_DIR / "var" / "archive"))
+ORDER_ARCHIVE_AFTER_DAYS = int(os.getenv("ORDER_ARCHIVE_AFTER_DAYS", "365"))
+ORDER_ARCHIVE_MANIFEST_REFRESH_SECONDS = float(os.getenv("ORDER_ARCHIVE_MANIFEST_REFRESH_SECONDS", "300"))
+
+# 지점별 인기 피자: 감쇠 반감기(일) / forward decay 기준일 / 지점당 메모리에 두는 순위 수 / 스냅샷 갱신 주기
+POPULARITY_HALF_LIFE_DAYS = float(os.getenv("POPULARITY_HALF_LIFE_DAYS", "14"))
+POPULARITY_EPOCH = os.getenv("POPULARITY_EPOCH", "2024-01-01")
+POPULARITY_TOP_N = int(os.getenv("POPULARITY_TOP_N", "20"))
+POPULARITY_REFRESH_SECONDS = float(os.getenv("POPULARITY_REFRESH_SECONDS", "60"))
+
+# 주문 상태 SSE 피드: 워커당 변경분 조회 주기 / 늦은 커밋 대비 재조회 구간 / keep-alive 간격 / 클라이언트 재연결 대기
+ORDER_STATUS_POLL_SECONDS = float(os.getenv("ORDER_STATUS_POLL_SECONDS", "1"))
+ORDER_STATUS_FEED_OVERLAP_SECONDS = float(os.getenv("ORDER_STATUS_FEED_OVERLAP_SECONDS", "5"))
+ORDER_STATUS_HEARTBEAT_SECONDS = float(os.getenv("ORDER_STATUS_HEARTBEAT_SECONDS", "15"))
+ORDER_STATUS_RETRY_MS = int(os.getenv("ORDER_STATUS_RETRY_MS", "3000"))
+# SSE 연결용 1회용 티켓 유효 시간
+ORDER_STATUS_TICKET_TTL_SECONDS = int(os.getenv("ORDER_STATUS_TICKET_TTL_SECONDS", "30"))
+
+# 기동 시 워밍업 (끄면 즉시 ready) / 실패 시 재시도 간격
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "1") == "1"
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "2"))
+
+# 종료 시 readiness를 내린 뒤 요청을 계속 받는 시간 / 처리 중 요청을 기다리는 최대 시간 (SIGTERM 기준)
+SHUTDOWN_PROPAGATION_SECONDS = float(os.getenv("SHUTDOWN_PROPAGATION_SECONDS", "2"))
+SHUTDOWN_DRAIN_TIMEOUT_SECONDS = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT_SECONDS", "25"))
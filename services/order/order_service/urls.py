@@ -1,9 +1,11 @@
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("", include("orders.urls")),
 ]
 
+if settings.ADMIN_ENABLED:
+    from django.contrib import admin
 
+    urlpatterns.insert(0, path("admin/", admin.site.urls))
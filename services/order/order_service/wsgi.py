@@ -5,4 +5,11 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "order_service.settings")
 
 application = get_wsgi_application()
 
-
+# 앱 레지스트리가 준비된 뒤 워밍업 시작 (/readyz는 완료 후 200), 월 파티션 유지, SIGTERM 시 drain 후 종료
+from orders.lifecycle import start_warmup  # noqa: E402
+from orders.partitions import start_maintenance  # noqa: E402
+from orders.shutdown import install_signal_handlers  # noqa: E402
+
+start_warmup()
+start_maintenance()
+install_signal_handlers()
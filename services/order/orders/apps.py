@@ -9,4 +9,10 @@ class OrdersConfig(AppConfig):
 
     def ready(self):
         """앱이 준비될 때 호출되는 메서드"""
-        pass
+        from django.db.models.signals import post_delete, post_save
+
+        from .branches import on_branch_change
+        from .models import Branch
+
+        post_save.connect(on_branch_change, sender=Branch)
+        post_delete.connect(on_branch_change, sender=Branch)
@@ -0,0 +1,257 @@
+"""
+오래된 주문의 콜드 보관과 주문 내역 read-through.
+
+archive_orders 명령이 cutoff 이전의 주문을 가장 오래된 달부터 한 달씩 ORDER_ARCHIVE_DIR/orders_YYYYMM.jsonl.gz로
+옮기고 order_archive 목록에 기록한 뒤 DB에서 지운다. 파티션 테이블이면 그 달 파티션을 떼어 내 지우고,
+아니면 batch_size건씩 지운다.
+
+파일은 회원/주문 순으로 정렬한 상세 행을 batch_size행씩 묶은 컬럼 단위 블록의 gzip NDJSON이다. 블록마다
+회원 범위 헤더 한 줄과 {컬럼: 값 목록} 한 줄을 쓰므로, 한 회원을 찾을 때는 헤더만 읽고 범위가 맞는 블록만
+디코딩한다. 회원/지점/날짜/상태처럼 같은 값이 이어지는 컬럼이 모여 행 단위보다 잘 압축된다.
+
+보관된 달은 항상 가장 오래된 달부터 이어진 구간이다. 그 다음 날(boundary) 이전은 파일에서, 이후는 DB에서 읽고
+주문 내역은 요청한 기간이 boundary 이전을 포함할 때만 파일을 읽는다.
+"""
+import datetime
+import gzip
+import hashlib
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, Min
+
+from .export import MY_ORDER_FIELDS
+from .fastjson import dumps, loads
+from .models import Order, OrderArchive, OrderDetail
+from .partitions import TABLES, add_months, filter_days, is_partitioned, month_start, partition_name
+from .singleflight import SingleFlight
+from .status import OPEN_STATUSES
+
+# 파일 컬럼 -> 조회 필드 (회원 기준 정렬이라 member_id가 첫 컬럼)
+ARCHIVE_FIELDS = {
+    "member_id": "order__member_id",
+    "order_id": "order_id",
+    "order_detail_id": "order_detail_id",
+    "bran_id": "order__bran_id",
+    "date": "order__date",
+    "time": "order__time",
+    "total": "order__total",
+    "status": "order__status",
+    "pizza_id": "pizza_id",
+    "quantity": "quantity",
+    "unit_price": "unit_price",
+    "line_total": "line_total",
+}
+
+
+class ArchiveError(Exception):
+    """보관할 수 없는 달 (진행 중인 주문, 상세가 없는 주문)"""
+
+
+def month_end(month):
+    return add_months(month, 1) - datetime.timedelta(days=1)
+
+
+def archive_name(month):
+    return f"orders_{month:%Y%m}.jsonl.gz"
+
+
+def archive_path(name):
+    return os.path.join(settings.ORDER_ARCHIVE_DIR, name)
+
+
+def _blocks(rows, size):
+    block = []
+    for row in rows:
+        block.append(row)
+        if len(block) >= size:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_month(month, path, batch_size=10000):
+    """month 한 달치 상세 행을 path에 쓰고 (주문 수, 행 수, sha256)을 반환한다. 다 쓴 뒤에만 path가 생긴다."""
+    rows = (
+        filter_days(OrderDetail.objects.all(), month, month_end(month))
+        .order_by("order__member_id", "order_id", "order_detail_id")
+        .values_list(*ARCHIVE_FIELDS.values())
+        .iterator(chunk_size=batch_size)
+    )
+    columns = list(ARCHIVE_FIELDS)
+    order_ids = set()
+    lines = 0
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as out:
+            for block in _blocks(rows, batch_size):
+                members = [row[0] for row in block]
+                # 정렬은 DB collation 기준이므로 범위는 블록 안에서 직접 구한다.
+                out.write(dumps({"members": [min(members), max(members)], "rows": len(block)}) + b"\n")
+                out.write(dumps(dict(zip(columns, map(list, zip(*block))))) + b"\n")
+                order_ids.update(row[1] for row in block)
+                lines += len(block)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+    return len(order_ids), lines, _sha256(path)
+
+
+def count_rows(path):
+    """블록 헤더만 읽어 파일의 행 수를 센다."""
+    total = 0
+    with gzip.open(path, "rb") as f:
+        for header in f:
+            next(f)
+            total += loads(header)["rows"]
+    return total
+
+
+def read_member(path, member_id):
+    """path에서 member_id의 행을 {컬럼: 값}으로 (회원 범위가 맞는 블록만 디코딩)"""
+    with gzip.open(path, "rb") as f:
+        for header in f:
+            block = next(f)
+            low, high = loads(header)["members"]
+            if not low <= member_id <= high:
+                continue
+            columns = loads(block)
+            for i, member in enumerate(columns["member_id"]):
+                if member == member_id:
+                    yield {name: values[i] for name, values in columns.items()}
+
+
+def _delete_month(month, batch_size):
+    """DB에 남은 month의 주문/상세를 지운다."""
+    if connection.vendor == "postgresql" and is_partitioned("orders"):
+        with transaction.atomic(), connection.cursor() as cursor:
+            for table, _ in reversed(TABLES):
+                name = partition_name(table, month)
+                cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+                if cursor.fetchone()[0]:
+                    cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+                    cursor.execute(f"DROP TABLE {name}")
+        return
+    orders = Order.objects.filter(order_day__gte=month, order_day__lte=month_end(month))
+    while True:
+        ids = list(orders.values_list("order_id", flat=True)[:batch_size])
+        if not ids:
+            return
+        with transaction.atomic():
+            OrderDetail.objects.filter(order_id__in=ids).delete()
+            Order.objects.filter(order_id__in=ids).delete()
+
+
+def archive_month(month, batch_size=10000):
+    """
+    month를 보관 파일로 옮기고 DB에서 지운 뒤 (주문 수, 행 수)를 반환한다.
+
+    이미 목록에 있는 달(지우다 중단된 달)이면 남은 행만 지운다.
+    """
+    record = OrderArchive.objects.filter(month=month).first()
+    if record is None:
+        orders = Order.objects.filter(order_day__gte=month, order_day__lte=month_end(month))
+        if orders.filter(status__in=OPEN_STATUSES).exists():
+            raise ArchiveError(f"{month:%Y-%m}: 진행 중인 주문이 있습니다.")
+        name = archive_name(month)
+        path = archive_path(name)
+        n_orders, n_lines, digest = write_month(month, path, batch_size)
+        if n_orders != orders.count() or count_rows(path) != n_lines:
+            os.remove(path)
+            raise ArchiveError(f"{month:%Y-%m}: 보관 파일과 DB의 주문 수가 다릅니다 (상세가 없는 주문).")
+        record = OrderArchive.objects.create(month=month, path=name, orders=n_orders, lines=n_lines, sha256=digest)
+        invalidate()
+    _delete_month(month, batch_size)
+    return record.orders, record.lines
+
+
+def pending_months(cutoff):
+    """cutoff 전에 끝나는 달 중 보관할(또는 지우다 만) 달, 오래된 순"""
+    last = OrderArchive.objects.order_by("-month").first()
+    if last is not None:
+        month = last.month
+    else:
+        first_day = Order.objects.aggregate(m=Min("order_day"))["m"]
+        if first_day is None:
+            return []
+        month = month_start(first_day)
+    months = []
+    while month_end(month) < cutoff:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def current_boundary():
+    """order_archive에서 바로 읽은 boundary (보관된 달이 없으면 None). 재계산처럼 캐시된 목록을 쓰면 안 될 때 쓴다."""
+    last = OrderArchive.objects.aggregate(last=Max("month"))["last"]
+    return add_months(last, 1) if last else None
+
+
+class ArchiveManifest:
+    def __init__(self, archives):
+        self.archives = [(a.month, a.path) for a in archives]
+        self.boundary = add_months(self.archives[-1][0], 1) if self.archives else None
+        self.loaded_at = time.monotonic()
+
+    def names(self, date_from=None, date_to=None):
+        """[date_from, date_to]와 겹치는 보관 파일 이름, 오래된 순"""
+        return [
+            name for month, name in self.archives
+            if (date_from is None or month_end(month) >= date_from) and (date_to is None or month <= date_to)
+        ]
+
+
+_lock = threading.Lock()
+_manifest = None
+_flight = SingleFlight()
+_KEY = "order-archive"
+
+
+def invalidate():
+    global _manifest
+    with _lock:
+        _manifest = None
+    _flight.forget(_KEY)
+
+
+def _refresh():
+    global _manifest
+    manifest = ArchiveManifest(OrderArchive.objects.order_by("month"))
+    with _lock:
+        _manifest = manifest
+    return manifest
+
+
+def get_manifest():
+    """주기가 지난 목록은 반환하면서 백그라운드에서 한 번만 다시 읽는다."""
+    manifest = _manifest
+    if manifest is None:
+        return _flight.do(_KEY, _refresh)
+    if time.monotonic() - manifest.loaded_at >= settings.ORDER_ARCHIVE_MANIFEST_REFRESH_SECONDS:
+        _flight.refresh(_KEY, _refresh)
+    return manifest
+
+
+def member_rows(member_id, date_from=None, date_to=None, manifest=None):
+    """회원의 보관된 상세 행(MY_ORDER_FIELDS 순 튜플)을 order_id 순으로"""
+    manifest = manifest or get_manifest()
+    low = date_from.isoformat() if date_from else ""
+    high = date_to.isoformat() if date_to else "9999"
+    for name in manifest.names(date_from, date_to):
+        for row in read_member(archive_path(name), member_id):
+            if low <= row["date"] <= high:
+                yield tuple(row[key] for key in MY_ORDER_FIELDS)
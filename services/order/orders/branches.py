@@ -0,0 +1,93 @@
+"""
+프로세스 내 지점 레지스트리.
+
+branch 테이블 전체를 메모리에 올려 두고 BRANCH_REGISTRY_REFRESH_SECONDS마다 다시 읽는다.
+지점 목록 응답 본문과 ETag는 적재 시 한 번만 만들고, 주문 생성 시 branchId 검증은 dict 조회(O(1))로 한다.
+이 프로세스에서의 Branch 저장/삭제는 시그널로 즉시 무효화한다.
+
+갱신 주기가 지난 뒤 BRANCH_REGISTRY_STALE_SECONDS 동안은 기존 스냅샷을 반환하며 백그라운드에서 한 번만
+다시 읽고, 그보다 오래됐거나 비어 있으면 동시 요청 중 하나만 DB를 읽는다(single-flight).
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+
+from .fastjson import dumps
+from .models import Branch
+from .singleflight import SingleFlight
+
+
+class BranchSnapshot:
+    def __init__(self, branches):
+        self.items = [{"bran_id": b.bran_id, "bran_nm": b.bran_nm} for b in branches]
+        self.by_id = {item["bran_id"]: item for item in self.items}
+        self.body = dumps(self.items)
+        self.etag = '"%s"' % hashlib.sha1(self.body).hexdigest()
+        self.loaded_at = time.monotonic()
+
+
+_lock = threading.Lock()
+_snapshot = None
+_flight = SingleFlight()
+_KEY = "branches"
+
+
+def load_snapshot():
+    return BranchSnapshot(Branch.objects.order_by("bran_id"))
+
+
+def invalidate():
+    """이 프로세스의 지점 스냅샷을 버린다."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+    _flight.forget(_KEY)
+
+
+def on_branch_change(sender, **kwargs):
+    """Branch post_save, post_delete 시그널 수신기"""
+    invalidate()
+
+
+def _refresh():
+    global _snapshot
+    snapshot = load_snapshot()
+    with _lock:
+        _snapshot = snapshot
+    return snapshot
+
+
+def _cached(max_age):
+    """DB 없이 반환할 수 있는 스냅샷. 기본 주기의 stale 구간이면 백그라운드 갱신을 건다."""
+    snapshot = _snapshot
+    if snapshot is None:
+        return None
+    age = time.monotonic() - snapshot.loaded_at
+    if max_age is None:
+        max_age = settings.BRANCH_REGISTRY_REFRESH_SECONDS
+        if max_age <= age < max_age + settings.BRANCH_REGISTRY_STALE_SECONDS:
+            _flight.refresh(_KEY, _refresh)
+            return snapshot
+    return snapshot if age < max_age else None
+
+
+def get_snapshot(max_age=None):
+    return _cached(max_age) or _flight.do(_KEY, _refresh)
+
+
+async def aget_snapshot(max_age=None):
+    return _cached(max_age) or await _flight.ado(_KEY, _refresh)
+
+
+def is_valid_branch(bran_id):
+    """
+    branchId 존재 여부.
+
+    스냅샷에 없으면 다른 프로세스에서 방금 추가된 지점일 수 있으므로, 스냅샷이
+    BRANCH_REGISTRY_MISS_RELOAD_SECONDS보다 오래됐을 때 한 번 다시 읽어 확인한다.
+    """
+    if bran_id in get_snapshot().by_id:
+        return True
+    return bran_id in get_snapshot(max_age=settings.BRANCH_REGISTRY_MISS_RELOAD_SECONDS).by_id
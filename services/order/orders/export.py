@@ -0,0 +1,152 @@
+"""
+주문 대량 내보내기 (CSV / NDJSON, 선택적 gzip)와 내 주문 내역 스트리밍.
+
+server-side cursor(.iterator)로 행을 읽어 일정 크기 청크로 인코딩하므로 기간과 무관하게 메모리 사용량이 일정하다.
+ASGI에서는 동기 이터레이터를 준 StreamingHttpResponse가 본문 전체를 모은 뒤 보내므로, 뷰는 async_chunks로
+감싸 청크마다 바로 보낸다.
+"""
+import csv
+import io
+import zlib
+
+from asgiref.sync import sync_to_async
+
+from .fastjson import dumps
+from .models import OrderDetail
+from .partitions import filter_days
+
+ORDER_FIELDS = ["order_id", "member_id", "bran_id", "date", "time", "total"]
+DETAIL_FIELDS = ["order_detail_id", "pizza_id", "quantity", "unit_price", "line_total"]
+CSV_HEADER = ORDER_FIELDS + DETAIL_FIELDS
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# 내 주문 내역 응답 키 -> 조회 필드 (MyOrderView 일반 응답과 같은 모양)
+MY_ORDER_FIELDS = {
+    "order_id": "order__order_id",
+    "bran_id": "order__bran_id",
+    "pizza_id": "pizza_id",
+    "quantity": "quantity",
+    "unit_price": "unit_price",
+    "line_total": "line_total",
+    "date": "order__date",
+    "time": "order__time",
+    "status": "order__status",
+}
+
+_FLUSH_BYTES = 64 * 1024
+
+
+def export_rows(date_from=None, date_to=None, bran_id=None, chunk_size=2000):
+    """(주문 필드..., 상세 필드...) 튜플을 order_id 순으로 스트리밍"""
+    qs = filter_days(OrderDetail.objects.all(), date_from, date_to)
+    if bran_id:
+        qs = qs.filter(order__bran_id=bran_id)
+    qs = qs.order_by("order_id", "order_detail_id").values_list(
+        *[f"order__{f}" for f in ORDER_FIELDS], *DETAIL_FIELDS
+    )
+    return qs.iterator(chunk_size=chunk_size)
+
+
+def my_order_rows(member_id, date_from=None, date_to=None, chunk_size=2000):
+    """회원의 주문 상세 행(MY_ORDER_FIELDS 순 튜플)을 order_id 순으로 스트리밍"""
+    qs = (
+        filter_days(OrderDetail.objects.filter(order__member_id=member_id), date_from, date_to)
+        .order_by("order_id", "order_detail_id")
+        .values_list(*MY_ORDER_FIELDS.values())
+    )
+    return qs.iterator(chunk_size=chunk_size)
+
+
+def json_array_chunks(rows, keys):
+    """
+    행을 객체로 만들어 JSON 배열 하나로 인코딩한다.
+
+    첫 행은 바로 내보내 첫 바이트까지의 시간을 줄이고, 이후는 _FLUSH_BYTES 단위로 묶는다.
+    """
+    chunk = bytearray(b"[")
+    first = True
+    for row in rows:
+        if not first:
+            chunk += b","
+        chunk += dumps(dict(zip(keys, row)))
+        if first or len(chunk) >= _FLUSH_BYTES:
+            first = False
+            yield bytes(chunk)
+            chunk.clear()
+    chunk += b"]"
+    yield bytes(chunk)
+
+
+def csv_chunks(rows):
+    """주문 상세 1건당 1행"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= _FLUSH_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def ndjson_chunks(rows):
+    """주문 1건당 1줄, 상세는 items 배열로 묶는다 (rows는 order_id 순 정렬 전제)"""
+    n_order = len(ORDER_FIELDS)
+    chunk = bytearray()
+    current = None
+    for row in rows:
+        if current is None or current["order_id"] != row[0]:
+            if current is not None:
+                chunk += dumps(current) + b"\n"
+                if len(chunk) >= _FLUSH_BYTES:
+                    yield bytes(chunk)
+                    chunk.clear()
+            current = dict(zip(ORDER_FIELDS, row[:n_order]))
+            current["items"] = []
+        current["items"].append(dict(zip(DETAIL_FIELDS, row[n_order:])))
+    if current is not None:
+        chunk += dumps(current) + b"\n"
+    yield bytes(chunk)
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_chunks(fmt, rows, gzip=False):
+    chunks = csv_chunks(rows) if fmt == "csv" else ndjson_chunks(rows)
+    return gzip_chunks(chunks) if gzip else chunks
+
+
+_END = object()
+
+
+async def async_chunks(chunks):
+    """
+    동기 청크 이터레이터를 비동기 이터레이터로 감싼다.
+
+    다음 청크는 thread_sensitive 스레드에서 만들므로 server-side cursor가 같은 DB 연결에서 이어진다.
+    클라이언트가 끊어 중간에 닫히면 원래 이터레이터도 같은 스레드에서 닫아 커서를 정리한다.
+    """
+    iterator = iter(chunks)
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            chunk = await next_chunk(iterator, _END)
+            if chunk is _END:
+                return
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=True)()
@@ -0,0 +1,133 @@
+"""
+Idempotency-Key 처리.
+
+키 행을 먼저 INSERT하고 바로 커밋해 IDEMPOTENCY_LEASE_SECONDS 동안 키를 선점한 뒤 handler를 실행한다.
+메뉴 조회 같은 외부 호출 동안 트랜잭션을 열어 두지 않는다. handler는 주문을 쓰는 트랜잭션 안에서 응답을
+저장하므로, 주문이 커밋됐으면 응답도 커밋되어 있다 (커밋 직후 프로세스가 죽어도 재시도는 그 응답을 받는다).
+
+같은 키로 동시에 들어온 요청은 응답이 저장될 때까지 IDEMPOTENCY_WAIT_SECONDS까지 기다렸다가 그 응답을
+재생한다. 응답 없이 선점 시간이 지난 키(처리 중 프로세스가 죽음)는 기다리던 요청이 이어받아 다시 실행한다.
+응답 저장은 선점 시각(locked_until)이 그대로일 때만 성공하므로, 늦게 끝난 이전 실행의 주문은 롤백된다.
+"""
+import datetime
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+# 처리 중인 같은 키의 응답을 기다릴 때 다시 확인하는 간격
+POLL_SECONDS = 0.05
+
+
+class LeaseLost(Exception):
+    """선점 시간이 지나 다른 요청이 키를 이어받았다 (이 실행의 쓰기는 롤백해야 한다)."""
+
+
+def request_fingerprint(payload) -> str:
+    body = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def _lease():
+    return timezone.now() + datetime.timedelta(seconds=settings.IDEMPOTENCY_LEASE_SECONDS)
+
+
+def _claim(member_id, key, request_hash):
+    """(선점 여부, 키 행). 다른 요청이 방금 지운 키면 (False, None)"""
+    now = timezone.now()
+    with transaction.atomic():
+        IdempotencyKey.objects.filter(member_id=member_id, key=key, expires_at__lte=now).delete()
+        try:
+            with transaction.atomic():
+                return True, IdempotencyKey.objects.create(
+                    member_id=member_id,
+                    key=key,
+                    request_hash=request_hash,
+                    locked_until=_lease(),
+                    expires_at=now + datetime.timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS),
+                )
+        except IntegrityError:
+            pass
+    return False, IdempotencyKey.objects.filter(member_id=member_id, key=key).first()
+
+
+def _take_over(record):
+    """응답 없이 선점 시간이 지난 키를 이어받는다. 성공하면 True"""
+    lease = _lease()
+    taken = IdempotencyKey.objects.filter(
+        id=record.id, status_code__isnull=True, locked_until=record.locked_until
+    ).update(locked_until=lease)
+    if taken:
+        record.locked_until = lease
+    return bool(taken)
+
+
+def _owned(record):
+    """이 실행이 아직 선점하고 있을 때만 맞는 조건"""
+    return IdempotencyKey.objects.filter(id=record.id, status_code__isnull=True, locked_until=record.locked_until)
+
+
+def run_idempotent(member_id, key, payload, handler):
+    """
+    handler(save)를 키당 한 번만 실행하고 (status, body, replayed)를 반환한다.
+
+    handler는 쓰기 트랜잭션 안에서 save(status, body)를 호출해 응답을 같이 커밋한다. 쓰기 없이 끝난 응답(4xx)은
+    handler가 반환한 뒤 저장한다. 5xx 응답이나 예외면 키를 지우므로 같은 키로 재시도하면 다시 실행된다.
+    """
+    request_hash = request_fingerprint(payload)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        owned, record = _claim(member_id, key, request_hash)
+        if owned:
+            break
+        if record is not None:
+            if record.request_hash != request_hash:
+                return 422, {"detail": "Idempotency-Key가 다른 요청에 이미 사용되었습니다."}, False
+            if record.status_code is not None:
+                return record.status_code, record.response_body, True
+            if record.locked_until <= timezone.now() and _take_over(record):
+                break
+        if time.monotonic() >= deadline:
+            return 409, {"detail": "같은 Idempotency-Key의 요청이 아직 처리 중입니다."}, False
+        time.sleep(POLL_SECONDS)
+
+    saved = []
+
+    def save(status, body):
+        if not _owned(record).update(status_code=status, response_body=body):
+            raise LeaseLost()
+        saved.append(status)
+
+    try:
+        status, body = handler(save)
+    except LeaseLost:
+        # 이어받은 요청의 결과를 기다려 재생한다 (이 실행의 주문은 롤백됐다).
+        return run_idempotent(member_id, key, payload, handler)
+    except BaseException:
+        _owned(record).delete()
+        raise
+    if status >= 500:
+        _owned(record).delete()
+    elif not saved:
+        _owned(record).update(status_code=status, response_body=body)
+    return status, body, False
+
+
+def purge_expired(batch_size=1000):
+    """만료된 키를 batch_size 단위로 삭제하고 삭제 건수를 반환"""
+    deleted = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(expires_at__lte=timezone.now())
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,12 @@
+from django.views import View
+
+
+class LightView(View):
+    """
+    DRF를 거치지 않는 조회 전용 뷰 베이스 클래스.
+
+    인증/권한/콘텐츠 협상/Request 래핑이 필요 없는 핫 엔드포인트(헬스체크, 목록 조회)에 사용한다.
+    HEAD는 Django View가 GET으로 자동 처리한다.
+    """
+
+    http_method_names = ["get", "head", "options"]
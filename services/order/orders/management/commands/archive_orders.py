@@ -0,0 +1,43 @@
+import datetime
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.archive import ArchiveError, archive_month, pending_months
+
+
+class Command(BaseCommand):
+    help = (
+        "cutoff 이전에 끝나는 달의 주문을 오래된 달부터 압축 컬럼 파일(ORDER_ARCHIVE_DIR)로 옮기고 DB에서 지웁니다. "
+        "주문 내역은 요청한 기간이 보관 구간을 포함할 때 파일에서 읽습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--before", help="YYYY-MM-DD (기본: 오늘 - ORDER_ARCHIVE_AFTER_DAYS)")
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument("--dry-run", action="store_true", help="보관할 달만 출력")
+
+    def handle(self, *args, **options):
+        try:
+            cutoff = (
+                datetime.date.fromisoformat(options["before"]) if options["before"]
+                else datetime.date.today() - datetime.timedelta(days=settings.ORDER_ARCHIVE_AFTER_DAYS)
+            )
+        except ValueError:
+            raise CommandError("--before는 YYYY-MM-DD 형식이어야 합니다.")
+
+        months = pending_months(cutoff)
+        if options["dry_run"]:
+            self.stdout.write(f"보관 대상 {len(months)}개월: {', '.join(f'{m:%Y-%m}' for m in months)}".rstrip(": "))
+            return
+
+        for month in months:
+            started = time.perf_counter()
+            try:
+                orders, lines = archive_month(month, batch_size=options["batch_size"])
+            except ArchiveError as exc:
+                # 보관 구간은 이어져 있어야 하므로 이후 달도 멈춘다.
+                raise CommandError(str(exc))
+            self.stdout.write(f"  {month:%Y-%m}: 주문 {orders}건, 상세 {lines}행 ({time.perf_counter() - started:.1f}s)")
+        self.stdout.write(self.style.SUCCESS(f"{len(months)}개월 보관 완료 (cutoff {cutoff})"))
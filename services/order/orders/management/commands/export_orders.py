@@ -0,0 +1,33 @@
+import datetime
+import sys
+
+from django.core.management.base import BaseCommand
+
+from orders.export import FORMATS, export_chunks, export_rows
+
+
+class Command(BaseCommand):
+    help = "주문과 주문 상세를 CSV/NDJSON으로 스트리밍 내보냅니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument("--from", dest="date_from", type=datetime.date.fromisoformat, help="YYYY-MM-DD")
+        parser.add_argument("--to", dest="date_to", type=datetime.date.fromisoformat, help="YYYY-MM-DD")
+        parser.add_argument("--bran-id")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="server-side cursor fetch 크기")
+        parser.add_argument("--output", "-o", help="출력 파일 (기본: stdout)")
+
+    def handle(self, *args, **options):
+        rows = export_rows(
+            options["date_from"], options["date_to"], options["bran_id"], chunk_size=options["chunk_size"]
+        )
+        chunks = export_chunks(options["format"], rows, gzip=options["gzip"])
+        if options["output"]:
+            with open(options["output"], "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
@@ -0,0 +1,159 @@
+import csv
+import datetime
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+
+from orders import partitions, synthetic
+
+
+def _csv_buffer(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    return buffer
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "용량 테스트용 회원/지점/피자/주문 합성 데이터를 COPY로 적재하고 판매 롤업과 인기 점수를 다시 계산합니다. "
+        "같은 --seed와 옵션이면 같은 데이터가 생성됩니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--members", type=int, default=100_000)
+        parser.add_argument("--branches", type=int, default=50)
+        parser.add_argument("--pizza-types", type=int, default=30, help="타입당 S/M/L 3종 피자 생성")
+        parser.add_argument("--orders", type=int, default=1_000_000)
+        parser.add_argument("--start-date", type=datetime.date.fromisoformat, default=datetime.date(2024, 1, 1))
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--member-zipf", type=float, default=1.1, help="회원 주문 빈도 Zipf 지수")
+        parser.add_argument("--pizza-zipf", type=float, default=0.9, help="피자 인기 Zipf 지수")
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--block-size", type=int, default=100_000, help="워커 작업 단위(주문 수)")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("COPY 적재는 PostgreSQL에서만 지원합니다.")
+
+        started = time.perf_counter()
+        with transaction.atomic(), connection.cursor() as cursor:
+            self._load_reference_data(cursor, options)
+            cursor.execute("SELECT COALESCE(MAX(order_id), 0) + 1 FROM orders")
+            first_order_id = cursor.fetchone()[0]
+        self.stdout.write(f"참조 데이터 적재 완료 ({time.perf_counter() - started:.1f}s), 첫 order_id={first_order_id}")
+
+        config = {
+            "seed": options["seed"],
+            "members": options["members"],
+            "branches": options["branches"],
+            "pizza_types": options["pizza_types"],
+            "orders": options["orders"],
+            "start_date": options["start_date"].isoformat(),
+            "days": options["days"],
+            "member_zipf": options["member_zipf"],
+            "pizza_zipf": options["pizza_zipf"],
+            "block_size": options["block_size"],
+            "first_order_id": first_order_id,
+        }
+        db = settings.DATABASES["default"]
+        db_params = {
+            "dbname": db["NAME"],
+            "user": db["USER"],
+            "password": db["PASSWORD"],
+            "host": db["HOST"],
+            "port": db["PORT"],
+        }
+        blocks = range((options["orders"] + options["block_size"] - 1) // options["block_size"])
+
+        # 파티션 테이블이면 적재할 기간(과거 날짜 포함)의 월 파티션을 먼저 만든다.
+        date_to = options["start_date"] + datetime.timedelta(days=options["days"] - 1)
+        partitions.ensure_range(options["start_date"], date_to)
+
+        # 워커가 부모의 DB 소켓을 물려받지 않도록 먼저 닫는다.
+        connections.close_all()
+        total_orders = total_details = 0
+        with ProcessPoolExecutor(max_workers=options["workers"]) as pool:
+            futures = [pool.submit(synthetic.copy_block, db_params, config, block) for block in blocks]
+            for future in as_completed(futures):
+                n_orders, n_details = future.result()
+                total_orders += n_orders
+                total_details += n_details
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"주문 {total_orders:,}/{options['orders']:,} 상세 {total_details:,} "
+                    f"({total_orders / elapsed:,.0f} orders/s)"
+                )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence('orders', 'order_id'), "
+                "(SELECT COALESCE(MAX(order_id), 1) FROM orders))"
+            )
+
+        # COPY는 증분 갱신을 거치지 않으므로 읽기 모델(sales_daily, branch_popularity)을 다시 계산한다.
+        call_command("rebuild_sales_rollup", date_from=options["start_date"], date_to=date_to, stdout=self.stdout)
+        call_command("rebuild_popularity", stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f"완료: 주문 {total_orders:,}건, 상세 {total_details:,}건, {time.perf_counter() - started:.1f}s"
+        ))
+
+    def _copy_upsert(self, cursor, table, columns, key, rows, chunk_size=100_000):
+        """임시 테이블로 COPY 후 INSERT ... ON CONFLICT DO NOTHING (재실행 가능)"""
+        cursor.execute(f"DROP TABLE IF EXISTS stage_{table}")
+        cursor.execute(f"CREATE TEMP TABLE stage_{table} (LIKE {table}) ON COMMIT DROP")
+        for chunk in _chunked(rows, chunk_size):
+            cursor.copy_expert(
+                f"COPY stage_{table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", _csv_buffer(chunk)
+            )
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) SELECT {', '.join(columns)} FROM stage_{table} "
+            f"ON CONFLICT ({key}) DO NOTHING"
+        )
+
+    def _load_reference_data(self, cursor, options):
+        seed = options["seed"]
+        # 모든 합성 회원은 같은 비밀번호 해시를 공유한다 (해싱 비용 제외).
+        password_hash = make_password(f"synthetic-{seed}")
+        self._copy_upsert(
+            cursor, "member", ["member_id", "member_pwd", "member_nm"], "member_id",
+            ((synthetic.member_id(i), password_hash, f"합성회원{i}") for i in range(options["members"])),
+        )
+        self._copy_upsert(
+            cursor, "branch", ["bran_id", "bran_nm"], "bran_id",
+            ((synthetic.branch_id(i), f"합성지점{i}") for i in range(options["branches"])),
+        )
+        self._copy_upsert(
+            cursor, "pizza_types", ["pizza_type_id", "pizza_nm", "pizza_categ", "pizza_img_url"], "pizza_type_id",
+            (
+                (synthetic.pizza_type_id(i), f"합성피자{i}", "합성", f"http://example.com/synthetic/{i}.jpg")
+                for i in range(options["pizza_types"])
+            ),
+        )
+        self._copy_upsert(
+            cursor, "pizza", ["pizza_id", "pizza_type_id", "size", "price"], "pizza_id",
+            synthetic.make_pizzas(seed, options["pizza_types"]),
+        )
+        # menu-service 캐시가 새 피자를 읽도록 메뉴 버전을 올린다.
+        cursor.execute(
+            "INSERT INTO menu_version (id, version, updated_at) VALUES (1, 1, now()) "
+            "ON CONFLICT (id) DO UPDATE SET version = menu_version.version + 1, updated_at = now()"
+        )
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from orders import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "orders / order_detail 월별 파티션 관리 (PostgreSQL). "
+        "ensure: 앞으로 쓸 월 파티션 생성 (서비스가 주기적으로 자동 실행), convert: 기존 테이블을 파티션 테이블로 옮김, status: 파티션 목록"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["ensure", "convert", "status"])
+        parser.add_argument("--months-ahead", type=int, default=None)
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("파티셔닝은 PostgreSQL에서만 지원합니다.")
+        action = options["action"]
+
+        if action == "convert":
+            if partitions.is_partitioned("orders"):
+                raise CommandError("orders는 이미 파티션 테이블입니다.")
+
+            def progress(done, last):
+                self.stdout.write(f"  order_id {done}/{last}")
+
+            try:
+                moved = partitions.convert(
+                    batch_size=options["batch_size"], months_ahead=options["months_ahead"], progress=progress
+                )
+            except partitions.PartitionError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(self.style.SUCCESS(f"주문 {moved}건을 월별 파티션 테이블로 옮겼습니다."))
+
+        elif action == "ensure":
+            if not partitions.is_partitioned("orders"):
+                raise CommandError("orders가 파티션 테이블이 아닙니다. 먼저 convert를 실행하세요.")
+            created = partitions.ensure_partitions(months_ahead=options["months_ahead"])
+            self.stdout.write(self.style.SUCCESS(f"파티션 {len(created)}개 생성 {', '.join(created)}".rstrip()))
+
+        else:
+            for table, _ in partitions.TABLES:
+                rows = partitions.partitions(table)
+                self.stdout.write(f"{table}: 파티션 {len(rows)}개")
+                for name, bound, estimate in rows:
+                    self.stdout.write(f"  {name} {bound} (~{max(estimate, 0)}행)")
@@ -0,0 +1,16 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from orders.popularity import rebuild
+
+
+class Command(BaseCommand):
+    help = "order_detail 이력으로부터 지점별 인기 피자 점수(branch_popularity)를 다시 계산합니다."
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        created = rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"branch_popularity {created}행 재생성 ({time.perf_counter() - started:.1f}s)"
+        ))
@@ -0,0 +1,31 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.menu_client import fetch_price_map
+from orders.rollup import rebuild
+
+
+class Command(BaseCommand):
+    help = "order_detail로부터 sales_daily 롤업을 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="date_from", type=datetime.date.fromisoformat, help="YYYY-MM-DD")
+        parser.add_argument("--to", dest="date_to", type=datetime.date.fromisoformat, help="YYYY-MM-DD")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        def price_lookup():
+            # 가격 스냅샷이 없는 이전 주문이 있을 때만 호출된다.
+            try:
+                return fetch_price_map()
+            except Exception as exc:
+                raise CommandError(f"메뉴 가격 조회 실패: {exc}")
+
+        created = rebuild(
+            price_lookup,
+            date_from=options["date_from"],
+            date_to=options["date_to"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"sales_daily {created}행 재생성"))
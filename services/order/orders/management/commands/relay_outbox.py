@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from orders.outbox import get_sink, prune_published, relay_batch
+
+
+class Command(BaseCommand):
+    help = "outbox_event의 주문 이벤트를 배치 단위로 싱크에 발행합니다 (at-least-once)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sink", help="싱크 클래스 dotted path (기본: OUTBOX_SINK)")
+        parser.add_argument("--path", help="FileSink 출력 파일 경로")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--interval", type=float, default=1.0, help="새 이벤트가 없을 때 대기 시간(초)")
+        parser.add_argument("--once", action="store_true", help="밀린 이벤트를 모두 발행한 뒤 종료")
+        parser.add_argument("--prune-days", type=int, help="발행 완료 후 N일 지난 이벤트 삭제")
+
+    def handle(self, *args, **options):
+        sink_options = {"path": options["path"]} if options["path"] else {}
+        sink = get_sink(options["sink"], **sink_options)
+        total = 0
+        try:
+            while True:
+                published = relay_batch(sink, batch_size=options["batch_size"])
+                total += published
+                if published:
+                    continue
+                if options["prune_days"] is not None:
+                    prune_published(options["prune_days"])
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"이벤트 {total}건 발행"))
@@ -0,0 +1,46 @@
+"""menu-service 호출 클라이언트"""
+import os
+
+import requests
+
+from .negotiation import MSGPACK, MSGPACK_AVAILABLE, is_msgpack, packb, unpackb
+
+
+def menu_service_url():
+    return os.getenv('MENU_SERVICE_URL', 'http://menu-service.default.svc.cluster.local:8000')
+
+
+def fetch_menu(timeout=10):
+    """전체 피자 목록(/api/menu/)을 조회한다."""
+    response = requests.get(f"{menu_service_url()}/api/menu/", timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_price_map(timeout=10):
+    """pizza_id -> 현재 가격"""
+    return {p["pizza_id"]: p["price"] for p in fetch_menu(timeout=timeout)}
+
+
+def lookup_pizza(name, size, timeout=5):
+    """
+    (피자 이름, 사이즈) -> {"pizza_id", "price"}, 없으면 None.
+
+    msgpack이 있으면 요청/응답을 MessagePack으로 주고받고, menu-service가 415(MessagePack 미지원 버전)로
+    답하면 JSON으로 다시 보낸다. 연결 실패와 200/404 이외의 응답은 requests 예외로 전파된다(주문은 503).
+    """
+    url = f"{menu_service_url()}/api/menu/get_pizza_id/"
+    payload = {"pizza_nm": name, "size": size}
+    if not MSGPACK_AVAILABLE:
+        response = requests.post(url, json=payload, timeout=timeout)
+    else:
+        response = requests.post(
+            url, data=packb(payload), headers={"Content-Type": MSGPACK, "Accept": MSGPACK}, timeout=timeout
+        )
+        if response.status_code == 415:
+            response = requests.post(url, json=payload, timeout=timeout)
+    if response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        raise requests.HTTPError(f"menu-service get_pizza_id: {response.status_code}", response=response)
+    return unpackb(response.content) if is_msgpack(response) else response.json()
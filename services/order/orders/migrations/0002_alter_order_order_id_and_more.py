@@ -0,0 +1,66 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:09
+
+from django.db import migrations, models
+
+
+def renumber_legacy_order_ids(apps, schema_editor):
+    """
+    정수로 바꿀 수 없는 기존 order_id(예: scripts/init-test-db.sql의 'ORDER_TEST_001')를 현재 최대 숫자 id
+    다음 번호부터 다시 매기고 order_detail도 같이 바꾼다. 이전 id -> 새 id 대응은 order_legacy_id에 남긴다.
+    """
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS order_legacy_id ("
+            "legacy_order_id varchar(50) PRIMARY KEY, order_id integer NOT NULL UNIQUE)"
+        )
+        cursor.execute("SELECT order_id FROM orders")
+        ids = [str(row[0]) for row in cursor.fetchall()]
+        legacy = sorted(i for i in ids if not i.isdigit())
+        if not legacy:
+            return
+        next_id = max((int(i) for i in ids if i.isdigit()), default=0) + 1
+        for new_id, old_id in enumerate(legacy, start=next_id):
+            cursor.execute(
+                "INSERT INTO order_legacy_id (legacy_order_id, order_id) VALUES (%s, %s)", [old_id, new_id]
+            )
+            cursor.execute("UPDATE order_detail SET order_id = %s WHERE order_id = %s", [str(new_id), old_id])
+            cursor.execute("UPDATE orders SET order_id = %s WHERE order_id = %s", [str(new_id), old_id])
+        if connection.vendor == "postgresql":
+            # 지연된 FK 검사를 지금 끝내야 같은 트랜잭션에서 컬럼 타입을 바꿀 수 있다.
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+def sync_id_sequences(apps, schema_editor):
+    """새 identity 시퀀스를 기존 최대 id 다음부터 시작하게 한다."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, column in (("orders", "order_id"), ("order_detail", "order_detail_id")):
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+                f"COALESCE(MAX({column}), 1), MAX({column}) IS NOT NULL) FROM {table}"
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+    ]
+
+    operations = [
+        # 되돌릴 때 이전 문자열 id는 복원하지 않는다 (order_legacy_id에 남아 있다).
+        migrations.RunPython(renumber_legacy_order_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='order',
+            name='order_id',
+            field=models.AutoField(primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='orderdetail',
+            name='order_detail_id',
+            field=models.AutoField(primary_key=True, serialize=False),
+        ),
+        migrations.RunPython(sync_id_sequences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesDaily',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('pizza_id', models.CharField(max_length=50)),
+                ('quantity', models.IntegerField(default=0)),
+                ('revenue', models.FloatField(default=0)),
+                ('bran', models.ForeignKey(db_column='bran_id', on_delete=django.db.models.deletion.DO_NOTHING, to='orders.branch')),
+            ],
+            options={
+                'db_table': 'sales_daily',
+                'constraints': [models.UniqueConstraint(fields=('bran', 'day', 'pizza_id'), name='uniq_sales_daily_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_salesdaily'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='total',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddField(
+            model_name='orderdetail',
+            name='line_total',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddField(
+            model_name='orderdetail',
+            name='unit_price',
+            field=models.FloatField(null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_price_snapshot'),
+    ]
+
+    operations = [
+        # 기존 주문은 모두 완료 상태로 채우고(컬럼 추가 시 기본값), 새 주문의 기본값은 placed로 바꾼다.
+        migrations.AddField(
+            model_name='order',
+            name='status',
+            field=models.CharField(default='completed', max_length=20),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='status',
+            field=models.CharField(default='placed', max_length=20),
+        ),
+        # 기존 주문의 상태 변경 시각은 NULL (피드 대상 아님)
+        migrations.AddField(
+            model_name='order',
+            name='status_updated_at',
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='status_updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['member_id', 'status'], name='orders_member_status_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_order_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BranchPopularity',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pizza_id', models.CharField(max_length=50)),
+                ('score', models.FloatField(default=0)),
+                ('bran', models.ForeignKey(db_column='bran_id', on_delete=django.db.models.deletion.DO_NOTHING, to='orders.branch')),
+            ],
+            options={
+                'db_table': 'branch_popularity',
+                'constraints': [models.UniqueConstraint(fields=('bran', 'pizza_id'), name='uniq_branch_popularity_key')],
+            },
+        ),
+    ]
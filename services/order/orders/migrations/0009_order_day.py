@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:50
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+from django.db.models.functions import Cast
+
+BATCH_SIZE = 10000
+
+
+def backfill_order_day(apps, schema_editor):
+    """기존 행의 order_day를 order_id 구간별로 채운다 (구간마다 커밋되어 긴 잠금이 없다)."""
+    Order = apps.get_model("orders", "Order")
+    OrderDetail = apps.get_model("orders", "OrderDetail")
+    db = schema_editor.connection.alias
+    last = Order.objects.using(db).aggregate(m=Max("order_id"))["m"] or 0
+    for lo in range(0, last, BATCH_SIZE):
+        hi = lo + BATCH_SIZE
+        Order.objects.using(db).filter(order_id__gt=lo, order_id__lte=hi, order_day__isnull=True).update(
+            order_day=Cast("date", models.DateField())
+        )
+        OrderDetail.objects.using(db).filter(order_id__gt=lo, order_id__lte=hi, order_day__isnull=True).update(
+            order_day=Subquery(Order.objects.using(db).filter(order_id=OuterRef("order_id")).values("order_day")[:1])
+        )
+
+
+class Migration(migrations.Migration):
+    # 대용량 테이블 backfill을 한 트랜잭션으로 묶지 않는다.
+    atomic = False
+
+    dependencies = [
+        ('orders', '0008_branch_popularity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='order_day',
+            field=models.DateField(null=True),
+        ),
+        migrations.AddField(
+            model_name='orderdetail',
+            name='order_day',
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(backfill_order_day, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0009_order_day'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderArchive',
+            fields=[
+                ('month', models.DateField(primary_key=True, serialize=False)),
+                ('path', models.CharField(max_length=255)),
+                ('orders', models.IntegerField()),
+                ('lines', models.IntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'order_archive',
+            },
+        ),
+    ]
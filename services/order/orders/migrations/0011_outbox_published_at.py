@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:07
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_checkpointed_published(apps, schema_editor):
+    """모든 체크포인트가 지나간 이벤트는 발행된 것으로 표시한다 (나머지는 다시 발행될 수 있다)."""
+    OutboxCheckpoint = apps.get_model("orders", "OutboxCheckpoint")
+    OutboxEvent = apps.get_model("orders", "OutboxEvent")
+    db = schema_editor.connection.alias
+    low_water = (
+        OutboxCheckpoint.objects.using(db).order_by("last_event_id").values_list("last_event_id", flat=True).first()
+    )
+    if low_water:
+        OutboxEvent.objects.using(db).filter(event_id__lte=low_water).update(published_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0010_order_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxevent',
+            name='published_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_checkpointed_published, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='OutboxCheckpoint',
+        ),
+        migrations.AddIndex(
+            model_name='outboxevent',
+            index=models.Index(condition=models.Q(('published_at__isnull', True)), fields=['event_id'], name='outbox_unpublished_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def to_log(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DELETE FROM branch_popularity WHERE score <= 0")
+        cursor.execute("UPDATE branch_popularity SET score = ln(score)")
+
+
+def from_log(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("UPDATE branch_popularity SET score = exp(score)")
+
+
+class Migration(migrations.Migration):
+    """branch_popularity.score를 가중 합에서 가중 합의 자연로그로 바꾼다 (orders/popularity.py)."""
+
+    dependencies = [
+        ('orders', '0013_idempotency_lease'),
+    ]
+
+    operations = [
+        migrations.RunPython(to_log, from_log),
+    ]
@@ -1,4 +1,7 @@
+import datetime
+
 from django.db import models
+from django.utils import timezone
 
 
 class Branch(models.Model):
@@ -19,13 +22,27 @@ class Order(models.Model):
     bran = models.ForeignKey(Branch, on_delete=models.DO_NOTHING, db_column="bran_id")
     date = models.CharField(max_length=50)
     time = models.CharField(max_length=50)
+    total = models.FloatField(null=True)
+    # 진행 상태 (orders/status.py). 상태 변경 시각은 SSE 상태 피드가 변경분 조회에 쓴다.
+    status = models.CharField(max_length=20, default="placed")
+    status_updated_at = models.DateTimeField(null=True, db_index=True, default=timezone.now)
+    # 월별 range 파티션 키 (orders/partitions.py). date 문자열과 같은 날이며 저장 시 채운다.
+    order_day = models.DateField(null=True)
 
     def __str__(self):
         return self.order_id
 
+    def save(self, *args, **kwargs):
+        if self.order_day is None and self.date:
+            self.order_day = datetime.date.fromisoformat(self.date)
+        super().save(*args, **kwargs)
+
     class Meta:
         db_table = "orders"
         app_label = 'orders'
+        indexes = [
+            models.Index(fields=["member_id", "status"], name="orders_member_status_idx"),
+        ]
 
 
 class OrderDetail(models.Model):
@@ -33,10 +50,147 @@ class OrderDetail(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, db_column="order_id")
     pizza_id = models.CharField(max_length=50)
     quantity = models.IntegerField()
+    # 주문 시점 가격 스냅샷 (도입 이전 주문은 NULL)
+    unit_price = models.FloatField(null=True)
+    line_total = models.FloatField(null=True)
+    # 주문과 같은 월 파티션에 두기 위한 파티션 키 (orders.order_day 복사본)
+    order_day = models.DateField(null=True)
 
     def __str__(self):
         return f"OrderDetail {self.order_detail_id}"
 
+    def save(self, *args, **kwargs):
+        if self.order_day is None and self.order_id is not None:
+            self.order_day = self.order.order_day
+        super().save(*args, **kwargs)
+
     class Meta:
         db_table = "order_detail"
         app_label = 'orders'  # 명시적 app_label 설정
+
+
+class IdempotencyKey(models.Model):
+    """주문 생성 요청의 Idempotency-Key와 저장된 응답"""
+
+    member_id = models.CharField(max_length=50)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.IntegerField(null=True)
+    response_body = models.JSONField(null=True)
+    # 응답이 저장되기 전까지 이 시각까지는 처음 요청이 처리 중 (orders/idempotency.py)
+    locked_until = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.member_id}:{self.key}"
+
+    class Meta:
+        db_table = "idempotency_key"
+        app_label = 'orders'
+        constraints = [
+            models.UniqueConstraint(fields=["member_id", "key"], name="uniq_idempotency_member_key"),
+        ]
+
+
+class OutboxEvent(models.Model):
+    """주문 트랜잭션과 함께 기록되는 도메인 이벤트 (transactional outbox)"""
+
+    event_id = models.BigAutoField(primary_key=True)
+    event_type = models.CharField(max_length=50)
+    aggregate_id = models.CharField(max_length=50)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    # 싱크에 발행한 시각 (NULL이면 아직 발행 전)
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.event_type} {self.event_id}"
+
+    class Meta:
+        db_table = "outbox_event"
+        app_label = 'orders'
+        indexes = [
+            models.Index(
+                fields=["event_id"], name="outbox_unpublished_idx", condition=models.Q(published_at__isnull=True)
+            ),
+        ]
+
+
+class SalesDaily(models.Model):
+    """지점/일자/피자별 판매 롤업. 주문 생성 시 증분 갱신된다."""
+
+    bran = models.ForeignKey(Branch, on_delete=models.DO_NOTHING, db_column="bran_id")
+    day = models.DateField()
+    pizza_id = models.CharField(max_length=50)
+    quantity = models.IntegerField(default=0)
+    revenue = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"{self.bran_id} {self.day} {self.pizza_id}"
+
+    class Meta:
+        db_table = "sales_daily"
+        app_label = 'orders'
+        constraints = [
+            models.UniqueConstraint(fields=["bran", "day", "pizza_id"], name="uniq_sales_daily_key"),
+        ]
+
+
+class BranchPopularity(models.Model):
+    """
+    지점별 피자 인기 점수 (orders/popularity.py).
+
+    score는 forward decay 방식으로 기준일 대비 가중된 누적 수량의 자연로그라 주문마다 log-sum-exp로 더하기만 하면 된다.
+    """
+
+    bran = models.ForeignKey(Branch, on_delete=models.DO_NOTHING, db_column="bran_id")
+    pizza_id = models.CharField(max_length=50)
+    score = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"{self.bran_id} {self.pizza_id}"
+
+    class Meta:
+        db_table = "branch_popularity"
+        app_label = 'orders'
+        constraints = [
+            models.UniqueConstraint(fields=["bran", "pizza_id"], name="uniq_branch_popularity_key"),
+        ]
+
+
+class StreamTicket(models.Model):
+    """주문 상태 SSE 연결용 1회용 티켓. 원문은 발급 응답에만 있고 DB에는 sha256만 저장한다."""
+
+    token_hash = models.CharField(primary_key=True, max_length=64)
+    member_id = models.CharField(max_length=50)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.member_id
+
+    class Meta:
+        db_table = "stream_ticket"
+        app_label = 'orders'
+
+
+class OrderArchive(models.Model):
+    """
+    콜드 보관으로 옮긴 월별 주문 파일 목록 (orders/archive.py).
+
+    month부터 한 달치 주문/상세가 path의 압축 파일에 있고 DB에서는 지워졌다(지우는 중일 수 있다).
+    """
+
+    month = models.DateField(primary_key=True)
+    path = models.CharField(max_length=255)
+    orders = models.IntegerField()
+    lines = models.IntegerField()
+    sha256 = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.path}"
+
+    class Meta:
+        db_table = "order_archive"
+        app_label = 'orders'
@@ -0,0 +1,28 @@
+"""
+내부 서비스 호출용 MessagePack 인코딩.
+
+menu-service 같은 내부 엔드포인트에 Content-Type/Accept: application/msgpack으로 요청한다.
+msgpack이 설치되어 있지 않으면 JSON을 사용한다. msgpack은 처음 menu-service를 호출할 때 import한다.
+"""
+import importlib.util
+
+# 선택 의존성: 설치 여부만 확인하고 import는 미룬다 (기동 경로에서 제외)
+MSGPACK_AVAILABLE = importlib.util.find_spec("msgpack") is not None
+
+MSGPACK = "application/msgpack"
+
+
+def packb(data) -> bytes:
+    import msgpack
+
+    return msgpack.packb(data, use_bin_type=True)
+
+
+def unpackb(data):
+    import msgpack
+
+    return msgpack.unpackb(data, raw=False)
+
+
+def is_msgpack(response):
+    return response.headers.get("Content-Type", "").split(";")[0].strip() == MSGPACK
@@ -0,0 +1,371 @@
+"""
+orders / order_detail 월별 range 파티셔닝 (PostgreSQL).
+
+파티션 키는 order_day(주문일)이고 파티션 이름은 <테이블>_YYYYMM이다. default 파티션은 두지 않는 대신
+wsgi/asgi가 start_maintenance()로 띄운 백그라운드 스레드가 기동 직후와 ORDER_PARTITION_ENSURE_SECONDS마다
+ensure_partitions()를 실행해 ORDER_PARTITION_MONTHS_AHEAD개월 앞까지 미리 만든다. 여러 파드가 동시에 실행해도
+advisory lock으로 한 번에 하나만 만든다. manage_partitions ensure로 직접 실행할 수도 있다.
+
+기존 단일 테이블은 manage_partitions convert로 옮긴다.
+1. 같은 컬럼의 파티션 테이블(<테이블>_partitioned)과 월 파티션을 만든다. PK는 파티션 키를 포함해야 하므로
+   (order_id, order_day), (order_detail_id, order_day)가 되고 order_detail -> orders 외래키도
+   (order_id, order_day) 복합 키가 된다. 파티션 테이블은 identity 컬럼을 지원하지 않아(PostgreSQL 13)
+   채번은 시퀀스 기본값으로 한다.
+2. 서비스를 멈추지 않고 order_id 구간별로 batch_size건씩 복사하고 구간마다 커밋한다.
+3. 짧은 배타 잠금 안에서 파티션 테이블에 없는 주문/상세(복사 이후 생성됐거나 복사 중 커밋 전이던 행)를 전체 구간에서
+   따라잡고 상태가 바뀐 주문을 맞춘다. 양쪽 행 수가 같을 때만 기존 테이블을 지운 뒤 이름을 바꾼다.
+
+과거 날짜 주문을 파티션 테이블에 적재할 때(합성 데이터 등)는 먼저 ensure_range()로 그 기간의 파티션을 만든다.
+
+Django 모델은 그대로 order_id를 PK로 본다 (DB의 복합 PK와 달라도 ORM 동작에는 영향이 없다).
+주문일 조건이 있는 조회는 filter_days()로 orders/order_detail 양쪽 파티션 키에 조건을 걸어 해당 월 파티션만 읽는다.
+"""
+import datetime
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import DateField, Max, OuterRef, Subquery
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from .models import Order, OrderDetail
+
+logger = logging.getLogger(__name__)
+
+# (테이블, PK 컬럼)
+TABLES = [("orders", "order_id"), ("order_detail", "order_detail_id")]
+SHADOW_SUFFIX = "_partitioned"
+DETAIL_ORDER_FK = "order_detail_order_id_order_day_fk"
+
+class PartitionError(Exception):
+    pass
+
+
+# 복사 중 상태가 바뀐 주문을 다시 맞출 때 서버 간 시계 차이를 감안해 더 앞부터 본다.
+_STATUS_SYNC_MARGIN = datetime.timedelta(minutes=5)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(month, n):
+    index = month.year * 12 + month.month - 1 + n
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_{month:%Y%m}"
+
+
+def filter_days(details, date_from=None, date_to=None):
+    """
+    order_detail 쿼리셋에 주문일 범위 조건을 건다.
+
+    조인하는 orders와 order_detail 양쪽 파티션 키에 조건이 있어야 두 테이블 모두 범위 밖 파티션을 건너뛴다.
+    """
+    if date_from:
+        details = details.filter(order_day__gte=date_from, order__order_day__gte=date_from)
+    if date_to:
+        details = details.filter(order_day__lte=date_to, order__order_day__lte=date_to)
+    return details
+
+
+def backfill_range(lo, hi):
+    """order_id가 (lo, hi] 구간인 행의 비어 있는 order_day를 채운다."""
+    Order.objects.filter(order_id__gt=lo, order_id__lte=hi, order_day__isnull=True).update(
+        order_day=Cast("date", DateField())
+    )
+    OrderDetail.objects.filter(order_id__gt=lo, order_id__lte=hi, order_day__isnull=True).update(
+        order_day=Subquery(Order.objects.filter(order_id=OuterRef("order_id")).values("order_day")[:1])
+    )
+
+
+def backfill_order_day(batch_size=10000):
+    """order_day가 비어 있는 행(컬럼 추가 전 코드로 들어온 주문)을 구간별로 채운다."""
+    last = Order.objects.aggregate(m=Max("order_id"))["m"] or 0
+    for lo in range(0, last, batch_size):
+        backfill_range(lo, lo + batch_size)
+
+
+def is_partitioned(table):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+        row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def partitions(table):
+    """[(파티션 이름, 범위, 추정 행 수)] 이름순"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            ORDER BY c.relname
+            """,
+            [table],
+        )
+        return cursor.fetchall()
+
+
+def _create_partition(cursor, parent, table, month):
+    """parent의 month 파티션을 만든다. 새로 만들었으면 True"""
+    name = partition_name(table, month)
+    cursor.execute("SELECT to_regclass(%s) IS NULL", [name])
+    if not cursor.fetchone()[0]:
+        return False
+    cursor.execute(
+        f"CREATE TABLE {name} PARTITION OF {parent} FOR VALUES FROM (%s) TO (%s)",
+        [month, add_months(month, 1)],
+    )
+    return True
+
+
+def ensure_range(first_day, last_day):
+    """first_day~last_day 주문일을 담을 월 파티션을 파티션된 테이블에 만들고 새로 만든 이름 목록을 반환"""
+    if connection.vendor != "postgresql":
+        return []
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        # 여러 파드가 동시에 실행해도 트랜잭션이 끝날 때까지 하나씩 (같은 파티션을 두 번 만들지 않는다)
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext('orders.partitions.ensure'))")
+        for table, _ in TABLES:
+            if not is_partitioned(table):
+                continue
+            month = month_start(first_day)
+            while month <= last_day:
+                if _create_partition(cursor, table, table, month):
+                    created.append(partition_name(table, month))
+                month = add_months(month, 1)
+    return created
+
+
+def ensure_partitions(months_ahead=None, today=None):
+    """파티션된 테이블에 이번 달부터 months_ahead개월 뒤까지 파티션을 만들고 새로 만든 이름 목록을 반환"""
+    if months_ahead is None:
+        months_ahead = settings.ORDER_PARTITION_MONTHS_AHEAD
+    current = month_start(today or datetime.date.today())
+    return ensure_range(current, add_months(current, months_ahead))
+
+
+_stop = threading.Event()
+_thread = None
+
+
+def _maintain():
+    while True:
+        try:
+            created = ensure_partitions()
+            if created:
+                logger.info("created partitions %s", ", ".join(created))
+        except Exception:
+            logger.exception("ensure_partitions failed")
+        finally:
+            # 유지 스레드의 DB 연결은 요청 스레드가 쓰지 않으므로 정리한다.
+            connections.close_all()
+        if _stop.wait(settings.ORDER_PARTITION_ENSURE_SECONDS):
+            return
+
+
+def start_maintenance():
+    """기동 직후와 ORDER_PARTITION_ENSURE_SECONDS마다 ensure_partitions()를 실행하는 스레드 시작 (프로세스당 한 번)"""
+    global _thread
+    if _thread is not None or settings.ORDER_PARTITION_ENSURE_SECONDS <= 0:
+        return
+    _thread = threading.Thread(target=_maintain, name="partition-maintenance", daemon=True)
+    _thread.start()
+
+
+def _columns(model):
+    return ", ".join(connection.ops.quote_name(f.column) for f in model._meta.concrete_fields)
+
+
+def _secondary_indexes(cursor, table):
+    """[(인덱스 이름, UNIQUE 여부, USING 이후 정의)] — PK 제외"""
+    cursor.execute(
+        """
+        SELECT c.relname, i.indisunique, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = to_regclass(%s) AND NOT i.indisprimary
+        ORDER BY c.relname
+        """,
+        [table],
+    )
+    return [(name, unique, definition.split(" USING ", 1)[1]) for name, unique, definition in cursor.fetchall()]
+
+
+def _foreign_keys(cursor, table):
+    """[(제약 이름, 정의)] — orders를 참조하는 외래키는 복합 키로 바꾸므로 제외"""
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = to_regclass(%s) AND contype = 'f' AND confrelid <> to_regclass('orders')
+        ORDER BY conname
+        """,
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def _create_shadow(cursor, table, pk):
+    shadow = table + SHADOW_SUFFIX
+    seq = f"{shadow}_{pk}_seq"
+    cursor.execute(f"CREATE TABLE {shadow} (LIKE {table} INCLUDING DEFAULTS) PARTITION BY RANGE (order_day)")
+    cursor.execute(f"CREATE SEQUENCE {seq} AS integer OWNED BY {shadow}.{pk}")
+    cursor.execute(
+        f"ALTER TABLE {shadow} ALTER COLUMN {pk} SET DEFAULT nextval('{seq}'), "
+        f"ALTER COLUMN order_day SET NOT NULL, ADD PRIMARY KEY ({pk}, order_day)"
+    )
+    # 이름은 기존 테이블을 지운 뒤 되돌린다 (_swap).
+    for name, unique, definition in _secondary_indexes(cursor, table):
+        cursor.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {name}_p ON {shadow} USING {definition}")
+
+
+def _add_foreign_keys(cursor):
+    """복사가 끝난 파티션 테이블에 외래키를 건다 (검증은 기존 테이블을 잠그지 않는다)."""
+    for table, _ in TABLES:
+        for name, definition in _foreign_keys(cursor, table):
+            cursor.execute(f"ALTER TABLE {table}{SHADOW_SUFFIX} ADD CONSTRAINT {name}_p {definition}")
+    cursor.execute(
+        f"ALTER TABLE order_detail{SHADOW_SUFFIX} ADD CONSTRAINT {DETAIL_ORDER_FK} "
+        f"FOREIGN KEY (order_id, order_day) REFERENCES orders{SHADOW_SUFFIX} (order_id, order_day) "
+        "DEFERRABLE INITIALLY DEFERRED"
+    )
+
+
+def _copy_range(cursor, lo, hi):
+    """order_id가 (lo, hi] 구간인 주문과 상세를 파티션 테이블로 복사하고 복사한 주문 수를 반환"""
+    backfill_range(lo, hi)
+    counts = []
+    for table, model in [("orders", Order), ("order_detail", OrderDetail)]:
+        columns = _columns(model)
+        cursor.execute(
+            f"INSERT INTO {table}{SHADOW_SUFFIX} ({columns}) SELECT {columns} FROM {table} "
+            "WHERE order_id > %s AND order_id <= %s",
+            [lo, hi],
+        )
+        counts.append(cursor.rowcount)
+    return counts[0]
+
+
+def _create_shadow_partitions(cursor, first_day, last_day):
+    month = month_start(first_day)
+    while month <= last_day:
+        for table, _ in TABLES:
+            _create_partition(cursor, table + SHADOW_SUFFIX, table, month)
+        month = add_months(month, 1)
+
+
+def _catch_up(cursor):
+    """
+    파티션 테이블에 없는 주문/상세를 전체 order_id 구간에서 옮기고 원본에서 지워진 행은 파티션 테이블에서도 지운다.
+
+    구간 복사 때 아직 커밋되지 않았던 행(복사한 구간 안의 id)도 여기서 들어간다. 옮긴 주문 수를 반환.
+    """
+    copied = []
+    for table, model, pk in [("orders", Order, "order_id"), ("order_detail", OrderDetail, "order_detail_id")]:
+        columns = _columns(model)
+        cursor.execute(
+            f"INSERT INTO {table}{SHADOW_SUFFIX} ({columns}) SELECT {columns} FROM {table} t "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {table}{SHADOW_SUFFIX} p WHERE p.{pk} = t.{pk})"
+        )
+        copied.append(cursor.rowcount)
+    for table, pk in reversed(TABLES):
+        cursor.execute(
+            f"DELETE FROM {table}{SHADOW_SUFFIX} p WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE t.{pk} = p.{pk})"
+        )
+    return copied[0]
+
+
+def _swap(since):
+    """기존 테이블을 잠그고 남은 변경분을 옮긴 뒤 파티션 테이블로 바꿔 끼운다. 따라잡은 주문 수를 반환"""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("LOCK TABLE orders, order_detail IN ACCESS EXCLUSIVE MODE")
+        # 대기 중인 지연 외래키 검사가 있으면 테이블을 지울 수 없으므로 이 트랜잭션에서는 즉시 검사한다.
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute("SELECT COALESCE(max(order_id), 0) FROM orders")
+        backfill_range(0, cursor.fetchone()[0])
+        # 복사 이후 들어온 주문이 기존 범위 밖 날짜일 수 있다.
+        cursor.execute("SELECT min(order_day), max(order_day) FROM orders")
+        first_day, last_day = cursor.fetchone()
+        if first_day:
+            _create_shadow_partitions(cursor, first_day, last_day)
+        copied = _catch_up(cursor)
+        cursor.execute(
+            f"""
+            UPDATE orders{SHADOW_SUFFIX} p SET status = o.status, status_updated_at = o.status_updated_at
+            FROM orders o
+            WHERE o.order_id = p.order_id AND o.order_day = p.order_day AND o.status_updated_at >= %s
+            """,
+            [since],
+        )
+        for table, _ in TABLES:
+            cursor.execute(f"SELECT (SELECT count(*) FROM {table}), (SELECT count(*) FROM {table}{SHADOW_SUFFIX})")
+            original, partitioned = cursor.fetchone()
+            if original != partitioned:
+                raise PartitionError(f"{table}: 행 수가 다릅니다 (기존 {original}, 파티션 {partitioned}). 전환을 취소합니다.")
+        renames = {table: (_secondary_indexes(cursor, table), _foreign_keys(cursor, table)) for table, _ in TABLES}
+        for table, _ in reversed(TABLES):
+            cursor.execute(f"DROP TABLE {table}")
+        for table, pk in TABLES:
+            shadow = table + SHADOW_SUFFIX
+            indexes, foreign_keys = renames[table]
+            cursor.execute(f"ALTER TABLE {shadow} RENAME TO {table}")
+            cursor.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {shadow}_pkey TO {table}_pkey")
+            cursor.execute(f"ALTER SEQUENCE {shadow}_{pk}_seq RENAME TO {table}_{pk}_seq")
+            for name, _, _ in indexes:
+                cursor.execute(f"ALTER INDEX {name}_p RENAME TO {name}")
+            for name, _ in foreign_keys:
+                cursor.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {name}_p TO {name}")
+            cursor.execute(
+                f"SELECT setval('{table}_{pk}_seq', COALESCE((SELECT max({pk}) FROM {table}), 0) + 1, false)"
+            )
+    return copied
+
+
+def convert(batch_size=10000, months_ahead=None, progress=None):
+    """
+    orders / order_detail을 월별 파티션 테이블로 옮기고 옮긴 주문 수를 반환한다.
+
+    중단됐다면 다시 실행하면 된다 (남아 있는 _partitioned 테이블은 지우고 처음부터 복사한다).
+    progress(복사한 order_id, 마지막 order_id)는 구간마다 호출된다.
+    """
+    if months_ahead is None:
+        months_ahead = settings.ORDER_PARTITION_MONTHS_AHEAD
+    since = timezone.now() - _STATUS_SYNC_MARGIN
+    with connection.cursor() as cursor:
+        for table, _ in reversed(TABLES):
+            cursor.execute(f"DROP TABLE IF EXISTS {table}{SHADOW_SUFFIX}")
+
+    backfill_order_day(batch_size)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT min(order_day), max(order_day), COALESCE(max(order_id), 0) FROM orders")
+        first_day, last_day, last_id = cursor.fetchone()
+
+    today = datetime.date.today()
+    month = month_start(first_day or today)
+    last_month = add_months(month_start(max(last_day or today, today)), months_ahead)
+    with transaction.atomic(), connection.cursor() as cursor:
+        for table, pk in TABLES:
+            _create_shadow(cursor, table, pk)
+        _create_shadow_partitions(cursor, month, last_month)
+
+    copied = 0
+    for lo in range(0, last_id, batch_size):
+        hi = min(lo + batch_size, last_id)
+        with transaction.atomic(), connection.cursor() as cursor:
+            copied += _copy_range(cursor, lo, hi)
+        if progress:
+            progress(hi, last_id)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        _add_foreign_keys(cursor)
+    copied += _swap(since)
+    # 새 파티션들의 통계가 없으면 플래너가 행 수를 크게 잘못 추정한다.
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE orders, order_detail")
+    return copied
@@ -0,0 +1,172 @@
+"""
+지점별 인기 피자 순위.
+
+점수는 forward decay로 유지한다. 주문 수량에 2 ** ((주문일 - POPULARITY_EPOCH) / POPULARITY_HALF_LIFE_DAYS)를
+곱해 더하므로, 오래된 점수를 매번 감쇠시키지 않고도 어느 시점에서나 점수 비율(순위)이 반감기 감쇠와 같다.
+가중치는 반감기 1023번(기본 14일이면 약 39년)이 지나면 float 범위를 넘으므로 점수는 가중 합의 자연로그로
+저장한다(log-sum-exp로 더함). 로그는 단조이므로 순위는 그대로이고, 응답에는 현재 시점으로 환산한 값
+(최근 가중 수량)을 보낸다.
+
+주문 생성 트랜잭션에서 record_order()로 증분 갱신하고, rebuild()로 주문 이력에서 SQL 한 번으로 다시 계산한다.
+조회는 지점별 상위 POPULARITY_TOP_N개를 메모리 스냅샷에서 하고 POPULARITY_REFRESH_SECONDS마다 다시 읽는다.
+"""
+import datetime
+import math
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .archive import current_boundary
+from .models import BranchPopularity
+from .singleflight import SingleFlight
+
+# ln(e^a + e^b) = max(a, b) + ln(1 + e^-|a - b|). max(a, b)는 두 DB 공통으로 (a + b + |a - b|) / 2로 쓴다.
+_UPSERT_SQL = """
+    INSERT INTO branch_popularity (bran_id, pizza_id, score)
+    VALUES (%s, %s, %s)
+    ON CONFLICT (bran_id, pizza_id) DO UPDATE
+    SET score = (branch_popularity.score + EXCLUDED.score + abs(branch_popularity.score - EXCLUDED.score)) / 2
+        + ln(1 + exp(-abs(branch_popularity.score - EXCLUDED.score)))
+"""
+
+
+def log_weight(day):
+    """주문일의 forward decay 가중치의 자연로그"""
+    epoch = datetime.date.fromisoformat(settings.POPULARITY_EPOCH)
+    return (day - epoch).days / settings.POPULARITY_HALF_LIFE_DAYS * math.log(2)
+
+
+def record_order(bran_id, day, items):
+    """items: [{"pizza_id", "quantity"}] — 주문 생성 트랜잭션 안에서 호출한다."""
+    lw = log_weight(day)
+    totals = defaultdict(int)
+    for item in items:
+        totals[item["pizza_id"]] += int(item["quantity"])
+    rows = [
+        (bran_id, pizza_id, math.log(quantity) + lw)
+        for pizza_id, quantity in sorted(totals.items())
+        if quantity > 0
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(_UPSERT_SQL, rows)
+
+
+# 주문일 - 기준일(일 수). PostgreSQL은 date 뺄셈, SQLite는 julianday 차이
+_DAYS_SINCE_EPOCH = {
+    "postgresql": "(s.day - %s::date)",
+    "sqlite": "(julianday(s.day) - julianday(%s))",
+}
+
+# 항마다 ln(수량) + 로그 가중치를 구하고, 그룹 최대값을 빼서 exp를 더하는 log-sum-exp로 넘침 없이 합친다.
+_REBUILD_SQL = """
+    INSERT INTO branch_popularity (bran_id, pizza_id, score)
+    SELECT w.bran_id, w.pizza_id, MAX(w.peak) + ln(SUM(exp(w.term - w.peak)))
+    FROM (
+        SELECT t.bran_id, t.pizza_id, t.term, MAX(t.term) OVER (PARTITION BY t.bran_id, t.pizza_id) AS peak
+        FROM (
+            SELECT s.bran_id, s.pizza_id, ln(s.quantity) + {days} / %s * ln(2.0) AS term
+            FROM ({source}) s
+            WHERE s.quantity > 0
+        ) t
+    ) w
+    GROUP BY w.bran_id, w.pizza_id
+    ON CONFLICT (bran_id, pizza_id) DO UPDATE SET score = EXCLUDED.score
+"""
+_DETAIL_SOURCE = """
+    SELECT o.bran_id, d.pizza_id, d.quantity, o.order_day AS day
+    FROM order_detail d JOIN orders o ON o.order_id = d.order_id
+    WHERE o.order_day IS NOT NULL
+"""
+# 콜드 보관된 달은 order_detail에 없으므로 남아 있는 일별 롤업(sales_daily)에서 가져온다.
+_ARCHIVED_SOURCE = """
+    SELECT o.bran_id, d.pizza_id, d.quantity, o.order_day AS day
+    FROM order_detail d JOIN orders o ON o.order_id = d.order_id
+    WHERE o.order_day >= %s
+    UNION ALL
+    SELECT bran_id, pizza_id, quantity, day FROM sales_daily WHERE day < %s
+"""
+
+
+def rebuild():
+    """
+    주문 이력을 (지점, 피자)로 GROUP BY 하면서 forward decay 가중 합(의 로그)을 DB에서 계산해
+    INSERT ... SELECT 한 번으로 점수를 다시 만든다. 보관된 달(boundary 이전)은 sales_daily에서 읽는다.
+
+    PostgreSQL에서는 재계산 중 들어오는 증분 갱신을 대기시킨다. 반환값은 생성된 행 수.
+    """
+    params = [settings.POPULARITY_EPOCH, settings.POPULARITY_HALF_LIFE_DAYS]
+    boundary = current_boundary()
+    if boundary:
+        source = _ARCHIVED_SOURCE
+        params += [boundary, boundary]
+    else:
+        source = _DETAIL_SOURCE
+    sql = _REBUILD_SQL.format(days=_DAYS_SINCE_EPOCH[connection.vendor], source=source)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("LOCK TABLE branch_popularity IN SHARE ROW EXCLUSIVE MODE")
+            BranchPopularity.objects.all().delete()
+            cursor.execute(sql, params)
+            created = cursor.rowcount
+    invalidate()
+    return created
+
+
+class PopularitySnapshot:
+    def __init__(self, rows, top_n):
+        self.top = defaultdict(list)
+        for bran_id, pizza_id, score in rows:
+            ranked = self.top[bran_id]
+            if len(ranked) < top_n:
+                ranked.append((pizza_id, score))
+        self.loaded_at = time.monotonic()
+
+    def ranking(self, bran_id, limit, today=None):
+        """[{"pizza_id", "score"}] — score는 오늘 기준 가중 수량"""
+        now = log_weight(today or datetime.date.today())
+        return [
+            {"pizza_id": pizza_id, "score": round(math.exp(score - now), 3)}
+            for pizza_id, score in self.top.get(bran_id, [])[:limit]
+        ]
+
+
+_lock = threading.Lock()
+_snapshot = None
+_flight = SingleFlight()
+_KEY = "popularity"
+
+
+def load_snapshot():
+    rows = BranchPopularity.objects.order_by("bran_id", "-score", "pizza_id").values_list(
+        "bran_id", "pizza_id", "score"
+    )
+    return PopularitySnapshot(rows.iterator(), settings.POPULARITY_TOP_N)
+
+
+def invalidate():
+    global _snapshot
+    with _lock:
+        _snapshot = None
+    _flight.forget(_KEY)
+
+
+def _refresh():
+    global _snapshot
+    snapshot = load_snapshot()
+    with _lock:
+        _snapshot = snapshot
+    return snapshot
+
+
+def get_snapshot():
+    """주기가 지난 스냅샷은 반환하면서 백그라운드에서 한 번만 다시 읽는다."""
+    snapshot = _snapshot
+    if snapshot is None:
+        return _flight.do(_KEY, _refresh)
+    if time.monotonic() - snapshot.loaded_at >= settings.POPULARITY_REFRESH_SECONDS:
+        _flight.refresh(_KEY, _refresh)
+    return snapshot
@@ -0,0 +1,85 @@
+"""
+프로세스 내 메뉴 가격 캐시.
+
+menu-service의 전체 피자 목록(/api/menu/)을 한 번 받아 (피자 이름, 사이즈) -> {"pizza_id", "price"}로 두고
+MENU_PRICE_CACHE_REFRESH_SECONDS마다 다시 받는다. 장바구니 견적(/api/order/quote/)은 줄마다 menu-service를
+호출하지 않고 이 캐시에서만 계산한다. 주문 생성은 지금처럼 줄마다 menu-service에서 가격을 확인한다.
+
+갱신 주기가 지난 뒤 MENU_PRICE_CACHE_STALE_SECONDS 동안은 기존 캐시를 반환하며 백그라운드에서 한 번만 다시
+받고, 그보다 오래됐거나 비어 있으면 동시 요청 중 하나만 menu-service를 호출한다(single-flight).
+"""
+import threading
+import time
+
+from django.conf import settings
+
+from .menu_client import fetch_menu
+from .singleflight import SingleFlight
+
+
+class PriceSnapshot:
+    def __init__(self, pizzas):
+        # 같은 (이름, 사이즈)가 여럿이면 menu-service(menu_cache)처럼 목록에서 먼저 나온 피자를 쓴다.
+        self.by_name_size = {}
+        for p in pizzas:
+            self.by_name_size.setdefault(
+                (p["pizza_type__pizza_nm"], p["size"]), {"pizza_id": p["pizza_id"], "price": p["price"]}
+            )
+        self.loaded_at = time.monotonic()
+
+
+_lock = threading.Lock()
+_snapshot = None
+_flight = SingleFlight()
+_KEY = "menu-prices"
+
+
+def load_snapshot():
+    """menu-service 호출. 연결 실패는 requests 예외로 전파된다."""
+    return PriceSnapshot(fetch_menu(timeout=5))
+
+
+def invalidate():
+    global _snapshot
+    with _lock:
+        _snapshot = None
+    _flight.forget(_KEY)
+
+
+def _refresh():
+    global _snapshot
+    snapshot = load_snapshot()
+    with _lock:
+        _snapshot = snapshot
+    return snapshot
+
+
+def _cached(max_age):
+    """menu-service 호출 없이 반환할 수 있는 캐시. 기본 주기의 stale 구간이면 백그라운드 갱신을 건다."""
+    snapshot = _snapshot
+    if snapshot is None:
+        return None
+    age = time.monotonic() - snapshot.loaded_at
+    if max_age is None:
+        max_age = settings.MENU_PRICE_CACHE_REFRESH_SECONDS
+        if max_age <= age < max_age + settings.MENU_PRICE_CACHE_STALE_SECONDS:
+            _flight.refresh(_KEY, _refresh)
+            return snapshot
+    return snapshot if age < max_age else None
+
+
+def get_snapshot(max_age=None):
+    return _cached(max_age) or _flight.do(_KEY, _refresh)
+
+
+def lookup(name, size):
+    """
+    (피자 이름, 사이즈) -> {"pizza_id", "price"}, 없으면 None.
+
+    캐시에 없으면 방금 추가된 메뉴일 수 있으므로, 캐시가 MENU_PRICE_CACHE_MISS_RELOAD_SECONDS보다
+    오래됐을 때 한 번 다시 받아 확인한다.
+    """
+    item = get_snapshot().by_name_size.get((name, size))
+    if item is not None:
+        return item
+    return get_snapshot(max_age=settings.MENU_PRICE_CACHE_MISS_RELOAD_SECONDS).by_name_size.get((name, size))
@@ -0,0 +1,109 @@
+"""
+지점/일자/피자별 판매 롤업(sales_daily) 유지.
+
+주문 생성 트랜잭션에서 apply_order()로 증분 갱신하고, rebuild()로 기간 단위 재계산한다.
+콜드 보관된 달(orders/archive.py)은 order_detail에 없으므로 재계산하지 않고 기존 롤업을 그대로 둔다.
+"""
+import datetime
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Q, Sum
+
+from .archive import current_boundary
+from .models import OrderDetail, SalesDaily
+from .partitions import filter_days
+
+_UPSERT_SQL = """
+    INSERT INTO sales_daily (bran_id, day, pizza_id, quantity, revenue)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (bran_id, day, pizza_id) DO UPDATE
+    SET quantity = sales_daily.quantity + EXCLUDED.quantity,
+        revenue = sales_daily.revenue + EXCLUDED.revenue
+"""
+
+
+def apply_order(bran_id, day, items):
+    """items: [{"pizza_id", "quantity", "price"}] — 같은 피자는 한 행으로 합쳐 upsert"""
+    totals = defaultdict(lambda: [0, 0.0])
+    for item in items:
+        quantity = int(item["quantity"])
+        totals[item["pizza_id"]][0] += quantity
+        totals[item["pizza_id"]][1] += quantity * float(item.get("price") or 0)
+    rows = [(bran_id, day, pizza_id, q, r) for pizza_id, (q, r) in sorted(totals.items())]
+    with connection.cursor() as cursor:
+        cursor.executemany(_UPSERT_SQL, rows)
+
+
+def rebuild(price_lookup, date_from=None, date_to=None, batch_size=1000):
+    """
+    order_detail을 (지점, 일자, 피자)로 GROUP BY 해서 기간 내 롤업을 다시 만든다.
+
+    매출은 주문 시점 스냅샷(line_total)을 합산한다. 스냅샷이 없는 이전 주문이 있을 때만
+    price_lookup()으로 현재 가격표를 한 번 가져와 환산한다.
+
+    PostgreSQL에서는 sales_daily를 SHARE ROW EXCLUSIVE로 잠가 재계산 중 들어오는 증분 갱신을
+    대기시키므로 이중 집계나 누락이 없다. 보관된 달은 제외한다(date_from을 boundary로 당긴다).
+    반환값은 생성된 행 수.
+    """
+    boundary = current_boundary()
+    if boundary and (date_from is None or date_from < boundary):
+        date_from = boundary
+    details = filter_days(OrderDetail.objects.all(), date_from, date_to)
+    rollups = SalesDaily.objects.all()
+    if date_from:
+        rollups = rollups.filter(day__gte=date_from)
+    if date_to:
+        rollups = rollups.filter(day__lte=date_to)
+
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("LOCK TABLE sales_daily IN SHARE ROW EXCLUSIVE MODE")
+        rollups.delete()
+
+        grouped = (
+            details.values("order__bran_id", "order__date", "pizza_id")
+            .annotate(
+                total_quantity=Sum("quantity"),
+                snapshot_revenue=Sum("line_total"),
+                unpriced_quantity=Sum("quantity", filter=Q(line_total__isnull=True)),
+            )
+            .order_by()
+        )
+        price_map = None
+        created = 0
+        batch = []
+        for row in grouped.iterator(chunk_size=batch_size):
+            revenue = row["snapshot_revenue"] or 0.0
+            if row["unpriced_quantity"]:
+                if price_map is None:
+                    price_map = price_lookup()
+                revenue += row["unpriced_quantity"] * float(price_map.get(row["pizza_id"]) or 0)
+            batch.append(SalesDaily(
+                bran_id=row["order__bran_id"],
+                day=datetime.date.fromisoformat(row["order__date"]),
+                pizza_id=row["pizza_id"],
+                quantity=row["total_quantity"],
+                revenue=revenue,
+            ))
+            if len(batch) >= batch_size:
+                SalesDaily.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            SalesDaily.objects.bulk_create(batch)
+            created += len(batch)
+    return created
+
+
+def sales_report(bran_id, date_from, date_to):
+    rows = (
+        SalesDaily.objects.filter(bran_id=bran_id, day__gte=date_from, day__lte=date_to)
+        .order_by("day", "pizza_id")
+        .values_list("day", "pizza_id", "quantity", "revenue")
+    )
+    return [
+        {"day": day, "pizza_id": pizza_id, "quantity": quantity, "revenue": revenue}
+        for day, pizza_id, quantity, revenue in rows
+    ]
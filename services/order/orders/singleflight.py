@@ -0,0 +1,114 @@
+"""
+single-flight: 같은 키에 대한 동시 호출을 하나로 합친다.
+
+캐시가 비었거나 만료된 순간 몰려든 요청 중 첫 호출(leader)만 함수를 실행하고, 나머지는 그 결과
+(또는 예외)를 기다렸다가 그대로 받는다. 동기 뷰는 do(), 비동기 뷰는 ado()를 쓰며, 둘이 같은 키로
+섞여 들어와도 실행은 한 번이다. refresh()는 stale-while-revalidate용으로, 진행 중인 호출이 없을 때만
+백그라운드 스레드에서 실행을 시작하고 곧바로 반환한다.
+"""
+import asyncio
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = []  # 비동기 대기자 (loop, future)
+
+    def result(self):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def _join(self, key):
+        """(call, leader 여부)"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def _run(self, key, call, fn):
+        try:
+            call.value = fn()
+        except Exception as exc:
+            call.error = exc
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.done.set()
+                waiters, call.waiters = call.waiters, []
+            for loop, future in waiters:
+                loop.call_soon_threadsafe(_wake, future)
+        return call
+
+    def do(self, key, fn):
+        """fn()을 키당 하나만 실행하고 그 결과를 반환한다."""
+        call, leader = self._join(key)
+        if leader:
+            self._run(key, call, fn)
+        else:
+            call.done.wait()
+        return call.result()
+
+    async def ado(self, key, fn):
+        """do()의 비동기 버전. fn은 동기 함수(DB 접근 등)이며 스레드에서 실행된다."""
+        call, leader = self._join(key)
+        if leader:
+            await sync_to_async(self._run)(key, call, fn)
+            return call.result()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if not call.done.is_set():
+                call.waiters.append((loop, future))
+            else:
+                future.set_result(None)
+        await future
+        return call.result()
+
+    def refresh(self, key, fn):
+        """진행 중인 호출이 없으면 백그라운드에서 fn()을 시작한다. 시작했으면 True"""
+        call, leader = self._join(key)
+        if not leader:
+            return False
+        threading.Thread(target=self._refresh, args=(key, call, fn), name=f"refresh:{key}", daemon=True).start()
+        return True
+
+    def _refresh(self, key, call, fn):
+        try:
+            if self._run(key, call, fn).error is not None:
+                logger.error("background refresh of %s failed", key, exc_info=call.error)
+        finally:
+            # 갱신 스레드의 DB 연결은 다른 요청이 쓰지 않으므로 정리한다.
+            connections.close_all()
+
+    def forget(self, key):
+        """진행 중인 호출을 잊어 다음 호출이 새로 실행되게 한다 (무효화 직후 이전 결과 공유 방지)."""
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
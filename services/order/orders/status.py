@@ -0,0 +1,49 @@
+"""
+주문 진행 상태.
+
+placed -> preparing -> baking -> delivering -> completed 순서로만 진행하고, 배달 전(placed/preparing)에는
+cancelled로 바꿀 수 있다. 상태 변경은 현재 상태를 조건으로 한 UPDATE 한 번이라 동시 변경이 겹쳐도
+역행하지 않는다. 같은 트랜잭션에서 OrderStatusChanged 이벤트를 outbox에 기록한다.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Order
+from .outbox import record_order_status_changed
+
+PLACED = "placed"
+PREPARING = "preparing"
+BAKING = "baking"
+DELIVERING = "delivering"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+
+STATUSES = [PLACED, PREPARING, BAKING, DELIVERING, COMPLETED, CANCELLED]
+OPEN_STATUSES = [PLACED, PREPARING, BAKING, DELIVERING]
+
+# 새 상태 -> 그 상태로 바뀔 수 있는 이전 상태
+ALLOWED_FROM = {
+    PREPARING: [PLACED],
+    BAKING: [PREPARING],
+    DELIVERING: [BAKING],
+    COMPLETED: [DELIVERING],
+    CANCELLED: [PLACED, PREPARING],
+}
+
+
+def change_status(order_id, new_status):
+    """(status, body) — 200 변경됨, 400 알 수 없는 상태, 404 주문 없음, 409 허용되지 않는 전이"""
+    if new_status not in ALLOWED_FROM:
+        return 400, {"detail": "invalid status"}
+    now = timezone.now()
+    with transaction.atomic():
+        updated = Order.objects.filter(order_id=order_id, status__in=ALLOWED_FROM[new_status]).update(
+            status=new_status, status_updated_at=now
+        )
+        order = Order.objects.filter(order_id=order_id).values("member_id", "status").first()
+        if order is None:
+            return 404, {"detail": "order not found"}
+        if not updated:
+            return 409, {"detail": f"cannot change status from {order['status']} to {new_status}"}
+        record_order_status_changed(order_id, order["member_id"], new_status, now)
+    return 200, {"order_id": order_id, "status": new_status, "status_updated_at": now}
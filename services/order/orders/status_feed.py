@@ -0,0 +1,130 @@
+"""
+주문 상태 SSE 피드의 워커 내 공유 구독.
+
+클라이언트마다 DB를 조회하지 않는다. 워커(프로세스)당 StatusHub 하나가 구독자가 있는 동안에만 스레드 하나로
+ORDER_STATUS_POLL_SECONDS마다 orders.status_updated_at 인덱스를 조회해 변경분을 가져오고, 회원별로
+구독자의 asyncio 큐에 나눠 넣는다. 커밋이 늦게 보이는 행을 놓치지 않도록 직전 조회 시점보다
+ORDER_STATUS_FEED_OVERLAP_SECONDS 앞부터 다시 읽고, 이미 보낸 (주문, 변경 시각)은 건너뛴다.
+"""
+import asyncio
+import datetime
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from .models import Order
+from .status import OPEN_STATUSES
+
+logger = logging.getLogger(__name__)
+
+EVENT_FIELDS = ["order_id", "bran_id", "status", "status_updated_at"]
+
+
+class Subscription:
+    def __init__(self, member_id, loop):
+        self.member_id = member_id
+        self.loop = loop
+        self.queue = asyncio.Queue()
+
+    def offer(self, event):
+        """허브 스레드에서 호출: 구독자의 이벤트 루프에서 큐에 넣는다."""
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+
+class StatusHub:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._thread = None
+        self._cursor = None
+        self._seen = {}
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(self, member_id):
+        """현재 이벤트 루프에서 member_id의 상태 변경을 받을 구독을 만든다."""
+        subscription = Subscription(member_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[member_id].add(subscription)
+            if self._thread is None:
+                self._start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subs = self._subscribers.get(subscription.member_id)
+            if subs is not None:
+                subs.discard(subscription)
+                if not subs:
+                    del self._subscribers[subscription.member_id]
+
+    def _start(self):
+        self._cursor = timezone.now()
+        self._thread = threading.Thread(target=self._run, name="order-status-feed", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while True:
+                with self._lock:
+                    if not self._subscribers:
+                        # 마지막 구독자가 나가면 조회를 멈춘다. 다음 구독이 스레드를 다시 시작한다.
+                        self._thread = None
+                        return
+                try:
+                    self.publish(self.poll())
+                except Exception:
+                    logger.exception("order status poll failed")
+                    connections["default"].close()
+                time.sleep(settings.ORDER_STATUS_POLL_SECONDS)
+        finally:
+            connections.close_all()
+
+    def poll(self):
+        """직전 조회 이후의 상태 변경 목록 (status_updated_at 순)"""
+        since = self._cursor - datetime.timedelta(seconds=settings.ORDER_STATUS_FEED_OVERLAP_SECONDS)
+        rows = list(
+            Order.objects.filter(status_updated_at__gt=since)
+            .order_by("status_updated_at")
+            .values("member_id", *EVENT_FIELDS)
+        )
+        self._seen = {key: at for key, at in self._seen.items() if at > since}
+        changes = []
+        for row in rows:
+            key = (row["order_id"], row["status"])
+            if self._seen.get(key) == row["status_updated_at"]:
+                continue
+            self._seen[key] = row["status_updated_at"]
+            changes.append(row)
+        if rows:
+            self._cursor = max(self._cursor, rows[-1]["status_updated_at"])
+        return changes
+
+    def publish(self, changes):
+        """변경분을 구독 중인 회원에게만 전달"""
+        with self._lock:
+            targets = [(row, list(self._subscribers.get(row["member_id"], ()))) for row in changes]
+        for row, subs in targets:
+            event = {field: row[field] for field in EVENT_FIELDS}
+            for subscription in subs:
+                subscription.offer(event)
+
+
+hub = StatusHub()
+
+
+def open_orders(member_id):
+    """연결 직후 보내는 회원의 진행 중 주문 상태"""
+    return list(
+        Order.objects.filter(member_id=member_id, status__in=OPEN_STATUSES)
+        .order_by("order_id")
+        .values(*EVENT_FIELDS)
+    )
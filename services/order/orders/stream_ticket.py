@@ -0,0 +1,45 @@
+"""
+주문 상태 SSE 연결용 1회용 티켓.
+
+EventSource는 Authorization 헤더를 보낼 수 없으므로, 클라이언트는 access token으로
+/api/order/status/stream/ticket/을 호출해 짧게 유효한(ORDER_STATUS_TICKET_TTL_SECONDS) 티켓을 받고
+?ticket=으로 연결한다. 연결할 때 티켓 행을 지우며, 지운 요청 하나만 성공하므로 URL이 로그에 남아도 재사용할 수 없다.
+"""
+import datetime
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import StreamTicket
+
+
+def token_hash(raw) -> str:
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def issue(member_id, now=None):
+    """새 티켓 원문을 반환한다. 만료된 티켓은 이때 정리한다."""
+    now = now or timezone.now()
+    StreamTicket.objects.filter(expires_at__lte=now).delete()
+    raw = secrets.token_urlsafe(32)
+    StreamTicket.objects.create(
+        token_hash=token_hash(raw),
+        member_id=member_id,
+        expires_at=now + datetime.timedelta(seconds=settings.ORDER_STATUS_TICKET_TTL_SECONDS),
+    )
+    return raw
+
+
+def consume(raw):
+    """티켓을 소모하고 member_id를 반환한다. 없거나 만료됐거나 이미 쓴 티켓이면 None"""
+    if not raw:
+        return None
+    record = StreamTicket.objects.filter(token_hash=token_hash(raw), expires_at__gt=timezone.now()).first()
+    if record is None:
+        return None
+    # 같은 티켓으로 동시에 들어온 요청 중 행을 지운 하나만 통과한다.
+    if StreamTicket.objects.filter(token_hash=record.token_hash).delete()[0] != 1:
+        return None
+    return record.member_id
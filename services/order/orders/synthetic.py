@@ -0,0 +1,156 @@
+"""
+용량 테스트용 합성 데이터 생성기.
+
+회원/지점/피자는 부모 프로세스에서 만들고, 주문은 고정 크기 블록으로 나눠 여러 워커 프로세스가
+각자 PostgreSQL 연결로 COPY 한다. 블록마다 (seed, 블록 번호)로 난수를 초기화하므로 워커 수와 무관하게
+같은 seed면 같은 데이터가 만들어진다.
+
+이 모듈은 워커에서 import 되므로 Django 모델을 import 하지 않는다.
+"""
+import bisect
+import csv
+import datetime
+import io
+import itertools
+import random
+
+import psycopg2
+
+SIZES = [("S", 0.75), ("M", 1.0), ("L", 1.3)]
+# 장바구니 크기(라인 수) 분포와 라인당 수량 분포
+CART_SIZES = [(1, 45), (2, 30), (3, 15), (4, 7), (5, 2), (6, 1)]
+LINE_QUANTITIES = [(1, 85), (2, 12), (3, 3)]
+# 시간대: (가중치, 평균 분, 표준편차 분) — 점심/저녁 피크 + 영업시간 전체 배경
+TIME_OF_DAY = [(40, 12 * 60 + 30, 45), (45, 18 * 60 + 45, 60), (15, None, None)]
+_TIME_CUMULATIVE = list(itertools.accumulate(w for w, _, _ in TIME_OF_DAY))
+OPEN_MINUTE, CLOSE_MINUTE = 10 * 60, 23 * 60
+WEEKEND_WEIGHT = 1.3
+
+
+def member_id(i):
+    return f"synth_{i:08d}"
+
+
+def branch_id(i):
+    return f"SYN_BR{i:04d}"
+
+
+def pizza_type_id(i):
+    return f"SYN_PT{i:03d}"
+
+
+def zipf_cumulative(n, s):
+    """순위 k(1..n)의 가중치 1/k^s 누적합"""
+    return list(itertools.accumulate(1.0 / (k ** s) for k in range(1, n + 1)))
+
+
+def weighted_choice(rng, cumulative):
+    return bisect.bisect_left(cumulative, rng.random() * cumulative[-1])
+
+
+def make_pizzas(seed, n_types):
+    """[(pizza_id, pizza_type_id, size, price)] — 가격은 1,000원 단위"""
+    rng = random.Random(f"{seed}:pizzas")
+    pizzas = []
+    for t in range(n_types):
+        base = rng.randrange(15, 30) * 1000
+        for size, factor in SIZES:
+            pizzas.append((f"{pizza_type_id(t)}_{size}", pizza_type_id(t), size, round(base * factor, -3)))
+    rng.shuffle(pizzas)  # 인기 순위(Zipf)를 타입/사이즈와 무관하게
+    return pizzas
+
+
+def branch_cumulative(seed, n_branches):
+    """지점별 인기(로그정규)의 누적합"""
+    rng = random.Random(f"{seed}:branches")
+    return list(itertools.accumulate(rng.lognormvariate(0, 0.6) for _ in range(n_branches)))
+
+
+def day_cumulative(start_date, days):
+    weights = [
+        WEEKEND_WEIGHT if (start_date + datetime.timedelta(days=d)).weekday() >= 5 else 1.0
+        for d in range(days)
+    ]
+    return list(itertools.accumulate(weights))
+
+
+def _table_choice(rng, table):
+    total = sum(w for _, w in table)
+    pick = rng.random() * total
+    for value, weight in table:
+        pick -= weight
+        if pick < 0:
+            return value
+    return table[-1][0]
+
+
+def _minute_of_day(rng):
+    _, mean, sd = TIME_OF_DAY[weighted_choice(rng, _TIME_CUMULATIVE)]
+    if mean is None:
+        return rng.randrange(OPEN_MINUTE, CLOSE_MINUTE)
+    return int(min(max(rng.gauss(mean, sd), OPEN_MINUTE), CLOSE_MINUTE - 1))
+
+
+def generate_block(config, block):
+    """
+    블록 하나의 (orders_csv, details_csv, n_orders, n_details)를 만든다.
+
+    order_id는 config["first_order_id"] + 블록 내 순번으로 미리 정해 상세와 연결한다.
+    """
+    rng = random.Random(f"{config['seed']}:orders:{block}")
+    first = block * config["block_size"]
+    count = min(config["block_size"], config["orders"] - first)
+    start_date = datetime.date.fromisoformat(config["start_date"])
+    pizzas = make_pizzas(config["seed"], config["pizza_types"])
+    member_cum = zipf_cumulative(config["members"], config["member_zipf"])
+    pizza_cum = zipf_cumulative(len(pizzas), config["pizza_zipf"])
+    bran_cum = branch_cumulative(config["seed"], config["branches"])
+    day_cum = day_cumulative(start_date, config["days"])
+
+    orders_buf, details_buf = io.StringIO(), io.StringIO()
+    orders_out, details_out = csv.writer(orders_buf), csv.writer(details_buf)
+    n_details = 0
+    for i in range(count):
+        order_id = config["first_order_id"] + first + i
+        day = start_date + datetime.timedelta(days=weighted_choice(rng, day_cum))
+        minute = _minute_of_day(rng)
+        total = 0.0
+        for _ in range(_table_choice(rng, CART_SIZES)):
+            pizza_id, _, _, price = pizzas[weighted_choice(rng, pizza_cum)]
+            quantity = _table_choice(rng, LINE_QUANTITIES)
+            details_out.writerow([order_id, pizza_id, quantity, price, price * quantity, day.isoformat()])
+            total += price * quantity
+            n_details += 1
+        orders_out.writerow([
+            order_id,
+            member_id(weighted_choice(rng, member_cum)),
+            branch_id(weighted_choice(rng, bran_cum)),
+            day.isoformat(),
+            f"{minute // 60:02d}:{minute % 60:02d}:{rng.randrange(60):02d}",
+            total,
+            "completed",
+            day.isoformat(),
+        ])
+    orders_buf.seek(0)
+    details_buf.seek(0)
+    return orders_buf, details_buf, count, n_details
+
+
+# 과거 주문이므로 status는 completed, status_updated_at은 NULL(상태 피드 대상 아님)
+ORDER_COPY = (
+    "COPY orders (order_id, member_id, bran_id, date, time, total, status, order_day) FROM STDIN WITH (FORMAT csv)"
+)
+DETAIL_COPY = (
+    "COPY order_detail (order_id, pizza_id, quantity, unit_price, line_total, order_day) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+
+def copy_block(db_params, config, block):
+    """워커 진입점: 블록을 생성해 자체 연결로 COPY 후 커밋. (주문 수, 상세 수) 반환"""
+    orders_buf, details_buf, n_orders, n_details = generate_block(config, block)
+    with psycopg2.connect(**db_params) as conn, conn.cursor() as cursor:
+        cursor.copy_expert(ORDER_COPY, orders_buf)
+        cursor.copy_expert(DETAIL_COPY, details_buf)
+    conn.close()
+    return n_orders, n_details
@@ -1,14 +1,23 @@
+import asyncio
+import csv
+import io
+import json
 import os
 import sys
 import jwt
+from unittest import skipUnless
 from datetime import datetime, timedelta
-from django.test import TestCase
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
-from django.db import transaction
+from django.db import connection, transaction
 from unittest.mock import patch, MagicMock
 from orders.models import Branch, Order, OrderDetail
+from orders import branches, synthetic
+from order_service import db_router
 from django.conf import settings
 
 # Add parent directory to path for imports
@@ -24,6 +33,17 @@ def create_test_jwt_token(member_id="test_user"):
     return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 
+def stream_chunks(response):
+    """비동기 스트리밍 응답의 청크 목록 (청크는 테스트 스레드의 DB 연결에서 만들어진다)"""
+    async def collect():
+        return [chunk async for chunk in response.streaming_content]
+    return async_to_sync(collect)()
+
+
+def stream_body(response):
+    return b"".join(stream_chunks(response))
+
+
 class OrderModelTest(TestCase):
     """주문 모델 테스트"""
 
@@ -117,6 +137,11 @@ class OrderAPITest(APITestCase):
             self.assertIn('bran_id', branch)
             self.assertIn('bran_nm', branch)
 
+    def test_branch_list_is_read_only(self):
+        """지점 목록은 조회 전용(LightView) 테스트"""
+        self.assertEqual(self.client.head(self.branch_url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.post(self.branch_url, {}).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
     def test_empty_branches_database(self):
         """빈 데이터베이스에서 지점 조회 테스트"""
         # 모든 지점 삭제
@@ -127,6 +152,66 @@ class OrderAPITest(APITestCase):
         data = response.json()
         self.assertEqual(len(data), 0)
 
+    def test_branch_list_etag(self):
+        """지점 목록 ETag / If-None-Match 304 테스트"""
+        response = self.client.get(self.branch_url)
+        etag = response["ETag"]
+        self.assertTrue(etag)
+
+        response = self.client.get(self.branch_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # 지점이 바뀌면 ETag도 바뀐다
+        Branch.objects.create(bran_id="BRANCH003", bran_nm="잠실점")
+        response = self.client.get(self.branch_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 3)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @patch('orders.views.requests.post')
+    def test_create_order_unknown_branch(self, mock_post):
+        """없는 branchId는 메뉴 조회 전에 거절"""
+        token = create_test_jwt_token("test_user")
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        data = {"branchId": "NO_SUCH_BRANCH", "lines": [{"name": "페페로니", "size": "L", "quantity": 1}]}
+
+        response = self.client.post(self.order_url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_post.assert_not_called()
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_branch_registry_reloads_on_miss(self):
+        """시그널 없이 추가된 지점도 조회 실패 시 재적재로 확인"""
+        self.assertFalse(branches.is_valid_branch("BRANCH009"))
+        Branch.objects.bulk_create([Branch(bran_id="BRANCH009", bran_nm="부산점")])
+        with self.settings(BRANCH_REGISTRY_MISS_RELOAD_SECONDS=0):
+            self.assertTrue(branches.is_valid_branch("BRANCH009"))
+
+    def test_branch_registry_serves_stale_while_revalidating(self):
+        """갱신 주기가 지난 레지스트리는 쿼리 없이 반환하고 백그라운드 갱신을 건다"""
+        snapshot = branches.get_snapshot()
+        snapshot.loaded_at -= settings.BRANCH_REGISTRY_REFRESH_SECONDS + 1
+        with patch.object(branches._flight, "refresh") as refresh, self.assertNumQueries(0):
+            self.assertIs(branches.get_snapshot(), snapshot)
+        refresh.assert_called_once_with(branches._KEY, branches._refresh)
+
+        # 명시한 max_age보다 오래됐으면 요청 안에서 다시 읽는다
+        with self.assertNumQueries(1):
+            self.assertIsNot(branches.get_snapshot(max_age=1), snapshot)
+
+    def test_branch_registry_async_entry_point(self):
+        """비동기 호출자는 aget_snapshot()으로 같은 스냅샷/같은 single-flight를 쓴다"""
+        snapshot = branches.get_snapshot()
+        with self.assertNumQueries(0):
+            self.assertIs(async_to_sync(branches.aget_snapshot)(), snapshot)
+
+        branches.invalidate()
+        fresh = MagicMock()
+        with patch.object(branches, "_refresh", return_value=fresh) as refresh:
+            self.assertIs(async_to_sync(branches.aget_snapshot)(), fresh)
+        refresh.assert_called_once_with()
+
     @patch('orders.views.requests.post')
     def test_create_order_success(self, mock_post):
         """주문 생성 성공 테스트"""
@@ -241,6 +326,1155 @@ class OrderAPITest(APITestCase):
         data = response.json()
         self.assertEqual(len(data), 0)
 
+    def test_get_my_orders_date_range(self):
+        """from/to로 주문일 범위를 좁히고 잘못된 날짜는 400"""
+        token = create_test_jwt_token("test_user")
+        for order_id, date in [(1, "2024-01-31"), (2, "2024-02-01"), (3, "2024-03-01")]:
+            order = Order.objects.create(
+                order_id=order_id, member_id="test_user", bran_id="BRANCH001", date=date, time="12:00:00",
+            )
+            OrderDetail.objects.create(order=order, pizza_id="PIZZA_A", quantity=1)
+
+        response = self.client.get(
+            self.myorder_url, {"from": "2024-02-01", "to": "2024-02-29"}, HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        self.assertEqual([item["order_id"] for item in response.json()], [2])
+
+        response = self.client.get(
+            self.myorder_url, {"from": "2024-02-01", "stream": "1"}, HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        self.assertEqual([item["order_id"] for item in json.loads(stream_body(response))], [2, 3])
+
+        response = self.client.get(self.myorder_url, {"to": "2024-13-01"}, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_my_orders_streaming(self):
+        """stream=1은 일반 응답과 같은 배열을 조각으로 보낸다"""
+        from orders import export
+
+        token = create_test_jwt_token("test_user")
+        for order_id in (1, 2):
+            order = Order.objects.create(
+                order_id=order_id, member_id="test_user", bran_id="BRANCH001",
+                date="2024-01-01", time="12:00:00", total=50000,
+            )
+            for pizza_id in ("PIZZA_A", "PIZZA_B"):
+                OrderDetail.objects.create(
+                    order=order, pizza_id=pizza_id, quantity=2, unit_price=25000, line_total=50000,
+                )
+
+        expected = self.client.get(self.myorder_url, HTTP_AUTHORIZATION=f'Bearer {token}').json()
+        with patch.object(export, "_FLUSH_BYTES", 1):
+            response = self.client.get(self.myorder_url + "?stream=1", HTTP_AUTHORIZATION=f'Bearer {token}')
+            chunks = stream_chunks(response)
+
+        self.assertTrue(response.is_async)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(json.loads(b"".join(chunks)), expected)
+
+        # 빈 내역도 올바른 배열
+        empty = self.client.get(self.myorder_url + "?stream=1", HTTP_AUTHORIZATION=f'Bearer {create_test_jwt_token("nobody")}')
+        self.assertEqual(stream_body(empty), b"[]")
+
+
+class IdempotencyKeyTest(APITestCase):
+    """주문 생성 Idempotency-Key 테스트"""
+
+    def setUp(self):
+        """테스트 데이터 설정"""
+        self.branch = Branch.objects.create(bran_id="BRANCH001", bran_nm="강남점")
+        self.order_url = reverse('order-list')
+        self.payload = {
+            "branchId": "BRANCH001",
+            "lines": [{"name": "페페로니", "size": "L", "quantity": 2}],
+        }
+        token = create_test_jwt_token("idem_user")
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def _mock_menu(self, mock_post):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"pizza_id": "PIZZA_001_L"}
+        mock_post.return_value = mock_response
+
+    @patch('orders.views.requests.post')
+    def test_retry_replays_stored_response(self, mock_post):
+        """같은 키로 재시도하면 저장된 응답을 그대로 반환하는지 테스트"""
+        self._mock_menu(mock_post)
+
+        first = self.client.post(self.order_url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY="k-1")
+        second = self.client.post(self.order_url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY="k-1")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(Order.objects.filter(member_id="idem_user").count(), 1)
+
+    @patch('orders.views.requests.post')
+    def test_key_reused_with_different_payload(self, mock_post):
+        """같은 키를 다른 요청 본문에 재사용하면 422 테스트"""
+        self._mock_menu(mock_post)
+        self.client.post(self.order_url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY="k-2")
+
+        self.payload["lines"][0]["quantity"] = 3
+        response = self.client.post(self.order_url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY="k-2")
+
+        self.assertEqual(response.status_code, 422)
+
+    @patch('orders.views.requests.post')
+    def test_server_error_is_not_stored(self, mock_post):
+        """5xx 응답은 저장하지 않아 재시도 시 다시 처리되는지 테스트"""
+        import requests
+
+        mock_post.side_effect = requests.ConnectionError()
+        failed = self.client.post(self.order_url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY="k-3")
+        self.assertEqual(failed.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        mock_post.side_effect = None
+        self._mock_menu(mock_post)
+        retried = self.client.post(self.order_url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY="k-3")
+        self.assertEqual(retried.status_code, status.HTTP_201_CREATED)
+
+    def _pending(self, key, locked_until):
+        """처리 중(응답 없음)인 키 행"""
+        from orders.idempotency import request_fingerprint
+        from orders.models import IdempotencyKey
+
+        return IdempotencyKey.objects.create(
+            member_id="idem_user", key=key, request_hash=request_fingerprint(self.payload),
+            locked_until=locked_until, expires_at=locked_until + timedelta(days=1),
+        )
+
+    def test_concurrent_duplicate_waits_and_replays(self):
+        """처리 중인 같은 키 요청은 응답이 저장될 때까지 기다렸다가 재생하는지 테스트"""
+        from django.utils import timezone
+        from orders.idempotency import run_idempotent
+
+        record = self._pending("k-4", timezone.now() + timedelta(seconds=30))
+        handler = MagicMock()
+
+        def first_request_commits(_):
+            type(record).objects.filter(id=record.id).update(status_code=201, response_body={"order_id": 7})
+
+        with patch("orders.idempotency.time.sleep", side_effect=first_request_commits) as sleep:
+            result = run_idempotent("idem_user", "k-4", self.payload, handler)
+
+        self.assertEqual(result, (201, {"order_id": 7}, True))
+        self.assertEqual(sleep.call_count, 1)
+        handler.assert_not_called()
+
+    @override_settings(IDEMPOTENCY_WAIT_SECONDS=0.1)
+    def test_wait_is_bounded(self):
+        from django.utils import timezone
+        from orders.idempotency import run_idempotent
+
+        self._pending("k-5", timezone.now() + timedelta(seconds=30))
+        self.assertEqual(run_idempotent("idem_user", "k-5", self.payload, MagicMock())[0], status.HTTP_409_CONFLICT)
+
+    @patch('orders.views.requests.post')
+    def test_expired_claim_is_taken_over(self, mock_post):
+        """응답 없이 선점 시간이 지난 키(처리 중 프로세스 종료)는 다음 요청이 이어받아 주문을 만드는지 테스트"""
+        from django.utils import timezone
+
+        self._mock_menu(mock_post)
+        self._pending("k-6", timezone.now() - timedelta(seconds=1))
+
+        response = self.client.post(self.order_url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY="k-6")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.filter(member_id="idem_user").count(), 1)
+
+    def test_late_owner_rolls_back_and_replays(self):
+        """선점 시간이 지나 다른 요청이 이어받아 끝냈으면 늦은 실행의 주문은 롤백되고 그 응답을 재생하는지 테스트"""
+        from django.utils import timezone
+        from orders.idempotency import run_idempotent
+        from orders.models import IdempotencyKey
+
+        def handler(save):
+            IdempotencyKey.objects.filter(key="k-7").update(
+                locked_until=timezone.now() + timedelta(seconds=30), status_code=201, response_body={"order_id": 99},
+            )
+            with transaction.atomic():
+                Order.objects.create(member_id="idem_user", bran_id="BRANCH001", date="2024-01-01", time="12:00:00")
+                save(201, {"order_id": 1})
+            return 201, {"order_id": 1}
+
+        result = run_idempotent("idem_user", "k-7", self.payload, handler)
+
+        self.assertEqual(result, (201, {"order_id": 99}, True))
+        self.assertFalse(Order.objects.filter(member_id="idem_user").exists())
+
+    @patch('orders.views.requests.post')
+    def test_response_committed_with_order(self, mock_post):
+        """주문 커밋 직후 프로세스가 죽어도 응답이 이미 저장되어 재시도가 만든 주문을 받는지 테스트"""
+        from orders.idempotency import run_idempotent
+        from orders.views import _create_order
+
+        self._mock_menu(mock_post)
+
+        def dies_after_commit(save):
+            _create_order("idem_user", self.payload, save)
+            raise SystemExit()
+
+        with self.assertRaises(SystemExit):
+            run_idempotent("idem_user", "k-8", self.payload, dies_after_commit)
+
+        retried = self.client.post(self.order_url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY="k-8")
+        self.assertEqual(retried.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retried["Idempotent-Replayed"], "true")
+        self.assertEqual(retried.json()["order_id"], Order.objects.get(member_id="idem_user").order_id)
+
+
+class MemorySink:
+    """발행한 메시지를 메모리에 모으는 테스트용 싱크"""
+
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, messages):
+        self.messages.extend(messages)
+
+
+class OutboxTest(APITestCase):
+    """주문 생성 outbox 이벤트 및 릴레이 테스트"""
+
+    def setUp(self):
+        """테스트 데이터 설정"""
+        Branch.objects.create(bran_id="BRANCH001", bran_nm="강남점")
+        token = create_test_jwt_token("outbox_user")
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    @patch('orders.views.requests.post')
+    def _create_order(self, mock_post):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"pizza_id": "PIZZA_001_L"}
+        mock_post.return_value = mock_response
+        payload = {"branchId": "BRANCH001", "lines": [{"name": "페페로니", "size": "L", "quantity": 2}]}
+        return self.client.post(reverse('order-list'), payload, format='json')
+
+    def test_order_created_event_recorded(self):
+        """주문 생성 시 OrderCreated 이벤트가 같이 기록되는지 테스트"""
+        from orders.models import OutboxEvent
+
+        response = self._create_order()
+
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.event_type, "OrderCreated")
+        self.assertEqual(event.aggregate_id, str(response.json()["order_id"]))
+        self.assertEqual(event.payload["items"][0]["pizza_id"], "PIZZA_001_L")
+        self.assertEqual(event.payload["items"][0]["quantity"], 2)
+
+    def test_relay_publishes_once(self):
+        """릴레이가 배치 발행 후 published_at을 채워 같은 이벤트를 다시 내지 않는지 테스트"""
+        from orders.models import OutboxEvent
+        from orders.outbox import relay_batch
+
+        self._create_order()
+        self._create_order()
+        sink = MemorySink()
+
+        self.assertEqual(relay_batch(sink, batch_size=1), 1)
+        self.assertEqual(relay_batch(sink, batch_size=10), 1)
+        self.assertEqual(relay_batch(sink), 0)
+
+        event_ids = [m["event_id"] for m in sink.messages]
+        self.assertEqual(len(set(event_ids)), 2)
+        self.assertFalse(OutboxEvent.objects.filter(published_at__isnull=True).exists())
+
+    def test_relay_does_not_skip_lower_event_ids(self):
+        """더 큰 event_id가 먼저 발행돼도 늦게 커밋된 작은 event_id를 건너뛰지 않는지 테스트"""
+        from django.utils import timezone
+        from orders.models import OutboxEvent
+        from orders.outbox import relay_batch
+
+        self._create_order()
+        self._create_order()
+        first, second = OutboxEvent.objects.order_by("event_id")
+        OutboxEvent.objects.filter(event_id=second.event_id).update(published_at=timezone.now())
+        sink = MemorySink()
+
+        self.assertEqual(relay_batch(sink), 1)
+        self.assertEqual(sink.messages[0]["event_id"], first.event_id)
+
+
+@override_settings(INTERNAL_API_TOKEN="internal-test-token")
+class OrderStatusTest(APITestCase):
+    """주문 상태 변경 / SSE 상태 피드 테스트"""
+
+    def setUp(self):
+        from orders.status_feed import StatusHub
+
+        Branch.objects.create(bran_id="BRANCH001", bran_nm="강남점")
+        self.order = Order.objects.create(
+            member_id="feed_user", bran_id="BRANCH001", date="2024-01-01", time="12:00:00", total=25000.0,
+        )
+        self.update_url = reverse('order-status-update')
+        self.client.credentials(HTTP_X_INTERNAL_TOKEN="internal-test-token")
+        self.hub = StatusHub()
+
+    def test_status_update_requires_internal_token(self):
+        """내부 토큰 없이/틀린 토큰으로는 상태를 바꿀 수 없다"""
+        payload = {"order_id": self.order.order_id, "status": "preparing"}
+        self.client.credentials()
+        self.assertEqual(self.client.post(self.update_url, payload, format='json').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_X_INTERNAL_TOKEN="wrong")
+        self.assertEqual(self.client.post(self.update_url, payload, format='json').status_code, status.HTTP_403_FORBIDDEN)
+        with self.settings(INTERNAL_API_TOKEN=""):
+            self.assertEqual(self.client.post(self.update_url, payload, format='json').status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Order.objects.get().status, "placed")
+
+    def test_status_transitions(self):
+        """정해진 순서로만 진행하고 변경은 outbox에 기록"""
+        from orders.models import OutboxEvent
+
+        self.assertEqual(self.order.status, "placed")
+        response = self.client.post(self.update_url, {"order_id": self.order.order_id, "status": "preparing"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Order.objects.get().status, "preparing")
+        self.assertEqual(OutboxEvent.objects.get().event_type, "OrderStatusChanged")
+
+        response = self.client.post(self.update_url, {"order_id": self.order.order_id, "status": "completed"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        response = self.client.post(self.update_url, {"order_id": 999, "status": "baking"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.post(self.update_url, {"order_id": self.order.order_id, "status": "eaten"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_hub_poll_returns_each_change_once(self):
+        """공유 구독은 겹침 구간을 다시 읽어도 같은 변경을 한 번만 낸다"""
+        from orders.status import change_status
+
+        self.hub._cursor = self.order.status_updated_at - timedelta(seconds=1)
+        self.assertEqual([row["status"] for row in self.hub.poll()], ["placed"])
+        self.assertEqual(self.hub.poll(), [])
+
+        change_status(self.order.order_id, "preparing")
+        changes = self.hub.poll()
+        self.assertEqual([(row["order_id"], row["status"]) for row in changes], [(self.order.order_id, "preparing")])
+
+    async def test_stream_sends_snapshot_then_status_events(self):
+        """연결 시 진행 중 주문 snapshot, 이후 공유 구독이 전달한 변경만 push"""
+        from asgiref.sync import sync_to_async
+        from orders import stream_ticket, views
+
+        ticket = await sync_to_async(stream_ticket.issue)("feed_user")
+        with patch.object(views, "status_hub", self.hub), patch.object(self.hub, "_start"):
+            response = await self.async_client.get(reverse('order-status-stream'), {"ticket": ticket})
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            chunks = aiter(response.streaming_content)
+            self.assertTrue((await anext(chunks)).startswith(b"retry:"))
+            snapshot = (await anext(chunks)).decode()
+            self.assertIn("event: snapshot", snapshot)
+            self.assertIn('"status":"placed"', snapshot.replace(" ", ""))
+            self.assertEqual(self.hub.subscriber_count, 1)
+
+            changed = {"order_id": self.order.order_id, "bran_id": "BRANCH001", "status": "baking", "status_updated_at": None}
+            self.hub.publish([{**changed, "member_id": "other_user", "order_id": 0}, {**changed, "member_id": "feed_user"}])
+            event = (await anext(chunks)).decode()
+            self.assertIn(f"id: {self.order.order_id}:baking", event)
+            self.assertIn("event: status", event)
+
+            # 클라이언트가 끊으면(ASGI 서버가 전송 태스크를 취소) 구독이 정리된다
+            pending = asyncio.ensure_future(anext(chunks))
+            await asyncio.sleep(0.05)
+            pending.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await pending
+        self.assertEqual(self.hub.subscriber_count, 0)
+
+    def test_stream_requires_auth(self):
+        self.assertEqual(self.client.get(reverse('order-status-stream')).status_code, status.HTTP_401_UNAUTHORIZED)
+        # access token을 쿼리로 받지 않는다 (로그에 남는다)
+        token = create_test_jwt_token("feed_user")
+        response = self.client.get(reverse('order-status-stream'), {"access_token": token})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_stream_ticket_is_single_use(self):
+        """SSE 티켓은 access token으로 발급받고 한 번만 쓸 수 있다"""
+        from django.utils import timezone
+        from orders import stream_ticket
+
+        ticket_url = reverse('order-status-stream-ticket')
+        self.client.credentials()
+        self.assertEqual(self.client.post(ticket_url).status_code, status.HTTP_401_UNAUTHORIZED)
+        token = create_test_jwt_token("feed_user")
+        response = self.client.post(ticket_url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        ticket = response.json()["ticket"]
+
+        self.assertEqual(stream_ticket.consume(ticket), "feed_user")
+        self.assertIsNone(stream_ticket.consume(ticket))
+        self.assertIsNone(stream_ticket.consume("not-a-ticket"))
+
+        expired = stream_ticket.issue("feed_user", now=timezone.now() - timedelta(minutes=5))
+        self.assertIsNone(stream_ticket.consume(expired))
+
+
+class SalesRollupTest(APITestCase):
+    """판매 롤업 증분 갱신/재계산/리포트 테스트"""
+
+    def setUp(self):
+        """테스트 데이터 설정"""
+        Branch.objects.create(bran_id="BRANCH001", bran_nm="강남점")
+        token = create_test_jwt_token("rollup_user")
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    @patch('orders.views.requests.post')
+    def _create_order(self, quantity, mock_post):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"pizza_id": "PIZZA_001_L", "price": 25000.0}
+        mock_post.return_value = mock_response
+        payload = {"branchId": "BRANCH001", "lines": [{"name": "페페로니", "size": "L", "quantity": quantity}]}
+        return self.client.post(reverse('order-list'), payload, format='json')
+
+    def test_order_creation_updates_rollup(self):
+        """주문 생성 시 롤업이 증분 갱신되는지 테스트"""
+        from orders.models import SalesDaily
+
+        self._create_order(2)
+        self._create_order(1)
+
+        row = SalesDaily.objects.get(bran_id="BRANCH001", pizza_id="PIZZA_001_L")
+        self.assertEqual(row.quantity, 3)
+        self.assertEqual(row.revenue, 75000.0)
+
+    def test_sales_report(self):
+        """리포트 API 조회 테스트"""
+        self._create_order(2)
+        today = datetime.now().date().isoformat()
+
+        params = {"bran_id": "BRANCH001", "from": today, "to": today}
+        internal = {"HTTP_X_INTERNAL_TOKEN": "internal-test-token"}
+
+        with self.settings(INTERNAL_API_TOKEN="internal-test-token"):
+            response = self.client.get(reverse('sales-report'), params, **internal)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json(), [{"day": today, "pizza_id": "PIZZA_001_L", "quantity": 2, "revenue": 50000.0}])
+            self.assertEqual(self.client.get(reverse('sales-report'), **internal).status_code, status.HTTP_400_BAD_REQUEST)
+
+            # 회원 토큰만으로는 조회할 수 없다
+            self.assertEqual(self.client.get(reverse('sales-report'), params).status_code, status.HTTP_401_UNAUTHORIZED)
+            response = self.client.get(reverse('sales-report'), params, HTTP_X_INTERNAL_TOKEN="wrong")
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_rebuild_from_order_details(self):
+        """order_detail로부터 롤업 재계산 테스트"""
+        from orders.models import SalesDaily
+        from orders.rollup import rebuild
+
+        self._create_order(2)
+        SalesDaily.objects.all().delete()
+        price_lookup = MagicMock(return_value={"PIZZA_001_L": 20000.0})
+
+        self.assertEqual(rebuild(price_lookup), 1)
+        row = SalesDaily.objects.get()
+        self.assertEqual((row.quantity, row.revenue), (2, 50000.0))
+        price_lookup.assert_not_called()
+
+    def test_rebuild_prices_legacy_rows_from_menu(self):
+        """가격 스냅샷이 없는 이전 주문은 현재 가격으로 환산하는지 테스트"""
+        from orders.models import SalesDaily
+        from orders.rollup import rebuild
+
+        self._create_order(2)
+        OrderDetail.objects.update(unit_price=None, line_total=None)
+
+        self.assertEqual(rebuild(lambda: {"PIZZA_001_L": 20000.0}), 1)
+        self.assertEqual(SalesDaily.objects.get().revenue, 40000.0)
+
+    def test_order_stores_price_snapshot(self):
+        """주문 상세에 단가/금액, 주문에 합계가 저장되는지 테스트"""
+        response = self._create_order(3)
+
+        detail = OrderDetail.objects.get()
+        self.assertEqual((detail.unit_price, detail.line_total), (25000.0, 75000.0))
+        self.assertEqual(detail.order.total, 75000.0)
+        self.assertEqual(response.json()["total"], 75000.0)
+
+
+class BranchPopularityTest(APITestCase):
+    """지점별 인기 피자 (forward decay) 테스트"""
+
+    def setUp(self):
+        from orders import popularity
+
+        self.popularity = popularity
+        popularity.invalidate()
+        self.addCleanup(popularity.invalidate)
+        Branch.objects.create(bran_id="BRANCH001", bran_nm="강남점")
+        self.url = reverse('branch-popular', args=["BRANCH001"])
+
+    def _order(self, date, lines):
+        order = Order.objects.create(member_id="u1", bran_id="BRANCH001", date=date, time="12:00:00")
+        for pizza_id, quantity in lines:
+            OrderDetail.objects.create(order=order, pizza_id=pizza_id, quantity=quantity)
+        day = datetime.fromisoformat(date).date()
+        self.popularity.record_order("BRANCH001", day, [{"pizza_id": p, "quantity": q} for p, q in lines])
+
+    def test_recent_orders_outrank_older_volume(self):
+        """반감기 14일: 8주 전 10판보다 어제 2판이 위"""
+        today = datetime.now().date()
+        self._order((today - timedelta(days=56)).isoformat(), [("OLD_FAVORITE", 10)])
+        self._order((today - timedelta(days=1)).isoformat(), [("NEW_HIT", 2)])
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        items = response.json()["items"]
+        self.assertEqual([item["pizza_id"] for item in items], ["NEW_HIT", "OLD_FAVORITE"])
+        self.assertAlmostEqual(items[1]["score"], 10 / 16, places=2)
+
+        # 목록은 메모리에서 (갱신 주기 전에는 쿼리 없음)
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {"limit": 1})
+
+    def test_rebuild_matches_incremental_counters(self):
+        """한 번의 GROUP BY 재계산 결과가 증분 갱신과 같음"""
+        from orders.models import BranchPopularity
+
+        self._order("2024-03-01", [("PIZZA_A", 3), ("PIZZA_B", 1)])
+        self._order("2024-03-20", [("PIZZA_A", 1), ("PIZZA_B", 4)])
+        incremental = dict(BranchPopularity.objects.values_list("pizza_id", "score"))
+
+        self.assertEqual(self.popularity.rebuild(), 2)
+
+        rebuilt = dict(BranchPopularity.objects.values_list("pizza_id", "score"))
+        self.assertEqual(rebuilt.keys(), incremental.keys())
+        for pizza_id, score in incremental.items():
+            self.assertAlmostEqual(rebuilt[pizza_id], score)
+
+    def test_far_future_orders_do_not_overflow(self):
+        """반감기 1023번(약 39년)이 지난 주문일에도 가중치가 넘치지 않고 순위/재계산이 유지됨"""
+        from orders.models import BranchPopularity
+
+        self._order("2100-01-01", [("PIZZA_A", 3), ("PIZZA_B", 1)])
+        self._order("2100-01-01", [("PIZZA_A", 2)])
+        incremental = dict(BranchPopularity.objects.values_list("pizza_id", "score"))
+
+        ranking = self.popularity.load_snapshot().ranking("BRANCH001", 10, today=datetime(2100, 1, 1).date())
+        self.assertEqual(ranking, [{"pizza_id": "PIZZA_A", "score": 5.0}, {"pizza_id": "PIZZA_B", "score": 1.0}])
+
+        self.assertEqual(self.popularity.rebuild(), 2)
+        rebuilt = dict(BranchPopularity.objects.values_list("pizza_id", "score"))
+        for pizza_id, score in incremental.items():
+            self.assertAlmostEqual(rebuilt[pizza_id], score)
+
+    def test_unknown_branch(self):
+        response = self.client.get(reverse('branch-popular', args=["NO_SUCH_BRANCH"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class OrderQuoteTest(APITestCase):
+    """장바구니 견적 (메모리 가격 캐시) 테스트"""
+
+    MENU = [
+        {"pizza_id": "pep_m", "pizza_type__pizza_nm": "페퍼로니", "size": "M", "price": 15000},
+        {"pizza_id": "pep_l", "pizza_type__pizza_nm": "페퍼로니", "size": "L", "price": 20000},
+        {"pizza_id": "bul_l", "pizza_type__pizza_nm": "불고기", "size": "L", "price": 22000},
+    ]
+
+    def setUp(self):
+        from orders import price_cache
+
+        price_cache.invalidate()
+        self.addCleanup(price_cache.invalidate)
+        Branch.objects.create(bran_id="BRANCH001", bran_nm="강남점")
+        self.url = reverse('order-quote')
+
+    def _menu_response(self):
+        response = MagicMock(status_code=200)
+        response.json.return_value = self.MENU
+        return response
+
+    @patch('orders.menu_client.requests.post')
+    @patch('orders.menu_client.requests.get')
+    def test_quote_from_cached_menu(self, mock_get, mock_post):
+        """한 번 받은 메뉴로 계산하고 DB 쓰기/줄별 메뉴 호출 없음"""
+        mock_get.return_value = self._menu_response()
+        payload = {
+            "branchId": "BRANCH001",
+            "lines": [
+                {"name": "페퍼로니", "size": "L", "quantity": 2},
+                {"name": "불고기", "size": "L", "quantity": "1"},
+            ],
+        }
+
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["total"], 62000)
+        self.assertEqual(
+            [(line["pizza_id"], line["unit_price"], line["line_total"]) for line in data["lines"]],
+            [("pep_l", 20000, 40000), ("bul_l", 22000, 22000)],
+        )
+        self.assertEqual(Order.objects.count(), 0)
+        mock_post.assert_not_called()
+
+        # 두 번째 견적은 menu-service도 DB도 호출하지 않는다
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, {"lines": payload["lines"][:1]}, format='json')
+        self.assertEqual(response.json()["total"], 40000)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('orders.menu_client.requests.get')
+    def test_quote_validation(self, mock_get):
+        mock_get.return_value = self._menu_response()
+        cases = [
+            ({"lines": []}, "invalid payload"),
+            ({"branchId": "NO_SUCH_BRANCH", "lines": [{"name": "불고기", "size": "L", "quantity": 1}]},
+             "invalid branchId"),
+            ({"lines": [{"name": "불고기", "size": "L", "quantity": -1}]}, "invalid quantity"),
+            ({"lines": [{"name": "불고기", "quantity": 1}]}, "missing item details"),
+        ]
+        for payload, detail in cases:
+            response = self.client.post(self.url, payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.json()["detail"], detail)
+
+    @patch('orders.menu_client.requests.get')
+    def test_unknown_pizza_reloads_once(self, mock_get):
+        """캐시에 없는 메뉴는 재적재 간격이 지났을 때만 다시 받아 확인"""
+        from orders import price_cache
+
+        mock_get.return_value = self._menu_response()
+        lines = [{"name": "하와이안", "size": "L", "quantity": 1}]
+
+        response = self.client.post(self.url, {"lines": lines}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(mock_get.call_count, 1)
+
+        self.MENU = self.MENU + [{"pizza_id": "haw_l", "pizza_type__pizza_nm": "하와이안", "size": "L", "price": 21000}]
+        mock_get.return_value = self._menu_response()
+        price_cache._snapshot.loaded_at -= settings.MENU_PRICE_CACHE_MISS_RELOAD_SECONDS
+        response = self.client.post(self.url, {"lines": lines}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["total"], 21000)
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_duplicate_name_size_keeps_first(self):
+        """같은 (이름, 사이즈)가 여럿이면 menu-service와 같이 먼저 나온 피자"""
+        from orders.price_cache import PriceSnapshot
+
+        snapshot = PriceSnapshot(self.MENU + [
+            {"pizza_id": "pep_l_2", "pizza_type__pizza_nm": "페퍼로니", "size": "L", "price": 25000},
+        ])
+        self.assertEqual(snapshot.by_name_size[("페퍼로니", "L")], {"pizza_id": "pep_l", "price": 20000})
+
+    @patch('orders.menu_client.requests.get')
+    def test_menu_service_unavailable(self, mock_get):
+        import requests
+
+        mock_get.side_effect = requests.ConnectionError()
+        response = self.client.post(self.url, {"lines": [{"name": "불고기", "size": "L", "quantity": 1}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+@skipUnless(connection.vendor == "postgresql", "파티셔닝은 PostgreSQL 전용")
+class OrderPartitionTest(TestCase):
+    """orders / order_detail 월별 파티션 전환 테스트"""
+
+    def setUp(self):
+        from orders import partitions
+
+        self.partitions = partitions
+        Branch.objects.create(bran_id="BRANCH001", bran_nm="강남점")
+        for order_id, date in [(1, "2024-01-15"), (2, "2024-01-31"), (3, "2024-02-01"), (4, "2024-03-10")]:
+            order = Order.objects.create(
+                order_id=order_id, member_id="u1", bran_id="BRANCH001", date=date, time="12:00:00",
+            )
+            for pizza_id in ("PIZZA_A", "PIZZA_B"):
+                OrderDetail.objects.create(order=order, pizza_id=pizza_id, quantity=1)
+        # 컬럼 추가 전 코드로 들어온 주문 (order_day 없음)
+        Order.objects.filter(order_id=4).update(order_day=None)
+        OrderDetail.objects.filter(order_id=4).update(order_day=None)
+
+    def test_convert_moves_rows_into_monthly_partitions(self):
+        progress = []
+        moved = self.partitions.convert(batch_size=3, months_ahead=2, progress=lambda *a: progress.append(a))
+
+        self.assertEqual(moved, 4)
+        self.assertEqual(progress, [(3, 4), (4, 4)])
+        self.assertTrue(self.partitions.is_partitioned("orders"))
+        self.assertTrue(self.partitions.is_partitioned("order_detail"))
+        names = [name for name, _, _ in self.partitions.partitions("orders")]
+        self.assertEqual(names[:3], ["orders_202401", "orders_202402", "orders_202403"])
+        self.assertIn(self.partitions.partition_name("orders", datetime.now().date().replace(day=1)), names)
+
+        self.assertEqual(OrderDetail.objects.count(), 8)
+        self.assertEqual(str(Order.objects.get(order_id=4).order_day), "2024-03-10")
+        self.assertFalse(OrderDetail.objects.filter(order_day__isnull=True).exists())
+
+        # 전환 후에도 ORM으로 주문 생성 (시퀀스는 기존 최대값 다음부터)
+        order = Order.objects.create(member_id="u1", bran_id="BRANCH001", date="2024-02-02", time="09:00:00")
+        self.assertEqual(order.order_id, 5)
+        OrderDetail.objects.create(order=order, pizza_id="PIZZA_A", quantity=1)
+
+        # 주문일 조건이 있으면 해당 월 파티션만 읽는다
+        details = self.partitions.filter_days(
+            OrderDetail.objects.filter(order__member_id="u1"), datetime(2024, 2, 1).date(), datetime(2024, 2, 29).date()
+        )
+        self.assertEqual(sorted(details.values_list("order_id", flat=True)), [3, 3, 5])
+        plan = details.explain()
+        self.assertIn("orders_202402", plan)
+        self.assertNotIn("orders_202401", plan)
+        self.assertNotIn("order_detail_202403", plan)
+
+    def test_convert_catches_up_rows_committed_during_copy(self):
+        """복사한 구간 안의 id로 늦게 커밋된 주문과 복사 후 지워진 주문도 전환에 반영되는지 테스트"""
+        Order.objects.filter(order_id=2).delete()
+
+        def progress(done, last):
+            if done == 3:
+                late = Order.objects.create(
+                    order_id=2, member_id="u1", bran_id="BRANCH001", date="2024-01-31", time="12:00:00",
+                )
+                OrderDetail.objects.create(order=late, pizza_id="PIZZA_A", quantity=1)
+                Order.objects.filter(order_id=1).delete()
+
+        self.assertEqual(self.partitions.convert(batch_size=3, months_ahead=0, progress=progress), 4)
+
+        self.assertTrue(self.partitions.is_partitioned("orders"))
+        self.assertEqual(sorted(Order.objects.values_list("order_id", flat=True)), [2, 3, 4])
+        self.assertEqual(OrderDetail.objects.count(), 5)
+
+    def test_convert_aborts_when_row_counts_differ(self):
+        with patch.object(self.partitions, "_catch_up", return_value=0), \
+                patch.object(self.partitions, "_copy_range", return_value=0):
+            with self.assertRaises(self.partitions.PartitionError):
+                self.partitions.convert(batch_size=3, months_ahead=0)
+        self.assertFalse(self.partitions.is_partitioned("orders"))
+        self.assertEqual(Order.objects.count(), 4)
+
+    def test_ensure_range_creates_past_months(self):
+        """과거 날짜 적재 전에 그 기간 파티션을 만들 수 있는지 테스트"""
+        self.partitions.convert(months_ahead=0)
+        created = self.partitions.ensure_range(datetime(2023, 11, 5).date(), datetime(2023, 12, 31).date())
+        self.assertEqual(created, ["orders_202311", "orders_202312", "order_detail_202311", "order_detail_202312"])
+        order = Order.objects.create(member_id="u1", bran_id="BRANCH001", date="2023-11-10", time="12:00:00")
+        OrderDetail.objects.create(order=order, pizza_id="PIZZA_A", quantity=1)
+
+    def test_ensure_partitions_is_idempotent(self):
+        self.assertEqual(self.partitions.ensure_partitions(), [])  # 파티션 테이블이 아니면 아무것도 하지 않음
+
+        self.partitions.convert(months_ahead=0)
+        today = datetime.now().date()
+        created = self.partitions.ensure_partitions(months_ahead=2, today=today)
+        self.assertEqual(len(created), 4)  # 두 테이블 x 다음 두 달
+        self.assertEqual(self.partitions.ensure_partitions(months_ahead=2, today=today), [])
+
+
+class PartitionMaintenanceTest(TestCase):
+    """월 파티션 자동 유지 스레드 테스트"""
+
+    def setUp(self):
+        import threading
+        from orders import partitions
+
+        self.partitions = partitions
+        stop = threading.Event()
+        for name, value in (("_thread", None), ("_stop", stop)):
+            patcher = patch.object(partitions, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(stop.set)
+
+    def test_runs_ensure_on_start(self):
+        import threading
+
+        ran = threading.Event()
+        with patch.object(self.partitions, "ensure_partitions", side_effect=lambda: ran.set() or []):
+            self.partitions.start_maintenance()
+            self.assertTrue(ran.wait(5))
+            self.partitions._stop.set()
+            self.partitions._thread.join(5)
+        self.assertFalse(self.partitions._thread.is_alive())
+
+    @override_settings(ORDER_PARTITION_ENSURE_SECONDS=0)
+    def test_disabled(self):
+        self.partitions.start_maintenance()
+        self.assertIsNone(self.partitions._thread)
+
+
+class OrderArchiveTest(APITestCase):
+    """오래된 주문 콜드 보관과 주문 내역 read-through 테스트"""
+
+    def setUp(self):
+        import tempfile
+        from django.test import override_settings
+        from orders import archive
+
+        self.archive = archive
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.override = override_settings(ORDER_ARCHIVE_DIR=tmpdir.name)
+        self.override.enable()
+        self.addCleanup(self.override.disable)
+        archive.invalidate()
+        self.addCleanup(archive.invalidate)
+
+        Branch.objects.create(bran_id="BRANCH001", bran_nm="강남점")
+        for order_id, member_id, date in [
+            (1, "u1", "2024-01-05"), (2, "u2", "2024-01-20"), (3, "u1", "2024-02-10"), (4, "u1", "2024-03-01"),
+        ]:
+            order = Order.objects.create(
+                order_id=order_id, member_id=member_id, bran_id="BRANCH001", date=date, time="12:00:00",
+                total=30000, status="completed",
+            )
+            for pizza_id in ("PIZZA_A", "PIZZA_B"):
+                OrderDetail.objects.create(order=order, pizza_id=pizza_id, quantity=1, unit_price=15000, line_total=15000)
+        self.url = reverse('myorder')
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {create_test_jwt_token('u1')}"}
+
+    def _archive(self, cutoff):
+        return [self.archive.archive_month(month, batch_size=3) for month in self.archive.pending_months(cutoff)]
+
+    def test_archive_moves_months_to_files(self):
+        expected = self.client.get(self.url, {"from": "2024-01-01"}, **self.auth).json()
+
+        self.assertEqual(self._archive(datetime(2024, 3, 1).date()), [(2, 4), (1, 2)])
+
+        self.assertEqual(list(Order.objects.values_list("order_id", flat=True)), [4])
+        self.assertEqual(OrderDetail.objects.count(), 2)
+        from orders.models import OrderArchive
+        record = OrderArchive.objects.get(month="2024-01-01")
+        path = self.archive.archive_path(record.path)
+        self.assertEqual(self.archive.count_rows(path), 4)
+        self.assertEqual(record.sha256, self.archive._sha256(path))
+        # 블록 헤더 범위로 다른 회원 블록은 건너뛴다
+        self.assertEqual([row["order_id"] for row in self.archive.read_member(path, "u2")], [2, 2])
+
+        # 보관 구간을 포함한 기간은 파일과 DB를 합쳐 보관 전과 같은 결과
+        response = self.client.get(self.url, {"from": "2024-01-01"}, **self.auth)
+        self.assertEqual(response.json(), expected)
+        self.assertEqual(response["Order-Archive-Before"], "2024-03-01")
+        stream = self.client.get(self.url, {"from": "2024-01-01", "stream": "1"}, **self.auth)
+        self.assertEqual(json.loads(stream_body(stream)), expected)
+
+        # 기간이 보관 구간 안이면 그 달 파일만, from이 없으면 (to만 있어도) 보관 구간부터 읽는다
+        response = self.client.get(self.url, {"from": "2024-02-01", "to": "2024-02-29"}, **self.auth)
+        self.assertEqual({item["order_id"] for item in response.json()}, {3})
+        response = self.client.get(self.url, {"to": "2024-02-29"}, **self.auth)
+        self.assertEqual({item["order_id"] for item in response.json()}, {1, 3})
+        response = self.client.get(self.url, **self.auth)
+        self.assertEqual(response.json(), expected)
+
+    def test_rebuild_after_archive_keeps_archived_months(self):
+        """보관 후 재계산해도 보관된 달의 sales_daily는 남고 인기 점수도 보관 전과 같다"""
+        from orders import popularity, rollup
+        from orders.models import BranchPopularity, SalesDaily
+
+        self.addCleanup(popularity.invalidate)
+        rollup.rebuild(lambda: {})
+        popularity.rebuild()
+        sales = sorted(SalesDaily.objects.values_list("day", "pizza_id", "quantity", "revenue"))
+        scores = dict(BranchPopularity.objects.values_list("pizza_id", "score"))
+
+        self._archive(datetime(2024, 3, 1).date())
+
+        self.assertEqual(rollup.rebuild(lambda: {}), 2)  # 3월만 다시 계산
+        self.assertEqual(sorted(SalesDaily.objects.values_list("day", "pizza_id", "quantity", "revenue")), sales)
+        self.assertEqual(rollup.rebuild(lambda: {}, date_to=datetime(2024, 2, 29).date()), 0)
+        self.assertEqual(len(SalesDaily.objects.all()), len(sales))
+
+        self.assertEqual(popularity.rebuild(), 2)
+        rebuilt = dict(BranchPopularity.objects.values_list("pizza_id", "score"))
+        self.assertEqual(rebuilt.keys(), scores.keys())
+        for pizza_id, score in scores.items():
+            self.assertAlmostEqual(rebuilt[pizza_id], score)
+
+    def test_rerun_only_finishes_pending_months(self):
+        self._archive(datetime(2024, 2, 1).date())
+        self.assertEqual(self.archive.pending_months(datetime(2024, 2, 1).date()), [datetime(2024, 1, 1).date()])
+        # 이미 보관한 달은 파일을 다시 쓰지 않고 남은 행만 지운다
+        self.assertEqual(self._archive(datetime(2024, 2, 1).date()), [(2, 4)])
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_open_orders_block_archival(self):
+        Order.objects.filter(order_id=3).update(status="placed")
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+
+        with self.assertRaises(CommandError):
+            call_command("archive_orders", before="2024-03-01", stdout=io.StringIO())
+        # 1월은 보관됐고 2월은 DB에 남는다
+        self.assertEqual(sorted(Order.objects.values_list("order_id", flat=True)), [3, 4])
+
+
+@override_settings(INTERNAL_API_TOKEN="internal-test-token")
+class OrderExportTest(APITestCase):
+    """주문 스트리밍 내보내기 테스트"""
+
+    def setUp(self):
+        """테스트 데이터 설정"""
+        Branch.objects.create(bran_id="BRANCH001", bran_nm="강남점")
+        Branch.objects.create(bran_id="BRANCH002", bran_nm="홍대점")
+        for date, bran_id in [("2024-01-15", "BRANCH001"), ("2024-02-01", "BRANCH001"), ("2024-01-20", "BRANCH002")]:
+            order = Order.objects.create(member_id="u1", bran_id=bran_id, date=date, time="12:00:00", total=45000.0)
+            OrderDetail.objects.create(order=order, pizza_id="P1", quantity=1, unit_price=25000.0, line_total=25000.0)
+            OrderDetail.objects.create(order=order, pizza_id="P2", quantity=1, unit_price=20000.0, line_total=20000.0)
+        self.export_url = reverse('order-export')
+        self.client.credentials(HTTP_X_INTERNAL_TOKEN="internal-test-token")
+
+    def _body(self, response):
+        self.assertTrue(response.is_async)
+        return stream_body(response)
+
+    def test_csv_export_with_filters(self):
+        """기간/지점 필터 CSV 내보내기 테스트"""
+        import csv
+        import io
+
+        response = self.client.get(self.export_url, {"from": "2024-01-01", "to": "2024-01-31", "bran_id": "BRANCH001"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.reader(io.StringIO(self._body(response).decode("utf-8"))))
+        self.assertEqual(rows[0][:3], ["order_id", "member_id", "bran_id"])
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({r[3] for r in rows[1:]}, {"2024-01-15"})
+
+    def test_ndjson_gzip_export_groups_details(self):
+        """NDJSON+gzip 내보내기에서 주문별로 상세가 묶이는지 테스트"""
+        import gzip
+        import json as jsonlib
+
+        response = self.client.get(self.export_url, {"format": "ndjson", "gzip": "1"})
+
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        lines = gzip.decompress(self._body(response)).decode("utf-8").splitlines()
+        orders = [jsonlib.loads(line) for line in lines]
+        self.assertEqual(len(orders), 3)
+        self.assertEqual([i["pizza_id"] for i in orders[0]["items"]], ["P1", "P2"])
+
+    def test_invalid_format(self):
+        """지원하지 않는 형식 요청 시 400 테스트"""
+        response = self.client.get(self.export_url, {"format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_requires_internal_token(self):
+        """내부 토큰 없이/틀린 토큰으로는 내보낼 수 없다"""
+        self.client.credentials()
+        self.assertEqual(self.client.get(self.export_url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_X_INTERNAL_TOKEN="wrong")
+        self.assertEqual(self.client.get(self.export_url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class SyntheticDataTest(TestCase):
+    """합성 데이터 생성기 테스트 (DB 없이 블록 생성만)"""
+
+    CONFIG = {
+        "seed": 7,
+        "members": 500,
+        "branches": 4,
+        "pizza_types": 5,
+        "orders": 2500,
+        "start_date": "2024-01-01",
+        "days": 30,
+        "member_zipf": 1.1,
+        "pizza_zipf": 0.9,
+        "block_size": 1000,
+        "first_order_id": 101,
+    }
+
+    def _block(self, config, block):
+        orders_buf, details_buf, n_orders, n_details = synthetic.generate_block(config, block)
+        return orders_buf.getvalue(), details_buf.getvalue(), n_orders, n_details
+
+    def test_same_seed_is_deterministic(self):
+        """같은 seed/블록은 항상 같은 데이터"""
+        self.assertEqual(self._block(self.CONFIG, 1), self._block(self.CONFIG, 1))
+        self.assertNotEqual(self._block(self.CONFIG, 1), self._block({**self.CONFIG, "seed": 8}, 1))
+
+    def test_blocks_cover_order_range(self):
+        """블록들이 order_id 범위를 빈틈없이 나눠 가짐"""
+        ids = []
+        for block in range(3):
+            orders_csv, details_csv, n_orders, _ = self._block(self.CONFIG, block)
+            rows = list(csv.reader(io.StringIO(orders_csv)))
+            self.assertEqual(len(rows), n_orders)
+            ids += [int(row[0]) for row in rows]
+            detail_ids = {int(row[0]) for row in csv.reader(io.StringIO(details_csv))}
+            self.assertEqual(detail_ids, {int(row[0]) for row in rows})
+        self.assertEqual(ids, list(range(101, 101 + 2500)))
+
+    def test_order_total_matches_lines(self):
+        orders_csv, details_csv, _, _ = self._block(self.CONFIG, 0)
+        totals = {}
+        for order_id, _, quantity, unit_price, line_total, _ in csv.reader(io.StringIO(details_csv)):
+            self.assertEqual(float(unit_price) * int(quantity), float(line_total))
+            totals[order_id] = totals.get(order_id, 0) + float(line_total)
+        for row in csv.reader(io.StringIO(orders_csv)):
+            self.assertEqual(float(row[5]), totals[row[0]])
+
+
+class ReadReplicaRoutingTest(TestCase):
+    """읽기 복제본 라우팅 / read-your-writes 테스트"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.seen = []
+        self.cookies = {}
+        self.writes = True
+
+        def view(request):
+            self.seen.append(db_router._read_alias.get())
+            if request.method == "POST" and self.writes:
+                self._write()
+            return HttpResponse(status=201 if request.method == "POST" else 200)
+
+        self.middleware = db_router.ReadReplicaMiddleware(view)
+
+    def _call(self, method, member_id=None):
+        """브라우저처럼 받은 쿠키를 다음 요청에 실어 보낸다."""
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {create_test_jwt_token(member_id)}"} if member_id else {}
+        request = getattr(self.factory, method)("/api/order/myorder/", **headers)
+        request.COOKIES.update(self.cookies)
+        with patch("order_service.db_router.replica_enabled", return_value=True):
+            response = self.middleware(request)
+        self.cookies.update({name: morsel.value for name, morsel in response.cookies.items()})
+        return self.seen[-1]
+
+    def _write(self):
+        Branch.objects.create(bran_id=f"BRANCH{len(self.seen):03d}", bran_nm="지점")
+
+    def test_router_defaults_to_primary(self):
+        """요청 밖(관리 명령 등)에서는 읽기/쓰기 모두 primary"""
+        router = db_router.PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Order), "default")
+        self.assertEqual(router.db_for_write(Order), "default")
+        self.assertFalse(router.allow_migrate("replica", "orders"))
+
+    def test_safe_methods_read_from_replica(self):
+        self.assertEqual(self._call("get", "member_a"), "replica")
+        self.assertIsNone(self._call("post", "member_a"))
+        self.assertIsNone(db_router._read_alias.get())
+
+    def test_reads_stick_to_primary_after_member_write(self):
+        """쓰기 후 같은 회원은 primary, 다른 회원은 계속 replica"""
+        self._call("post", "member_a")
+        self.assertEqual(self._call("get", "member_a"), "default")
+        self.assertEqual(self._call("get", "member_b"), "replica")
+
+    def test_post_without_write_does_not_stick(self):
+        """DB에 쓰지 않는 POST(견적 등)는 고정 쿠키를 만들지 않는다"""
+        self.writes = False
+        self._call("post", "member_a")
+        self.assertNotIn(db_router.STICKY_COOKIE, self.cookies)
+        self.assertEqual(self._call("get", "member_a"), "replica")
+
+    def test_async_middleware_marks_sticky_after_write(self):
+        """비동기 체인에서도 코루틴으로 동작하고, sync_to_async 안에서 한 쓰기를 본다"""
+        from asgiref.sync import iscoroutinefunction, sync_to_async
+
+        async def view(request):
+            await sync_to_async(self._write)()
+            return HttpResponse(status=201)
+
+        middleware = db_router.ReadReplicaMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = self.factory.post("/api/order/", HTTP_AUTHORIZATION=f"Bearer {create_test_jwt_token('member_a')}")
+        with patch("order_service.db_router.replica_enabled", return_value=True):
+            response = async_to_sync(middleware)(request)
+        self.assertIn(db_router.STICKY_COOKIE, response.cookies)
+        self.assertIsNone(db_router._writes.get())
+
+    def test_sticky_cookie_is_signed_and_expires(self):
+        """고정 쿠키는 위조할 수 없고 READ_REPLICA_STICKY_SECONDS가 지나면 replica로 돌아간다"""
+        self.cookies[db_router.STICKY_COOKIE] = "member_a"
+        self.assertEqual(self._call("get", "member_a"), "replica")
+
+        self._call("post", "member_a")
+        with self.settings(READ_REPLICA_STICKY_SECONDS=-1):
+            self.assertEqual(self._call("get", "member_a"), "replica")
+
+    def test_async_streaming_body_reads_from_request_alias(self):
+        """비동기 스트리밍 본문도 청크를 만드는 동안 요청과 같은 DB를 읽는다"""
+        from orders.export import async_chunks
+
+        def chunks():
+            yield db_router._read_alias.get().encode()
+
+        def view(request):
+            return StreamingHttpResponse(async_chunks(chunks()))
+
+        request = self.factory.get("/api/order/myorder/", HTTP_AUTHORIZATION=f"Bearer {create_test_jwt_token('member_a')}")
+        with patch("order_service.db_router.replica_enabled", return_value=True):
+            response = db_router.ReadReplicaMiddleware(view)(request)
+        self.assertEqual(stream_body(response), b"replica")
+
+    def test_replica_disabled_leaves_routing_alone(self):
+        with patch("order_service.db_router.replica_enabled", return_value=False):
+            self.middleware(self.factory.get("/api/order/myorder/"))
+        self.assertIsNone(self.seen[-1])
+
+
+class MenuClientTest(TestCase):
+    """menu-service 클라이언트 (MessagePack 협상) 테스트"""
+
+    @patch('orders.menu_client.requests.post')
+    def test_lookup_pizza_uses_msgpack(self, mock_post):
+        from orders.negotiation import MSGPACK, packb, unpackb
+        from orders.menu_client import lookup_pizza
+
+        mock_post.return_value = MagicMock(
+            status_code=200,
+            headers={"Content-Type": MSGPACK},
+            content=packb({"pizza_id": "PIZZA_001_L", "price": 25000.0}),
+        )
+
+        self.assertEqual(lookup_pizza("페페로니", "L"), {"pizza_id": "PIZZA_001_L", "price": 25000.0})
+        kwargs = mock_post.call_args.kwargs
+        self.assertEqual(kwargs["headers"]["Accept"], MSGPACK)
+        self.assertEqual(unpackb(kwargs["data"]), {"pizza_nm": "페페로니", "size": "L"})
+
+    @patch('orders.menu_client.requests.post')
+    def test_lookup_pizza_json_response_and_not_found(self, mock_post):
+        """메뉴 서비스가 JSON으로 응답해도 처리, 404는 None"""
+        from orders.menu_client import lookup_pizza
+
+        mock_post.return_value = MagicMock(status_code=200, headers={"Content-Type": "application/json"})
+        mock_post.return_value.json.return_value = {"pizza_id": "PIZZA_001_L", "price": 25000.0}
+        self.assertEqual(lookup_pizza("페페로니", "L")["pizza_id"], "PIZZA_001_L")
+
+        mock_post.return_value = MagicMock(status_code=404)
+        self.assertIsNone(lookup_pizza("페페로니", "XL"))
+
+    @patch('orders.menu_client.requests.post')
+    def test_lookup_pizza_falls_back_to_json_on_415(self, mock_post):
+        """MessagePack을 모르는 menu-service(415)에는 JSON으로 다시 보낸다"""
+        from orders.menu_client import lookup_pizza
+
+        json_response = MagicMock(status_code=200, headers={"Content-Type": "application/json"})
+        json_response.json.return_value = {"pizza_id": "PIZZA_001_L", "price": 25000.0}
+        mock_post.side_effect = [MagicMock(status_code=415), json_response]
+
+        self.assertEqual(lookup_pizza("페페로니", "L")["pizza_id"], "PIZZA_001_L")
+        self.assertEqual(mock_post.call_args.kwargs["json"], {"pizza_nm": "페페로니", "size": "L"})
+
+    @patch('orders.menu_client.requests.post')
+    def test_upstream_error_is_not_not_found(self, mock_post):
+        """404 이외의 실패 응답은 '없는 메뉴'(400)가 아니라 menu-service 장애(503)"""
+        import requests
+        from orders.menu_client import lookup_pizza
+
+        mock_post.return_value = MagicMock(status_code=502)
+        with self.assertRaises(requests.HTTPError):
+            lookup_pizza("페페로니", "L")
+
+        Branch.objects.create(bran_id="BRANCH001", bran_nm="강남점")
+        token = create_test_jwt_token("test_user")
+        payload = {"branchId": "BRANCH001", "lines": [{"name": "페페로니", "size": "L", "quantity": 1}]}
+        response = self.client.post(
+            reverse('order-list'), payload, content_type="application/json", HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(Order.objects.exists())
+
 
 class OrderTransactionTest(TestCase):
     """주문 트랜잭션 테스트"""
@@ -335,3 +1569,200 @@ class OrderDataIntegrityTest(TestCase):
                 pizza_id="PIZZA_TEST",
                 quantity=1
             )
+
+
+class ReadinessTest(APITestCase):
+    """워밍업 / readiness 테스트"""
+
+    def setUp(self):
+        from orders import lifecycle
+
+        self.lifecycle = lifecycle
+        lifecycle._warmed.clear()
+        lifecycle._draining.clear()
+        self.addCleanup(lifecycle._warmed.clear)
+        self.addCleanup(lifecycle._draining.clear)
+
+    def test_ready_only_after_warmup_and_not_while_draining(self):
+        """워밍업 전 503, 워밍업 후 200, drain 중 다시 503"""
+        self.assertEqual(self.client.get("/readyz").status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(self.client.get("/livez").status_code, status.HTTP_200_OK)
+
+        self.assertTrue(self.lifecycle.warm_up())
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.json()["warmup_ms"]), {name for name, _ in self.lifecycle.WARMUP_STEPS})
+
+        self.lifecycle.begin_drain()
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json()["status"], "draining")
+
+    def test_failed_step_keeps_pod_unready(self):
+        failing = [("db", MagicMock(side_effect=RuntimeError("down")))]
+        with patch.object(self.lifecycle, "WARMUP_STEPS", failing), self.assertLogs(self.lifecycle.logger, "ERROR"):
+            self.assertFalse(self.lifecycle.warm_up())
+        self.assertEqual(self.client.get("/readyz").status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class StartupProfileTest(TestCase):
+    """profile_startup의 -X importtime 출력 파싱 테스트"""
+
+    def test_parse_importtime(self):
+        from orders.management.commands.profile_startup import parse_importtime
+
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |     jwt.api_jwt\n"
+            "import time:        50 |        150 |   jwt\n"
+            "import time:       300 |        300 | requests\n"
+            "some other stderr line\n"
+        )
+        by_package, cumulative = parse_importtime(stderr)
+
+        self.assertEqual(by_package, {"jwt": 150, "requests": 300})
+        self.assertEqual(cumulative["jwt"], 150)
+
+    def test_production_startup_skips_admin_and_deferred_modules(self):
+        """DEBUG=false 기동(URLconf까지)에서는 admin 앱을 설치하지 않고 msgpack, 읽기 모델 모듈을 import하지 않는다"""
+        import subprocess
+
+        probe = (
+            "import sys, django; django.setup()\n"
+            "from django.apps import apps\n"
+            "from django.urls import get_resolver; get_resolver().url_patterns\n"
+            "loaded = [m for m in ('msgpack', 'orders.rollup', 'orders.popularity') if m in sys.modules]\n"
+            "print(' '.join(loaded + ['admin'] * apps.is_installed('django.contrib.admin')))"
+        )
+        env = dict(os.environ, DEBUG="false", DJANGO_SETTINGS_MODULE="order_service.settings")
+        env.pop("DJANGO_ADMIN_ENABLED", None)
+        result = subprocess.run(
+            [sys.executable, "-c", probe], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+
+class GracefulShutdownTest(APITestCase):
+    """정상 종료 drain / 처리 중 요청 / 지표 테스트"""
+
+    def setUp(self):
+        from orders import lifecycle, shutdown
+
+        self.shutdown = shutdown
+        lifecycle._warmed.set()
+        self.addCleanup(lifecycle._warmed.clear)
+        self.addCleanup(lifecycle._draining.clear)
+        self.addCleanup(shutdown._accepting.set)
+        self.addCleanup(shutdown._drained.clear)
+        self.addCleanup(setattr, shutdown, "_drain_thread", None)
+        self.addCleanup(shutdown.metrics.update, dict(shutdown.metrics))
+
+    def test_drain_waits_for_in_flight_then_rejects_new_work(self):
+        """처리 중 요청이 끝날 때까지 기다리고, 이후 새 요청은 503 (프로브는 응답)"""
+        import threading
+
+        self.shutdown.in_flight.enter()
+        threading.Timer(0.2, self.shutdown.in_flight.exit).start()
+
+        result = self.shutdown.drain(propagation=0, timeout=5)
+
+        self.assertGreaterEqual(result["drain_seconds"], 0.2)
+        self.assertEqual(result["in_flight_at_drain"], 1)
+        self.assertEqual(result["abandoned"], 0)
+        self.assertEqual(self.client.get(reverse('branch-list')).status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(self.client.get("/livez").status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get("/readyz").json()["status"], "draining")
+
+    def test_drain_deadline(self):
+        """마감 시간이 지나면 남은 요청 수를 기록하고 진행"""
+        self.shutdown.in_flight.enter()
+        self.addCleanup(self.shutdown.in_flight.exit)
+
+        result = self.shutdown.drain(propagation=0, timeout=0.1)
+
+        self.assertEqual(result["abandoned"], 1)
+
+    def test_metrics_endpoint(self):
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn("service_in_flight_requests 1", body)
+        self.assertIn("service_ready 1", body)
+        self.assertIn("service_drain_duration_seconds", body)
+
+    async def test_async_streaming_response_counts_until_closed(self):
+        """ASGI의 비동기 스트리밍 응답(SSE)은 본문이 끝나거나 닫힐 때까지 처리 중으로 센다"""
+        async def events():
+            yield b"data: 1\n\n"
+            yield b"data: 2\n\n"
+
+        async def view(request):
+            return StreamingHttpResponse(events(), content_type="text/event-stream")
+
+        middleware = self.shutdown.InFlightMiddleware(view)
+        before = self.shutdown.in_flight.count
+        response = await middleware(RequestFactory().get("/api/order/status/stream/"))
+        self.assertTrue(response.is_async)
+        self.assertEqual(self.shutdown.in_flight.count, before + 1)
+
+        chunks = aiter(response)
+        await anext(chunks)
+        self.assertEqual(self.shutdown.in_flight.count, before + 1)
+        # ASGIHandler는 본문을 보낸 뒤(또는 중간에 끊겨도) response.close()를 부른다
+        await chunks.aclose()
+        response.close()
+        self.assertEqual(self.shutdown.in_flight.count, before)
+        response.close()
+        self.assertEqual(self.shutdown.in_flight.count, before)
+
+    def test_signal_drains_then_calls_previous_handler(self):
+        """시그널 수신 -> drain -> 종료 훅 -> 원래 처리기 순서"""
+        import signal
+        import time
+
+        calls = []
+        previous = signal.signal(signal.SIGUSR1, lambda signum, frame: calls.append("previous"))
+        self.addCleanup(signal.signal, signal.SIGUSR1, previous)
+        hooks = [lambda: calls.append("hook")]
+
+        with patch.object(self.shutdown, "_shutdown_hooks", hooks), \
+                self.settings(SHUTDOWN_PROPAGATION_SECONDS=0, SHUTDOWN_DRAIN_TIMEOUT_SECONDS=1):
+            self.assertTrue(self.shutdown.install_signal_handlers((signal.SIGUSR1,)))
+            os.kill(os.getpid(), signal.SIGUSR1)
+            deadline = time.monotonic() + 5
+            while "previous" not in calls and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertEqual(calls, ["hook", "previous"])
+        self.assertIsNotNone(self.shutdown.metrics["drain_seconds"])
+
+
+class FastJsonTest(TestCase):
+    """fastjson 인코딩/폴백 테스트"""
+
+    def test_response_encodes_decimal_and_unicode(self):
+        """Decimal과 한글이 포함된 응답 인코딩 테스트"""
+        from decimal import Decimal
+        from .fastjson import FastJsonResponse, loads
+
+        response = FastJsonResponse({"price": Decimal("25000.50"), "name": "페페로니"})
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(loads(response.content), {"price": "25000.50", "name": "페페로니"})
+
+    def test_stdlib_fallback(self):
+        """orjson이 없을 때 표준 json 폴백 테스트"""
+        from . import fastjson
+
+        with patch.object(fastjson, "orjson", None):
+            body = fastjson.dumps([{"a": 1}])
+            self.assertEqual(fastjson.loads(body), [{"a": 1}])
+
+    def test_non_dict_requires_safe_false(self):
+        """safe=False 없이 리스트 직렬화 시 TypeError 테스트"""
+        from .fastjson import FastJsonResponse
+
+        with self.assertRaises(TypeError):
+            FastJsonResponse([1, 2])
@@ -1,13 +1,22 @@
 from django.urls import path
-from .views import HealthView, MyOrderView, CreateOrderView, BranchListView
+from .views import HealthView, ReadyView, MetricsView, MyOrderView, CreateOrderView, QuoteView, BranchListView, PopularPizzaView, SalesReportView, OrderExportView, OrderStatusStreamView, OrderStatusStreamTicketView, OrderStatusUpdateView
 
 urlpatterns = [
     path("", HealthView.as_view()),
     path("healthz", HealthView.as_view()),
     path("livez", HealthView.as_view()),
+    path("readyz", ReadyView.as_view(), name="readyz"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
     path("api/order/myorder/", MyOrderView.as_view(), name="myorder"),
     path("api/order/", CreateOrderView.as_view(), name="order-list"),
+    path("api/order/quote/", QuoteView.as_view(), name="order-quote"),
+    path("api/order/status/stream/", OrderStatusStreamView.as_view(), name="order-status-stream"),
+    path("api/order/status/stream/ticket/", OrderStatusStreamTicketView.as_view(), name="order-status-stream-ticket"),
     path("api/order/branch/", BranchListView.as_view(), name="branch-list"),
+    path("api/order/branch/<str:bran_id>/popular/", PopularPizzaView.as_view(), name="branch-popular"),
+    path("api/order/int/report/sales/", SalesReportView.as_view(), name="sales-report"),
+    path("api/order/int/export/", OrderExportView.as_view(), name="order-export"),
+    path("api/order/int/status/", OrderStatusUpdateView.as_view(), name="order-status-update"),
 ]
 
 
@@ -1,19 +1,55 @@
+import hmac
 import jwt
 import requests
-import os
 from django.conf import settings
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import parse_etags
+from .fastjson import FastJsonResponse, dumps
+from .lightviews import LightView
+from . import lifecycle
+from .shutdown import render_metrics
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
-from .models import Order, OrderDetail, Branch
+from .models import Order, OrderDetail
+from .idempotency import IDEMPOTENCY_HEADER, MAX_KEY_LENGTH, run_idempotent
+from .outbox import record_order_created
+from .export import FORMATS, MY_ORDER_FIELDS, async_chunks, export_chunks, export_rows, json_array_chunks, my_order_rows
+from .branches import get_snapshot as get_branches, is_valid_branch
+from .menu_client import lookup_pizza
+from .price_cache import lookup as lookup_price
+from .partitions import filter_days
+from .archive import get_manifest as get_archive_manifest, member_rows
+from .status import change_status
+from .status_feed import hub as status_hub, open_orders
+from . import stream_ticket
+import asyncio
+import itertools
 import datetime 
+from django.db import transaction
 from django.db.models import Max
+from asgiref.sync import sync_to_async
 
-class HealthView(APIView):
-    permission_classes = [AllowAny]
+class HealthView(LightView):
+    def get(self, request):
+        return FastJsonResponse({"status": "ok"})
+
+
+class MetricsView(LightView):
+    """수명주기 지표 (Prometheus 텍스트 형식)"""
 
     def get(self, request):
-        return JsonResponse({"status": "ok"})
+        return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4")
+
+
+class ReadyView(LightView):
+    """readiness: 워밍업이 끝나고 종료(drain) 중이 아닐 때만 200"""
+
+    def get(self, request):
+        current = lifecycle.state()
+        return FastJsonResponse(
+            {"status": current, "warmup_ms": lifecycle.warmup_timings},
+            status=200 if current == "ready" else 503,
+        )
 
 
 def _get_member_id_from_auth(request):
@@ -28,95 +64,393 @@ def _get_member_id_from_auth(request):
         return None
 
 
+INTERNAL_TOKEN_HEADER = "X-Internal-Token"
+
+
+def _internal_auth_error(request):
+    """내부 API(api/order/int/) 공유 토큰 검사. 통과하면 None, 아니면 401/403 응답. 토큰이 설정되지 않았으면 모두 거절한다."""
+    token = request.headers.get(INTERNAL_TOKEN_HEADER)
+    if not token:
+        return FastJsonResponse({"detail": "unauthorized"}, status=401)
+    expected = settings.INTERNAL_API_TOKEN
+    if not (expected and hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))):
+        return FastJsonResponse({"detail": "forbidden"}, status=403)
+    return None
+
+
 class MyOrderView(APIView):
     def get(self, request):
         member_id = _get_member_id_from_auth(request)
         if not member_id:
-            return JsonResponse({"detail": "unauthorized"}, status=401)
-        
-        order_details = OrderDetail.objects.filter(order__member_id=member_id)
+            return FastJsonResponse({"detail": "unauthorized"}, status=401)
+
+        # 선택적 주문일 범위 (YYYY-MM-DD): 해당 월 파티션만 읽는다.
+        try:
+            date_from = request.GET.get("from")
+            date_to = request.GET.get("to")
+            date_from = datetime.date.fromisoformat(date_from) if date_from else None
+            date_to = datetime.date.fromisoformat(date_to) if date_to else None
+        except ValueError:
+            return FastJsonResponse({"detail": "invalid date"}, status=400)
+
+        # boundary 이전 주문은 보관 파일에만 있다. 요청 기간이 boundary 이전과 겹치면(from이 없으면 전체 내역이므로
+        # 항상) 파일을 읽고, DB는 boundary 이후만 읽는다.
+        manifest = get_archive_manifest()
+        boundary = manifest.boundary
+        archived = ()
+        hot_from = date_from
+        if boundary is not None:
+            if date_from is None or date_from < boundary:
+                archived = member_rows(member_id, date_from, date_to, manifest)
+            hot_from = max(date_from or boundary, boundary)
+        hot = boundary is None or date_to is None or date_to >= boundary
+
+        # 주문 상세가 많은 계정용: 전체를 메모리에 올리지 않고 server-side cursor로 읽으며 배열을 조각내 보낸다.
+        if request.GET.get("stream") == "1":
+            rows = itertools.chain(archived, my_order_rows(member_id, hot_from, date_to) if hot else ())
+            response = StreamingHttpResponse(
+                async_chunks(json_array_chunks(rows, list(MY_ORDER_FIELDS))), content_type="application/json"
+            )
+            if boundary is not None:
+                response["Order-Archive-Before"] = boundary.isoformat()
+            return response
+
+        order_details = filter_days(
+            OrderDetail.objects.filter(order__member_id=member_id), hot_from, date_to
+        ).select_related("order") if hot else ()
 
-        items = [
+        items = [dict(zip(MY_ORDER_FIELDS, row)) for row in archived]
+        items += [
             {
                 "order_id": od.order.order_id,
                 "bran_id": od.order.bran_id,
                 "pizza_id": od.pizza_id,
                 "quantity": od.quantity,
+                "unit_price": od.unit_price,
+                "line_total": od.line_total,
                 "date": od.order.date,
                 "time": od.order.time,
+                "status": od.order.status,
             }
             for od in order_details
         ]
-        return JsonResponse(items, safe=False)
+        response = FastJsonResponse(items, safe=False)
+        if boundary is not None:
+            response["Order-Archive-Before"] = boundary.isoformat()
+        return response
+
+def _parse_lines(items):
+    """주문 줄 검증. (오류 본문, [(이름, 사이즈, 수량)]) — 오류가 없으면 오류 본문은 None"""
+    lines = []
+    for item in items:
+        pizza_name = item.get("name") 
+        size = item.get("size")
+        quantity = item.get("quantity")
+        
+        if not (pizza_name and size and quantity):
+             return {"detail": "missing item details"}, None
+        try:
+            quantity = int(quantity)
+        except (TypeError, ValueError):
+            return {"detail": "invalid quantity"}, None
+        if quantity <= 0:
+            return {"detail": "invalid quantity"}, None
+        lines.append((pizza_name, size, quantity))
+    return None, lines
+
+def _create_order(member_id, data, save_response=None):
+    """주문 생성 본체. (status, body)를 반환한다. save_response(status, body)는 주문 트랜잭션 안에서 호출한다."""
+    bran_id = data.get("branchId")
+    items = data.get("lines", []) 
+
+    now = datetime.datetime.now()
+    date = now.strftime("%Y-%m-%d") 
+    time = now.strftime("%H:%M:%S")
+    
+    # 필수 필드 검사: bran_id와 items 목록만 확인
+    if not (bran_id and isinstance(items, list) and len(items) > 0):
+        return 400, {"detail": "invalid payload"}
+    # 메뉴 조회/DB 작업 전에 지점을 메모리에서 검증
+    if not is_valid_branch(bran_id):
+        return 400, {"detail": "invalid branchId"}
+
+    error, lines = _parse_lines(items)
+    if error:
+        return 400, error
+
+    processed_items = [] 
+    
+    for pizza_name, size, quantity in lines:
+        try:
+            menu_item = lookup_pizza(pizza_name, size)
+            if menu_item is None:
+                return 400, {"detail": f"피자 '{pizza_name}'을 찾을 수 없습니다."}
+            price = menu_item.get("price")
+            
+            processed_items.append({
+                "pizza_id": menu_item.get("pizza_id"),
+                "quantity": quantity,
+                "price": price,
+                "line_total": price * quantity if price is not None else None,
+            })
+            
+        except requests.RequestException:
+            return 503, {"detail": "메뉴 서비스 연결 실패"}
+
+    line_totals = [item["line_total"] for item in processed_items]
+    total = sum(line_totals) if None not in line_totals else None
+
+    with transaction.atomic():
+        # DB에 주문 정보 저장
+        order = Order.objects.create(member_id=member_id, bran_id=bran_id, date=date, time=time, total=total)
+
+        # DB에 주문 상세 정보 저장 (주문 시점 가격 스냅샷 포함)
+        OrderDetail.objects.bulk_create([
+            OrderDetail(
+                order=order,
+                order_day=order.order_day,
+                pizza_id=item["pizza_id"],
+                quantity=item["quantity"],
+                unit_price=item["price"],
+                line_total=item["line_total"],
+            )
+            for item in processed_items
+        ])
+
+        # 같은 트랜잭션에서 OrderCreated 이벤트 기록
+        record_order_created(order, processed_items)
+
+        # 지점/일자/피자별 판매 롤업 증분 갱신 (읽기 모델 모듈은 기동 경로에서 import하지 않는다)
+        from .popularity import record_order as record_popularity
+        from .rollup import apply_order
+
+        apply_order(bran_id, now.date(), processed_items)
+        record_popularity(bran_id, now.date(), processed_items)
+
+        body = {"order_id": order.order_id, "total": total}
+        # Idempotency-Key 응답은 주문과 같이 커밋한다.
+        if save_response is not None:
+            save_response(201, body)
+
+    return 201, body
 
 class CreateOrderView(APIView):
     def post(self, request):
         member_id = _get_member_id_from_auth(request)
         if not member_id:
-            return JsonResponse({"detail": "unauthorized"}, status=401)
+            return FastJsonResponse({"detail": "unauthorized"}, status=401)
         
         data = request.data or {}
-        
-        bran_id = data.get("branchId")
-        items = data.get("lines", []) 
+        idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            status, body = _create_order(member_id, data)
+            return FastJsonResponse(body, status=status)
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            return FastJsonResponse({"detail": "invalid Idempotency-Key"}, status=400)
 
-        now = datetime.datetime.now()
-        date = now.strftime("%Y-%m-%d") 
-        time = now.strftime("%H:%M:%S")
-        
-        # 필수 필드 검사: bran_id와 items 목록만 확인
-        if not (bran_id and isinstance(items, list) and len(items) > 0):
-            return JsonResponse({"detail": "invalid payload"}, status=400)
+        status, body, replayed = run_idempotent(
+            member_id, idempotency_key, data, lambda save: _create_order(member_id, data, save)
+        )
+        response = FastJsonResponse(body, status=status)
+        if replayed:
+            response["Idempotent-Replayed"] = "true"
+        return response
 
-        menu_service_url = os.getenv('MENU_SERVICE_URL', 'http://menu-service.default.svc.cluster.local:8000')
-        processed_items = [] 
-        
-        for item in items:
-            pizza_name = item.get("name") 
-            size = item.get("size")
-            quantity = item.get("quantity")
-            
-            if not (pizza_name and size and quantity):
-                 return JsonResponse({"detail": "missing item details"}, status=400)
 
-            try:
-                response = requests.post(
-                    f"{menu_service_url}/api/menu/get_pizza_id/",
-                    json={"pizza_nm": pizza_name, "size": size},
-                    timeout=5
-                )
-                
-                if response.status_code != 200:
-                    return JsonResponse({"detail": f"피자 '{pizza_name}'을 찾을 수 없습니다."}, status=400)
-                
-                pizza_id = response.json().get("pizza_id") 
-                
-                processed_items.append({
-                    "pizza_id": pizza_id,
-                    "quantity": quantity
+class QuoteView(APIView):
+    """장바구니 견적: 주문과 같은 lines로 가격/합계 계산 (메모리 가격 캐시, DB 쓰기 없음)"""
+
+    def post(self, request):
+        data = request.data or {}
+        bran_id = data.get("branchId")
+        items = data.get("lines", [])
+        if not (isinstance(items, list) and len(items) > 0):
+            return FastJsonResponse({"detail": "invalid payload"}, status=400)
+        # branchId는 선택이지만 보냈다면 주문 생성과 같이 검증한다.
+        if bran_id and not is_valid_branch(bran_id):
+            return FastJsonResponse({"detail": "invalid branchId"}, status=400)
+        error, lines = _parse_lines(items)
+        if error:
+            return FastJsonResponse(error, status=400)
+
+        quoted = []
+        try:
+            for pizza_name, size, quantity in lines:
+                menu_item = lookup_price(pizza_name, size)
+                if menu_item is None:
+                    return FastJsonResponse({"detail": f"피자 '{pizza_name}'을 찾을 수 없습니다."}, status=400)
+                price = menu_item["price"]
+                quoted.append({
+                    "name": pizza_name,
+                    "size": size,
+                    "quantity": quantity,
+                    "pizza_id": menu_item["pizza_id"],
+                    "unit_price": price,
+                    "line_total": price * quantity if price is not None else None,
                 })
-                
-            except requests.RequestException:
-                return JsonResponse({"detail": "메뉴 서비스 연결 실패"}, status=503)
+        except requests.RequestException:
+            return FastJsonResponse({"detail": "메뉴 서비스 연결 실패"}, status=503)
 
-        # DB에 주문 정보 저장
-        order = Order.objects.create(member_id=member_id, bran_id=bran_id, date=date, time=time)
-        
-        # DB에 주문 상세 정보 저장
-        for item in processed_items: 
-            OrderDetail.objects.create(
-                order=order,
-                pizza_id=item["pizza_id"],
-                quantity=item["quantity"]
+        line_totals = [line["line_total"] for line in quoted]
+        total = sum(line_totals) if None not in line_totals else None
+        return FastJsonResponse({"branchId": bran_id, "lines": quoted, "total": total})
+
+
+class BranchListView(LightView):
+    def get(self, request):
+        branches = get_branches()
+        if branches.etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(branches.body, content_type="application/json")
+        response["ETag"] = branches.etag
+        return response
+
+
+class PopularPizzaView(LightView):
+    """지점 인기 피자 상위 N (메모리 스냅샷, 최근 주문일수록 가중)"""
+
+    def get(self, request, bran_id):
+        from .popularity import get_snapshot as get_popularity
+
+        if not is_valid_branch(bran_id):
+            return FastJsonResponse({"detail": "invalid branchId"}, status=404)
+        try:
+            limit = int(request.GET.get("limit", 10))
+        except ValueError:
+            return FastJsonResponse({"detail": "invalid limit"}, status=400)
+        limit = max(1, min(limit, settings.POPULARITY_TOP_N))
+        return FastJsonResponse({"bran_id": bran_id, "items": get_popularity().ranking(bran_id, limit)})
+
+
+class SalesReportView(LightView):
+    """지점별 일자/피자 판매 리포트 (sales_daily 롤업 조회)"""
+
+    def get(self, request):
+        error = _internal_auth_error(request)
+        if error:
+            return error
+        bran_id = request.GET.get("bran_id")
+        if not bran_id:
+            return FastJsonResponse({"detail": "bran_id is required"}, status=400)
+        try:
+            date_to = datetime.date.fromisoformat(request.GET.get("to") or datetime.date.today().isoformat())
+            date_from = datetime.date.fromisoformat(
+                request.GET.get("from") or (date_to - datetime.timedelta(days=30)).isoformat()
             )
-            
-        return JsonResponse({"order_id": order.order_id}, status=201)
+        except ValueError:
+            return FastJsonResponse({"detail": "invalid date"}, status=400)
+        from .rollup import sales_report
+
+        return FastJsonResponse(sales_report(bran_id, date_from, date_to), safe=False)
+
 
-class BranchListView(APIView):
-    permission_classes = [AllowAny]
+class OrderExportView(LightView):
+    """주문/주문 상세 스트리밍 내보내기 (CSV 또는 NDJSON, gzip 선택)"""
 
     def get(self, request):
-        items = [{"bran_id": b.bran_id, "bran_nm": b.bran_nm} for b in Branch.objects.all()]
-        return JsonResponse(items, safe=False)
+        error = _internal_auth_error(request)
+        if error:
+            return error
+        fmt = request.GET.get("format", "csv")
+        if fmt not in FORMATS:
+            return FastJsonResponse({"detail": "format must be csv or ndjson"}, status=400)
+        try:
+            date_from = request.GET.get("from")
+            date_to = request.GET.get("to")
+            date_from = datetime.date.fromisoformat(date_from) if date_from else None
+            date_to = datetime.date.fromisoformat(date_to) if date_to else None
+        except ValueError:
+            return FastJsonResponse({"detail": "invalid date"}, status=400)
+        use_gzip = request.GET.get("gzip") in ("1", "true")
 
+        rows = export_rows(date_from, date_to, request.GET.get("bran_id"))
+        filename = f"orders.{fmt}" + (".gz" if use_gzip else "")
+        response = StreamingHttpResponse(
+            async_chunks(export_chunks(fmt, rows, gzip=use_gzip)),
+            content_type="application/gzip" if use_gzip else FORMATS[fmt],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
 
+
+def _sse(event, data, event_id=None):
+    lines = [f"id: {event_id}"] if event_id else []
+    lines += [f"event: {event}", "data: " + dumps(data).decode("utf-8")]
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+async def _status_events(member_id):
+    """snapshot 1회 후 status 이벤트, 유휴 시 keep-alive 주석. drain이 시작되면 끝낸다."""
+    # snapshot보다 먼저 구독해 그 사이의 변경을 놓치지 않는다 (중복은 무해).
+    subscription = status_hub.subscribe(member_id)
+    try:
+        yield f"retry: {settings.ORDER_STATUS_RETRY_MS}\n\n".encode("utf-8")
+        yield _sse("snapshot", await sync_to_async(open_orders)(member_id))
+        idle = 0.0
+        while lifecycle.state() != "draining":
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                idle += 1.0
+                if idle >= settings.ORDER_STATUS_HEARTBEAT_SECONDS:
+                    idle = 0.0
+                    yield b": keep-alive\n\n"
+                continue
+            idle = 0.0
+            yield _sse("status", event, event_id=f"{event['order_id']}:{event['status']}")
+    finally:
+        status_hub.unsubscribe(subscription)
+
+
+class OrderStatusStreamView(LightView):
+    """
+    내 진행 중 주문의 상태 변경 피드 (Server-Sent Events).
+
+    연결 수만큼 응답이 열려 있으므로 SSE 전용 ASGI 프로세스(order_service/asgi.py, serve.sh)로 서비스한다.
+    DB 조회는 워커당 공유 구독(status_feed.hub)이 하고, 이 뷰는 회원별 큐만 기다린다.
+    EventSource는 헤더를 보낼 수 없으므로 Bearer 헤더 대신 1회용 ?ticket=(stream_ticket.py)으로도 인증한다.
+    """
+
+    async def get(self, request):
+        member_id = _get_member_id_from_auth(request)
+        if not member_id and request.GET.get("ticket"):
+            member_id = await sync_to_async(stream_ticket.consume)(request.GET["ticket"])
+        if not member_id:
+            return FastJsonResponse({"detail": "unauthorized"}, status=401)
+        response = StreamingHttpResponse(
+            _status_events(member_id),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class OrderStatusStreamTicketView(APIView):
+    """주문 상태 SSE 연결용 1회용 티켓 발급"""
+
+    def post(self, request):
+        member_id = _get_member_id_from_auth(request)
+        if not member_id:
+            return FastJsonResponse({"detail": "unauthorized"}, status=401)
+        return FastJsonResponse(
+            {"ticket": stream_ticket.issue(member_id), "expires_in": settings.ORDER_STATUS_TICKET_TTL_SECONDS},
+            status=201,
+        )
+
+
+class OrderStatusUpdateView(APIView):
+    """내부 호출(매장/배달 시스템): 주문 상태 변경"""
+
+    def post(self, request):
+        error = _internal_auth_error(request)
+        if error:
+            return error
+        data = request.data or {}
+        try:
+            order_id = int(data.get("order_id"))
+        except (TypeError, ValueError):
+            return FastJsonResponse({"detail": "invalid order_id"}, status=400)
+        status, body = change_status(order_id, data.get("status"))
+        return FastJsonResponse(body, status=status)
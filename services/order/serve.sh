@@ -0,0 +1,23 @@
+#!/bin/bash
+# 주문 서비스 컨테이너 진입점.
+# - 동기 API 전체: gunicorn gthread(WSGI), API_PORT. 요청마다 스레드를 쓰므로 느린 주문 생성이 프로브를 막지 않는다.
+# - 주문 상태 SSE(/api/order/status/stream/ 이하)만: uvicorn(ASGI), SSE_PORT. 인그레스에서 이 경로만 SSE_PORT로 보낸다.
+# 둘 중 하나가 끝나면 다른 하나에도 SIGTERM을 보내고 종료한다 (각 서버가 drain 후 종료).
+set -u
+
+gunicorn order_service.wsgi:application \
+    --bind "0.0.0.0:${API_PORT}" \
+    --worker-class gthread --workers "${GUNICORN_WORKERS}" --threads "${GUNICORN_THREADS}" \
+    --graceful-timeout "${GUNICORN_GRACEFUL_TIMEOUT}" --timeout 60 &
+api=$!
+
+uvicorn order_service.asgi:application \
+    --host 0.0.0.0 --port "${SSE_PORT}" --workers "${UVICORN_WORKERS}" --no-access-log &
+sse=$!
+
+trap 'kill -TERM "$api" "$sse" 2>/dev/null' TERM INT
+wait -n "$api" "$sse"
+status=$?
+kill -TERM "$api" "$sse" 2>/dev/null
+wait
+exit "$status"